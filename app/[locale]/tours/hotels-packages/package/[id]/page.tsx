@@ -96,8 +96,10 @@ export default function PackageDetailPage() {
           let pricePerPerson = 0;
 
           if (paxInRoom === 1) {
-            // Single room: use singleSupplement if available, otherwise double + 50%
-            pricePerPerson = tierPricing.singleSupplement || (tierPricing.double * 1.5);
+            // Single room: double rate plus the single supplement, otherwise double + 50%
+            pricePerPerson = tierPricing.singleSupplement
+              ? (tierPricing.double || 0) + tierPricing.singleSupplement
+              : (tierPricing.double * 1.5);
           } else if (paxInRoom === 2) {
             pricePerPerson = tierPricing.double || 0;
           } else {
@@ -0,0 +1,140 @@
+"""Compare the streaming .docx reader with python-docx
+
+For every document this checks that both readers yield identical blocks and
+that both extractors produce identical packages with either reader, then
+reports parse time and peak memory for each reader.
+
+    python scripts/benchmark-docx-reader.py [file-or-folder ...]
+
+Without arguments the configured source folders of both extractors are used.
+"""
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.docx_reader import iter_docx_blocks, iter_python_docx_blocks
+from extraction.scripts import load_script
+
+READERS = {
+    'python-docx': iter_python_docx_blocks,
+    'streaming': iter_docx_blocks,
+}
+
+
+def collect_documents(paths):
+    """Expand files and folders into a sorted list of .docx paths"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, f) for f in files
+                             if f.endswith('.docx') and not f.startswith('~$'))
+        elif path.endswith('.docx'):
+            found.append(path)
+    return sorted(found)
+
+
+def default_documents():
+    """Documents in the folders the extractors normally read"""
+    turkey = load_script('extract-packages-from-word.py')
+    europe = load_script('extract-europe-packages.py')
+    paths = [os.path.join(turkey.BASE_PATH, folder) for folder, _, _ in turkey.FOLDERS]
+    paths.append(europe.EUROPE_PATH)
+    return collect_documents(p for p in paths if os.path.exists(p))
+
+
+def extract(file_path, reader):
+    """Run whichever extractor owns the document"""
+    if 'EUROPE' in file_path.upper():
+        return load_script('extract-europe-packages.py').extract_europe_package(file_path, reader=reader)
+    return load_script('extract-packages-from-word.py').extract_package_from_word(file_path, reader=reader)
+
+
+def check_equality(documents):
+    """Return a list of (file_path, problem) where the readers disagree"""
+    problems = []
+    for file_path in documents:
+        try:
+            streamed = list(iter_docx_blocks(file_path))
+            reference = list(iter_python_docx_blocks(file_path))
+        except Exception as e:
+            problems.append((file_path, f"read failed: {e}"))
+            continue
+        if streamed != reference:
+            problems.append((file_path, 'blocks differ'))
+        elif extract(file_path, iter_docx_blocks) != extract(file_path, iter_python_docx_blocks):
+            problems.append((file_path, 'extracted package differs'))
+    return problems
+
+
+def _measure(reader_name, documents, repeat, results):
+    """Child process body: time the reader and report peak RSS"""
+    reader = READERS[reader_name]
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_path in documents:
+            for _ in reader(file_path):
+                pass
+        best = min(best, time.perf_counter() - start)
+
+    try:
+        import resource
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            peak_kb //= 1024
+    except ImportError:
+        peak_kb = None
+    results.put((best, peak_kb))
+
+
+def measure(reader_name, documents, repeat):
+    """Time a reader in a fresh process so peak memory is not shared with the other reader"""
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_measure, args=(reader_name, documents, repeat, results))
+    process.start()
+    outcome = results.get()
+    process.join()
+    return outcome
+
+
+def main():
+    """Run the equality check and the timing comparison"""
+    parser = argparse.ArgumentParser(description='Compare the streaming .docx reader with python-docx')
+    parser.add_argument('paths', nargs='*', help='.docx files or folders (default: the extractor source folders)')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs per reader (best is reported)')
+    args = parser.parse_args()
+
+    documents = collect_documents(args.paths) if args.paths else default_documents()
+    if not documents:
+        print('No .docx documents found')
+        return 1
+
+    print(f"Documents: {len(documents)}\n")
+
+    problems = check_equality(documents)
+    if problems:
+        print(f"=== MISMATCHES ({len(problems)}) ===")
+        for file_path, problem in problems:
+            print(f"  {os.path.basename(file_path)} - {problem}")
+    else:
+        print('Output: identical for every document')
+
+    print(f"\n{'reader':<12} {'total ms':>10} {'ms/doc':>8} {'peak RSS MB':>12}")
+    timings = {}
+    for name in READERS:
+        elapsed, peak_kb = measure(name, documents, args.repeat)
+        timings[name] = elapsed
+        peak = f"{peak_kb / 1024:.1f}" if peak_kb else 'n/a'
+        print(f"{name:<12} {elapsed * 1000:>10.1f} {elapsed * 1000 / len(documents):>8.2f} {peak:>12}")
+
+    if timings['streaming']:
+        print(f"\nSpeedup: {timings['python-docx'] / timings['streaming']:.1f}x")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
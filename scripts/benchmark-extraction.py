@@ -0,0 +1,231 @@
+"""Scaling benchmark for the Word package extractors on synthetic rate sheets
+
+Generates (once, then reuses) corpora of synthetic Turkey and Europe rate
+sheets and runs every stage on each document:
+
+    read        stream the .docx body (extraction.docx_reader)
+    extract     extract_package_from_word / extract_europe_package
+    translate   the Spanish translation functions on the extracted package
+    finalize    finalize_package (Spanish fields, memoized) / finalize_europe_package
+
+Each corpus size runs in a fresh process so its peak RSS is its own.
+Results are written as JSON; pass --compare with an earlier results file to
+see throughput changes.
+
+    python scripts/benchmark-extraction.py --sizes 10 100 1000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import multiprocessing
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.docx_reader import iter_docx_blocks
+from extraction.scripts import load_script
+from extraction.synthetic import GENERATOR_VERSION, generate_corpus
+
+BENCHMARK_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '.cache', 'benchmark'))
+STAGES = ('read', 'extract', 'translate', 'finalize')
+
+
+def corpus_documents(size, seed):
+    """Synthetic corpus of the given size, generated on first use"""
+    turkey = load_script('extract-packages-from-word.py')
+    root = os.path.join(BENCHMARK_DIR, f"corpus-v{GENERATOR_VERSION}-seed{seed}")
+    return generate_corpus(root, size, turkey.FOLDERS, 'EUROPE 2026', seed=seed)
+
+
+def translate_package(turkey, pkg):
+    """Run the translation functions over an extracted package"""
+    turkey.translate_title(pkg['title'])
+    turkey.translate_terms(pkg['destinations'])
+    turkey.translate_itinerary(pkg['itinerary'])
+    turkey.translate_list(pkg['included'])
+    turkey.translate_list(pkg['notIncluded'])
+
+
+def run_stages(kind, file_path, info, turkey, europe):
+    """Seconds spent in each stage for one document"""
+    timings = {}
+
+    start = time.perf_counter()
+    for _ in iter_docx_blocks(file_path):
+        pass
+    timings['read'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if kind == 'europe':
+        pkg = europe.extract_europe_package(file_path)
+    else:
+        pkg = turkey.extract_package_from_word(file_path, info[1], info[2])
+    timings['extract'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    translate_package(turkey, pkg)
+    timings['translate'] = time.perf_counter() - start
+
+    filename = os.path.basename(file_path)
+    start = time.perf_counter()
+    if kind == 'europe':
+        europe.finalize_europe_package(pkg, filename)
+    else:
+        turkey.finalize_package(pkg, filename, info[1], info[2])
+    timings['finalize'] = time.perf_counter() - start
+    return timings
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported
+
+    On Linux getrusage's maximum survives exec, so a spawned child would
+    report the parent's peak (inflated by generating the corpus); VmHWM is
+    reset on exec and is used when available.
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _measure(documents, results):
+    """Child process body: run every stage on every document"""
+    turkey = load_script('extract-packages-from-word.py')
+    europe = load_script('extract-europe-packages.py')
+    per_stage = {stage: [] for stage in STAGES}
+
+    start = time.perf_counter()
+    for kind, file_path, info in documents:
+        for stage, seconds in run_stages(kind, file_path, info, turkey, europe).items():
+            per_stage[stage].append(seconds)
+    wall = time.perf_counter() - start
+
+    stages = {}
+    for stage, values in per_stage.items():
+        stages[stage] = {
+            'totalMs': sum(values) * 1000,
+            'meanMs': sum(values) * 1000 / len(values),
+            'p50Ms': percentile(values, 0.50) * 1000,
+            'p95Ms': percentile(values, 0.95) * 1000,
+            'maxMs': max(values) * 1000,
+        }
+    results.put({
+        'documents': len(documents),
+        'europeDocuments': sum(1 for kind, _, _ in documents if kind == 'europe'),
+        'corpusBytes': sum(os.path.getsize(path) for _, path, _ in documents),
+        'wallSeconds': wall,
+        'docsPerSecond': len(documents) / wall if wall else None,
+        'peakRssMb': peak_rss_mb(),
+        'stages': stages,
+    })
+
+
+def measure(documents):
+    """Benchmark one corpus in a freshly spawned process"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(documents, results))
+    process.start()
+    outcome = results.get()
+    process.join()
+    return outcome
+
+
+def git_revision():
+    """Short commit hash of the working tree, when available"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_run(run):
+    """Print one corpus size's results"""
+    rss = f"{run['peakRssMb']:.1f} MB" if run['peakRssMb'] else 'n/a'
+    print(f"\n{run['documents']} documents ({run['europeDocuments']} Europe, "
+          f"{run['corpusBytes'] / 1024 / 1024:.1f} MB): "
+          f"{run['docsPerSecond']:.1f} docs/s, peak RSS {rss}")
+    print(f"  {'stage':<10} {'total ms':>10} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for stage, s in run['stages'].items():
+        print(f"  {stage:<10} {s['totalMs']:>10.1f} {s['meanMs']:>8.2f} {s['p50Ms']:>8.2f} "
+              f"{s['p95Ms']:>8.2f} {s['maxMs']:>8.2f}")
+
+
+def print_comparison(report, previous):
+    """Throughput and stage mean changes against an earlier results file"""
+    before = {run['documents']: run for run in previous['runs']}
+    print(f"\n=== Compared with {previous.get('revision') or 'previous run'} ({previous['timestamp']}) ===")
+    for run in report['runs']:
+        old = before.get(run['documents'])
+        if not old:
+            continue
+        change = run['docsPerSecond'] / old['docsPerSecond'] - 1
+        stages = ', '.join(
+            f"{stage} {run['stages'][stage]['meanMs'] / old['stages'][stage]['meanMs'] - 1:+.0%}"
+            for stage in STAGES if old['stages'].get(stage, {}).get('meanMs'))
+        print(f"  {run['documents']:>5} docs: throughput {change:+.0%} ({stages})")
+
+
+def main():
+    """Generate the corpora, benchmark each size and save the results"""
+    parser = argparse.ArgumentParser(description='Benchmark the extractors on synthetic rate sheets')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000],
+                        help='corpus sizes to benchmark (default: 10 100 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='corpus seed (same seed, same documents)')
+    parser.add_argument('--output', help='results file (default: .cache/benchmark/results-<timestamp>.json)')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args()
+
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    report = {
+        'timestamp': timestamp,
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'seed': args.seed,
+        'generatorVersion': GENERATOR_VERSION,
+        'runs': [],
+    }
+
+    for size in args.sizes:
+        start = time.perf_counter()
+        documents = corpus_documents(size, args.seed)
+        print(f"Corpus of {size} documents ready ({time.perf_counter() - start:.1f}s)")
+        run = measure(documents)
+        report['runs'].append(run)
+        print_run(run)
+
+    output = args.output or os.path.join(BENCHMARK_DIR, f"results-{timestamp.replace(':', '')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
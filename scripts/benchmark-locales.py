@@ -0,0 +1,124 @@
+"""Cost of extra locales: one multi-locale scan against a separate scan per locale
+
+Translates every translatable string in data/2026-packages.json into 1 and
+into 5 locales, once with a PhraseTranslator per locale and table (one scan
+per locale) and once with a MultiPhraseTranslator per table (one scan for
+all of them), without the memo. Only Spanish ships as a locale pack, so the
+extra locales are pseudo-locales: the Spanish tables with every target
+tagged with the locale code. Outputs of both approaches are compared.
+
+    python scripts/benchmark-locales.py --locales 5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.translate import LOCALE_TABLES, MultiPhraseTranslator, PhraseTranslator, load_locale_packs
+
+PSEUDO_LOCALES = ('xa', 'xb', 'xc', 'xd', 'xe', 'xf', 'xg', 'xh')
+
+
+def locale_tables(count):
+    """{table: {locale: phrases}} for Spanish plus count - 1 pseudo-locales"""
+    spanish = load_locale_packs(['es'])[0]
+    tables = {}
+    for table in LOCALE_TABLES:
+        phrases = spanish.tables[table]
+        tables[table] = {'es': phrases}
+        for code in PSEUDO_LOCALES[:count - 1]:
+            tables[table][code] = {source: f"{target}[{code}]" for source, target in phrases.items()}
+    return tables
+
+
+def load_corpus(data_path):
+    """The English strings of every package, grouped by the table that translates them"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        packages = json.load(f)
+
+    corpus = {table: [] for table in LOCALE_TABLES}
+    for pkg in packages:
+        corpus['title'].append(pkg['title'])
+        corpus['terms'].append(pkg['destinations'])
+        corpus['terms'].extend(pkg.get('included', []))
+        corpus['terms'].extend(pkg.get('notIncluded', []))
+        corpus['terms'].extend(pkg.get('highlights', []))
+        for day in pkg.get('itinerary', []):
+            corpus['dayTitle'].append(day['title'])
+            corpus['description'].append(day['description'])
+            corpus['meals'].append(day['meals'])
+    return packages, corpus
+
+
+def build(tables):
+    """(per-locale translators, multi-locale translator) of every table"""
+    separate, multi = {}, {}
+    for table, phrases in tables.items():
+        ignore_case = table == 'terms'
+        separate[table] = {locale: PhraseTranslator(p, ignore_case) for locale, p in phrases.items()}
+        multi[table] = MultiPhraseTranslator(phrases, ignore_case)
+    return separate, multi
+
+
+def time_best(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Time 1 and --locales locales both ways and print a comparison table"""
+    parser = argparse.ArgumentParser(description='Benchmark multi-locale translation on the package corpus')
+    parser.add_argument('--data', default=os.path.join(os.path.dirname(__file__), '..', 'data', '2026-packages.json'))
+    parser.add_argument('--locales', type=int, default=5, choices=range(2, len(PSEUDO_LOCALES) + 2),
+                        metavar='N', help='locales to compare against one (default 5)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs (best is reported)')
+    args = parser.parse_args()
+
+    packages, corpus = load_corpus(args.data)
+    print(f"Corpus: {len(packages)} packages, {sum(len(v) for v in corpus.values())} strings\n")
+    print(f"{'locales':>7} {'per-locale ms':>14} {'one scan ms':>12} {'speedup':>8}")
+
+    results = {}
+    mismatched = 0
+    for count in (1, args.locales):
+        separate, multi = build(locale_tables(count))
+
+        def run_separate():
+            for table, strings in corpus.items():
+                for translate in separate[table].values():
+                    for text in strings:
+                        translate(text)
+
+        def run_multi():
+            for table, strings in corpus.items():
+                translate = multi[table]
+                for text in strings:
+                    translate(text)
+
+        results[count] = (time_best(run_separate, args.repeat), time_best(run_multi, args.repeat))
+        per_locale, one_scan = results[count]
+        print(f"{count:>7} {per_locale * 1000:>14.2f} {one_scan * 1000:>12.2f} {per_locale / one_scan:>7.1f}x")
+
+        for table, strings in corpus.items():
+            for text in strings:
+                expected = {locale: translate(text) for locale, translate in separate[table].items()}
+                mismatched += multi[table](text) != expected
+
+    single = results[1][1]
+    print(f"\n{args.locales} locales cost {results[args.locales][1] / single:.1f}x one locale in a single scan "
+          f"({results[args.locales][0] / single:.1f}x with a scan per locale)")
+    if mismatched:
+        print(f"{mismatched} strings translate differently in the single scan")
+        return 1
+    print('Output: identical to a separate scan per locale')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
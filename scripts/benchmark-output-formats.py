@@ -0,0 +1,84 @@
+"""Compare the package output formats: file size, write time and load time
+
+Every format in extraction.output.FORMATS that can be used here (msgpack
+only when the package is installed) is written to a temporary folder and
+read back, and the loaded packages are checked against the input. The
+tables format is also opened lazily, reading a single package.
+
+    python scripts/benchmark-output-formats.py [packages-file]
+
+Without an argument the current data/2026-packages.json is used.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.output import (
+    FORMATS, available_formats, load_tabled_packages, packages_path, read_packages, write_packages,
+)
+
+
+def best_time(action, repeat):
+    """Best wall time of repeat calls and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = action()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Write and load the corpus in every format and print a comparison table"""
+    parser = argparse.ArgumentParser(description='Benchmark package output formats')
+    parser.add_argument('path', nargs='?', default=packages_path('2026-packages'),
+                        help='package list to use as the corpus (default: data/2026-packages.json)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs per format (best is reported)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"Not found: {args.path}")
+        return 1
+    packages = read_packages(args.path)
+    print(f"Corpus: {len(packages)} packages from {os.path.basename(args.path)}")
+
+    skipped = [fmt for fmt in FORMATS if fmt not in available_formats()]
+    if skipped:
+        print(f"Skipped (not installed): {', '.join(skipped)}")
+
+    print(f"\n{'format':<8} {'bytes':>10} {'size':>7} {'write ms':>9} {'load ms':>8} {'load speedup':>13}")
+    problems = []
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in available_formats():
+            write_seconds, path = best_time(lambda: write_packages(packages, 'packages', fmt, tmp), args.repeat)
+            load_seconds, loaded = best_time(lambda: read_packages(path), args.repeat)
+            size = os.path.getsize(path)
+            if baseline is None:
+                baseline = (size, load_seconds)
+            if loaded != packages:
+                problems.append(fmt)
+            print(f"{fmt:<8} {size:>10,} {size / baseline[0]:>6.0%} {write_seconds * 1000:>9.1f} "
+                  f"{load_seconds * 1000:>8.1f} {baseline[1] / load_seconds:>12.1f}x")
+            if fmt == 'tables':
+                # The lazy loader only expands the packages that are read
+                lazy_seconds, _ = best_time(lambda: load_tabled_packages(path)[0], args.repeat)
+                lazy_load_ms = lazy_seconds * 1000
+            os.remove(path)
+
+    if 'tables' in available_formats():
+        print(f"\ntables, lazily (open and read one package): {lazy_load_ms:.1f} ms")
+
+    if problems:
+        print(f"\nRound trip changed the packages for: {', '.join(problems)}")
+        return 1
+    print('\nRound trip: identical for every format')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
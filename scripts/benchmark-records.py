@@ -0,0 +1,87 @@
+"""Memory of extracted packages held as slotted records versus the package dicts
+
+Extracts a synthetic corpus (see benchmark-extraction.py) twice, holding
+every package in memory: once as extraction.records.Package records and once
+as the dicts the pipeline passes around, and reports the traced memory per
+package. Every record is also checked to serialize to exactly the same JSON
+as its dict.
+
+    python scripts/benchmark-records.py --size 1000
+"""
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.scripts import load_script
+from extraction.synthetic import GENERATOR_VERSION, generate_corpus
+
+BENCHMARK_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '.cache', 'benchmark'))
+
+
+def hold_all(extract, documents):
+    """Extract every document and keep the results; (results, traced bytes held, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = [extract(kind, path, info) for kind, path, info in documents]
+    seconds = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return results, held, seconds
+
+
+def main():
+    """Extract the corpus both ways and print memory per package"""
+    parser = argparse.ArgumentParser(description='Benchmark slotted package records against dicts')
+    parser.add_argument('--size', type=int, default=1000, help='synthetic documents (default 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='corpus seed (default 0)')
+    args = parser.parse_args()
+
+    turkey = load_script('extract-packages-from-word.py')
+    europe = load_script('extract-europe-packages.py')
+    root = os.path.join(BENCHMARK_DIR, f"corpus-v{GENERATOR_VERSION}-seed{args.seed}")
+    documents = generate_corpus(root, args.size, turkey.FOLDERS, 'EUROPE 2026', seed=args.seed)
+
+    def as_record(kind, path, info):
+        if kind == 'europe':
+            return europe.extract_europe_record(path)
+        return turkey.extract_package_record(path, info[1], info[2])
+
+    def as_dict(kind, path, info):
+        if kind == 'europe':
+            return europe.extract_europe_package(path)
+        return turkey.extract_package_from_word(path, info[1], info[2])
+
+    # Warm up compiled patterns and caches outside the traced runs
+    as_record(*documents[0])
+
+    records, record_bytes, record_seconds = hold_all(as_record, documents)
+    dicts, dict_bytes, dict_seconds = hold_all(as_dict, documents)
+
+    mismatched = sum(
+        json.dumps(record.to_dict(), ensure_ascii=False) != json.dumps(pkg, ensure_ascii=False)
+        for record, pkg in zip(records, dicts)
+    )
+
+    count = len(documents)
+    print(f"Corpus: {count} synthetic documents\n")
+    print(f"{'held as':<8} {'total KB':>10} {'per package':>12} {'extract s':>10}")
+    for name, held, seconds in (('dicts', dict_bytes, dict_seconds), ('records', record_bytes, record_seconds)):
+        print(f"{name:<8} {held / 1024:>10,.0f} {held / count:>10,.0f} B {seconds:>10.2f}")
+    print(f"\nRecords hold {1 - record_bytes / dict_bytes:.0%} less memory")
+
+    if mismatched:
+        print(f"\n{mismatched} records serialize differently from their dicts")
+        return 1
+    print('Serialization: identical for every package')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
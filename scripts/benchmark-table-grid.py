@@ -0,0 +1,140 @@
+"""Micro-benchmark: per-row row.cells access versus a table grid built once
+
+Builds a synthetic pricing table (200 rows by default, optionally with a
+vertically merged notes column as found on the wide rate sheets) and parses it
+three ways:
+
+    row.cells     the previous loop, touching row.cells five times per row
+    grid          python-docx table materialized once into a TableGrid
+    streaming     the table read straight from document.xml into a TableGrid
+"""
+import io
+import sys
+import time
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from docx import Document
+
+from extraction.docx_reader import TableGrid, iter_docx_blocks
+from extraction.scripts import load_script
+
+extractor = load_script('extract-packages-from-word.py')
+
+TIER_LABELS = ['2 PAX', '4 PAX', '6 PAX', '8 PAX', '10 PAX', 'SINGLE SUPPLEMENT', 'CHILD 0-6', 'CHILD 6-12']
+
+
+def build_pricing_document(rows, merged_notes=False):
+    """Return .docx bytes holding one pricing table with the given number of body rows"""
+    doc = Document()
+    table = doc.add_table(rows=rows + 1, cols=5)
+    for column, text in enumerate(['PAX', '3* HOTELS', '4* HOTELS', '5* HOTELS', 'NOTES']):
+        table.cell(0, column).text = text
+    for row in range(1, rows + 1):
+        table.cell(row, 0).text = TIER_LABELS[(row - 1) % len(TIER_LABELS)]
+        for column in range(1, 4):
+            table.cell(row, column).text = f"{500 + row * column:,} EUR"
+    table.cell(1, 4).text = 'Prices per person in Euro'
+    if merged_notes:
+        table.cell(1, 4).merge(table.cell(rows, 4))
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def new_data():
+    """Empty package fields touched by the table parser"""
+    return {'pricing': {'paxTiers': {}, 'childRates': {}}, 'hotels': {}}
+
+
+def legacy_parse_pricing(data, table):
+    """The previous pricing loop's access pattern: row.cells read on every cell access"""
+    for row in table.rows[1:]:
+        if len(row.cells) >= 4:
+            label = row.cells[0].text.strip().upper()
+            p3 = extractor.extract_price(row.cells[1].text)
+            p4 = extractor.extract_price(row.cells[2].text)
+            p5 = extractor.extract_price(row.cells[3].text)
+            for tier in ['10', '8', '6', '4', '2']:
+                if tier in label and 'PAX' in label:
+                    data['pricing']['paxTiers'][tier] = {
+                        'threestar': {'double': p3, 'singleSupplement': 0},
+                        'fourstar': {'double': p4, 'singleSupplement': 0},
+                        'fivestar': {'double': p5, 'singleSupplement': 0}
+                    }
+                    break
+            else:
+                if 'SINGLE' in label:
+                    for tier in data['pricing']['paxTiers']:
+                        data['pricing']['paxTiers'][tier]['threestar']['singleSupplement'] = p3
+                        data['pricing']['paxTiers'][tier]['fourstar']['singleSupplement'] = p4
+                        data['pricing']['paxTiers'][tier]['fivestar']['singleSupplement'] = p5
+                elif 'CHILD' in label and '0-6' in label:
+                    data['pricing']['childRates']['age0to6'] = {'threestar': p3, 'fourstar': p4, 'fivestar': p5}
+                elif 'CHILD' in label and '6-12' in label:
+                    data['pricing']['childRates']['age6to12'] = {'threestar': p3, 'fourstar': p4, 'fivestar': p5}
+    return data
+
+
+def run_row_cells(payload):
+    """Parse through row.cells; document loading is not timed"""
+    table = Document(io.BytesIO(payload)).tables[0]
+    start = time.perf_counter()
+    data = legacy_parse_pricing(new_data(), table)
+    return time.perf_counter() - start, data
+
+
+def run_grid(payload):
+    """Parse through a grid built from the python-docx table; document loading is not timed"""
+    table = Document(io.BytesIO(payload)).tables[0]
+    start = time.perf_counter()
+    data = new_data()
+    extractor.parse_package_table(data, TableGrid.from_python_docx(table))
+    return time.perf_counter() - start, data
+
+
+def run_streaming(payload):
+    """Stream the document, including unzipping and XML parsing"""
+    start = time.perf_counter()
+    data = new_data()
+    for kind, grid in iter_docx_blocks(io.BytesIO(payload)):
+        if kind == 'table':
+            extractor.parse_package_table(data, grid)
+    return time.perf_counter() - start, data
+
+
+def main():
+    """Time each strategy and check they agree"""
+    parser = argparse.ArgumentParser(description='Benchmark table cell access strategies')
+    parser.add_argument('--rows', type=int, default=200, help='pricing rows in the synthetic table')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs per strategy (best is reported)')
+    parser.add_argument('--merged-notes', action='store_true',
+                        help='merge the notes column vertically (row.cells becomes quadratic; slow)')
+    args = parser.parse_args()
+
+    payload = build_pricing_document(args.rows, args.merged_notes)
+    strategies = {'row.cells': run_row_cells, 'grid': run_grid, 'streaming': run_streaming}
+
+    merged = ', merged notes column' if args.merged_notes else ''
+    print(f"Synthetic pricing table: {args.rows} rows x 5 columns{merged}\n")
+    print(f"{'strategy':<12} {'ms':>10} {'speedup':>8}")
+
+    baseline = None
+    reference = None
+    for name, run in strategies.items():
+        best = float('inf')
+        for _ in range(args.repeat):
+            elapsed, data = run(payload)
+            best = min(best, elapsed)
+        if reference is None:
+            baseline, reference = best, data
+        elif data['pricing'] != reference['pricing']:
+            print(f"{name}: parsed pricing differs from row.cells")
+            return 1
+        print(f"{name:<12} {best * 1000:>10.2f} {baseline / best:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Benchmark the compiled Spanish translation against the old per-entry replace loops
+
+Runs both implementations over every translatable string in
+data/2026-packages.json and reports timings plus how many outputs changed.
+"""
+import os
+import sys
+import json
+import re
+import time
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.scripts import load_script
+from extraction.translate import load_locale_packs
+
+extractor = load_script('extract-packages-from-word.py')
+SPANISH = load_locale_packs(['es'])[0]
+
+
+# Previous implementations, kept verbatim as the baseline
+def legacy_translate_to_spanish(text):
+    result = text
+    for en, es in SPANISH.tables['terms'].items():
+        result = re.sub(re.escape(en), es, result, flags=re.IGNORECASE)
+    return result
+
+def legacy_translate_title(title):
+    result = title
+    result = result.replace('Nights Group Tour', 'Noches Tour en Grupo')
+    result = result.replace('Nights Private Tour', 'Noches Tour Privado')
+    result = result.replace(' - Land Only', ' - Solo Terrestre')
+    result = result.replace('Istanbul', 'Estambul')
+    result = result.replace('Cappadocia', 'Capadocia')
+    result = result.replace('Ephesus', 'Éfeso')
+    return result
+
+def legacy_translate_day_title(title):
+    result = title
+    result = result.replace('Fly', 'Vuelo')
+    result = result.replace('Full Day Tour', 'Tour de Día Completo')
+    result = result.replace('Half Day Tour', 'Tour de Medio Día')
+    result = result.replace('Free Day', 'Día Libre')
+    result = result.replace('Arrival', 'Llegada')
+    result = result.replace('Departure', 'Salida')
+    result = result.replace('Istanbul', 'Estambul')
+    result = result.replace('Cappadocia', 'Capadocia')
+    result = result.replace('Ephesus', 'Éfeso')
+    result = result.replace('Bosphorus Cruise', 'Crucero por el Bósforo')
+    result = result.replace('incl.', 'incl.')
+    return result
+
+def legacy_translate_description(desc):
+    if not desc:
+        return ''
+    result = desc
+    for en, es in SPANISH.tables['description'].items():
+        result = result.replace(en, es)
+    return result
+
+
+def load_corpus(data_path):
+    """Group the English strings of every package by the function that translates them"""
+    with open(data_path, 'r', encoding='utf-8') as f:
+        packages = json.load(f)
+
+    corpus = {'terms': [], 'title': [], 'day_title': [], 'description': []}
+    for pkg in packages:
+        corpus['title'].append(pkg['title'])
+        corpus['terms'].append(pkg['destinations'])
+        corpus['terms'].extend(pkg.get('included', []))
+        corpus['terms'].extend(pkg.get('notIncluded', []))
+        corpus['terms'].extend(pkg.get('highlights', []))
+        for day in pkg.get('itinerary', []):
+            corpus['day_title'].append(day['title'])
+            corpus['description'].append(day['description'])
+    return packages, corpus
+
+
+def time_function(fn, strings, repeat):
+    """Best wall time over repeat runs of fn across all strings"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in strings:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark and print a comparison table"""
+    parser = argparse.ArgumentParser(description='Benchmark Spanish translation on the package corpus')
+    parser.add_argument('--data', default=os.path.join(os.path.dirname(__file__), '..', 'data', '2026-packages.json'))
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs per function (best is reported)')
+    args = parser.parse_args()
+
+    packages, corpus = load_corpus(args.data)
+    pairs = {
+        'terms': (legacy_translate_to_spanish, lambda text: extractor.translate_terms(text)['es']),
+        'title': (legacy_translate_title, lambda text: extractor.translate_title(text)['es']),
+        'day_title': (legacy_translate_day_title, lambda text: extractor.translate_day_title(text)['es']),
+        'description': (legacy_translate_description, lambda text: extractor.translate_description(text)['es']),
+    }
+
+    print(f"Corpus: {len(packages)} packages, {sum(len(v) for v in corpus.values())} strings\n")
+    print(f"{'function':<12} {'strings':>8} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8} {'changed':>8}")
+
+    total_legacy = total_compiled = 0
+    for name, (legacy, compiled) in pairs.items():
+        strings = corpus[name]
+        legacy_time = time_function(legacy, strings, args.repeat)
+        compiled_time = time_function(compiled, strings, args.repeat)
+        changed = sum(1 for text in strings if legacy(text) != compiled(text))
+        total_legacy += legacy_time
+        total_compiled += compiled_time
+        speedup = legacy_time / compiled_time if compiled_time else 0
+        print(f"{name:<12} {len(strings):>8} {legacy_time * 1000:>10.2f} {compiled_time * 1000:>12.2f} "
+              f"{speedup:>7.1f}x {changed:>8}")
+
+    speedup = total_legacy / total_compiled if total_compiled else 0
+    print(f"{'total':<12} {'':>8} {total_legacy * 1000:>10.2f} {total_compiled * 1000:>12.2f} {speedup:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
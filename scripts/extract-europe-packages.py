@@ -1,10 +1,61 @@
 import os
 import sys
-import json
 import re
+import argparse
 sys.stdout.reconfigure(encoding='utf-8')
 
-from docx import Document
+from extraction import metrics
+from extraction.cache import ExtractionCache
+from extraction.docx_reader import iter_docx_blocks
+from extraction.facets import facet_index_path, write_facet_index, write_shard_facet_index
+from extraction.gazetteer import default_gazetteer
+from extraction.hotels import hotel_catalogue_path, write_hotel_catalogue, write_shard_hotel_catalogue
+from extraction.layout import DocumentLayout
+from extraction.merge import changeset_summary, merge_packages, write_changeset
+from extraction.metrics import RunReport, write_run_report
+from extraction.output import (
+    SHARD_DIR, available_formats, find_packages, read_packages, write_package_shards, write_packages,
+)
+from extraction.parallel import resolve_workers, run_extraction_jobs
+from extraction.pricing import price_matrix_json
+from extraction.records import PAX_TIERS, ChildRates, Package, PriceTier
+from extraction.search import search_index_path, write_search_index, write_shard_search_index
+
+# Bump whenever extraction output changes so cached results are not reused
+EXTRACTOR_VERSION = 'europe-2'
+
+# Europe places from the shared gazetteer: cities for the destinations, cities
+# and countries for spotting the title
+_find_destinations = default_gazetteer().matcher(region='Europe')
+_mentions_place = default_gazetteer().matcher(region='Europe', kinds=None).search
+
+# How the rate sheets are laid out (English or Turkish headings), see extraction.layout
+LAYOUT = {
+    'title': _mentions_place,  # usually centered and bold, the first text naming a place
+    'duration': {'words': ('night', 'gece'), 'pattern': r'^\d+\s*(nights?|gece)\s*/\s*\d+\s*(days?|gün)'},
+    'day_headers': [
+        r'^Day\s*(\d+)\s*[-–]\s*(.+?)\s*\(([^)]*)\)',  # Day 1 - Title (B/L/D), also with tabs
+        r'^(\d+)\.\s*(?:Gün|Day)\s*[-–]\s*(.+?)\s*\(([^)]*)\)',  # 1. Gün - Title (K/Ö/A) Turkish
+    ],
+    'day_like': [r'^(Day\s*\d+|\d+\.\s*(?:Gün|Day))'],
+    'day_end': ('***', 'end of service'),
+    'day_breaks': ('inclusions', 'exclusions', 'information', 'hotel options', 'package rates',
+                   'dahil olan hizmetler', 'dahil olmayan hizmetler'),
+    'sections': {
+        'included': ('inclusions', 'dahil olan hizmetler'),
+        'notIncluded': ('exclusions', 'dahil olmayan hizmetler'),
+        'information': ('information', 'important information', 'bilgilendirme', 'önemli bilgiler'),
+        'hotels': ('hotel options', 'otel seçenekleri', 'hotel information'),
+        'pricing': ('package rates', 'paket fiyatları'),
+    },
+    'collect': {
+        'included': {'field': 'included', 'clean': True, 'skip': ('exclusions', 'dahil olmayan hizmetler')},
+        'notIncluded': {'field': 'not_included', 'clean': True,
+                        'skip': ('information', 'hotel options', 'bilgilendirme')},
+        'information': {'field': 'information', 'skip': ('hotel options', 'package rates', 'otel seçenekleri')},
+    },
+}
+_layout = DocumentLayout(LAYOUT)
 
 def slugify(text):
     """Convert text to URL-friendly slug"""
@@ -14,241 +65,92 @@ def slugify(text):
     text = re.sub(r'-+', '-', text)
     return text.strip('-')
 
-def extract_europe_package(file_path):
-    """Extract package data from Europe Word file"""
-    doc = Document(file_path)
-
-    data = {
-        'title': '',
-        'duration': '',
-        'description': '',
-        'itinerary': [],
-        'included': [],
-        'notIncluded': [],
-        'information': [],
-        'hotels': {'threestar': [], 'fourstar': [], 'fivestar': []},
-        'pricing': {
-            'paxTiers': {},
-            'childRates': {
-                'age0to6': {'threestar': 0, 'fourstar': 0, 'fivestar': 0},
-                'age6to12': {'threestar': 0, 'fourstar': 0, 'fivestar': 0}
-            }
-        },
-        'destinations': '',
-        'packageType': 'WITH_HOTEL',
-        'tourType': 'PRIVATE',
-        'transferType': 'PRIVATE',
-        'region': 'Europe'
-    }
-
-    current_section = None
-    current_day = None
-
-    # Parse paragraphs
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        if not text:
-            continue
-
-        # Detect title (usually centered, bold, first substantial text)
-        if not data['title']:
-            # Check for destination names
-            cities = ['budapest', 'vienna', 'prague', 'zagreb', 'split', 'dubrovnik',
-                     'helsinki', 'rovaniemi', 'finland', 'croatia', 'hungary', 'austria', 'czech']
-            if any(city in text.lower() for city in cities):
-                data['title'] = text
-                continue
-
-        # Detect duration
-        if not data['duration'] and ('night' in text.lower() or 'gece' in text.lower()):
-            if re.match(r'^\d+\s*(nights?|gece)\s*/\s*\d+\s*(days?|gün)', text, re.I):
-                data['duration'] = text
-                continue
-
-        # Detect day entries - multiple formats
-        # Format 1: Day 1 - Title (B/L/D)
-        day_match = re.match(r'^Day\s*(\d+)\s*[-–]\s*(.+?)\s*\(([^)]*)\)', text, re.I)
-        if not day_match:
-            # Format 2: Day 1 - Title    (B/L/D) with tabs
-            day_match = re.match(r'^Day\s*(\d+)\s*[-–]\s*(.+?)\s+\(([^)]*)\)', text, re.I)
-        if not day_match:
-            # Format 3: 1. Gün - Title (K/Ö/A) Turkish
-            day_match = re.match(r'^(\d+)\.\s*(?:Gün|Day)\s*[-–]\s*(.+?)\s*\(([^)]*)\)', text, re.I)
-
-        if day_match:
-            current_day = {
-                'day': int(day_match.group(1)),
-                'title': day_match.group(2).strip(),
-                'description': '',
-                'meals': day_match.group(3).strip() or '-'
-            }
-            data['itinerary'].append(current_day)
-            current_section = 'itinerary'
-            continue
-
-        # Continue day description
-        if current_section == 'itinerary' and current_day:
-            if text.startswith('***') or text.lower().startswith('end of service'):
-                current_section = None
-                current_day = None
-            elif not re.match(r'^(Day\s*\d+|\d+\.\s*(?:Gün|Day))', text, re.I):
-                if text.lower() not in ['inclusions', 'exclusions', 'information', 'hotel options',
-                                        'package rates', 'dahil olan hizmetler', 'dahil olmayan hizmetler']:
-                    if current_day['description']:
-                        current_day['description'] += ' '
-                    current_day['description'] += text
-                    continue
-
-        # Detect sections
-        text_lower = text.lower()
-        if text_lower in ['inclusions', 'dahil olan hizmetler']:
-            current_section = 'included'
-            continue
-        elif text_lower in ['exclusions', 'dahil olmayan hizmetler']:
-            current_section = 'notIncluded'
-            continue
-        elif text_lower in ['information', 'important information', 'bilgilendirme', 'önemli bilgiler']:
-            current_section = 'information'
-            continue
-        elif text_lower in ['hotel options', 'otel seçenekleri', 'hotel information']:
-            current_section = 'hotels'
-            continue
-        elif text_lower in ['package rates', 'paket fiyatları']:
-            current_section = 'pricing'
-            continue
-
-        # Add to current section
-        if current_section == 'included' and text:
-            clean = text.rstrip(',').rstrip('.')
-            if clean and clean.lower() not in ['exclusions', 'dahil olmayan hizmetler']:
-                data['included'].append(clean)
-        elif current_section == 'notIncluded' and text:
-            clean = text.rstrip(',').rstrip('.')
-            if clean and clean.lower() not in ['information', 'hotel options', 'bilgilendirme']:
-                data['notIncluded'].append(clean)
-        elif current_section == 'information' and text:
-            if text.lower() not in ['hotel options', 'package rates', 'otel seçenekleri']:
-                data['information'].append(text)
-
-    # Parse tables
-    for table in doc.tables:
-        if len(table.rows) < 2:
-            continue
-
-        first_cell = table.rows[0].cells[0].text.strip().lower()
-
-        # Hotels table
-        if any(x in first_cell for x in ['city', 'şehir', 'location', 'lokasyon']):
-            for row in table.rows[1:]:
-                if len(row.cells) >= 4:
-                    city = row.cells[0].text.strip()
-                    h3 = row.cells[1].text.strip().replace('\n', ' ')
-                    h4 = row.cells[2].text.strip().replace('\n', ' ')
-                    h5 = row.cells[3].text.strip().replace('\n', ' ')
-                    if city and h3:
-                        data['hotels']['threestar'].append(f"{city}: {h3}")
-                    if city and h4:
-                        data['hotels']['fourstar'].append(f"{city}: {h4}")
-                    if city and h5:
-                        data['hotels']['fivestar'].append(f"{city}: {h5}")
-
-        # Pricing table
-        elif any(x in first_cell for x in ['pax', 'kişi', 'person']):
-            for row in table.rows[1:]:
-                if len(row.cells) >= 4:
-                    label = row.cells[0].text.strip().upper()
-
-                    def extract_price(cell_text):
-                        match = re.search(r'(\d+)', cell_text.replace(',', '').replace('.', ''))
-                        return int(match.group(1)) if match else 0
-
-                    p3 = extract_price(row.cells[1].text)
-                    p4 = extract_price(row.cells[2].text)
-                    p5 = extract_price(row.cells[3].text)
-
-                    # Map to pax tiers
-                    if '10' in label and ('PAX' in label or 'KİŞİ' in label):
-                        data['pricing']['paxTiers']['10'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '8' in label and ('PAX' in label or 'KİŞİ' in label):
-                        data['pricing']['paxTiers']['8'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '6' in label and ('PAX' in label or 'KİŞİ' in label):
-                        data['pricing']['paxTiers']['6'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '4' in label and ('PAX' in label or 'KİŞİ' in label):
-                        data['pricing']['paxTiers']['4'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '2' in label and ('PAX' in label or 'KİŞİ' in label):
-                        data['pricing']['paxTiers']['2'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif 'SINGLE' in label or 'TEK' in label:
-                        for tier in data['pricing']['paxTiers']:
-                            data['pricing']['paxTiers'][tier]['threestar']['singleSupplement'] = p3
-                            data['pricing']['paxTiers'][tier]['fourstar']['singleSupplement'] = p4
-                            data['pricing']['paxTiers'][tier]['fivestar']['singleSupplement'] = p5
-                    elif 'CHILD' in label or 'ÇOCUK' in label:
-                        if '0-6' in label or '0' in label.split()[0]:
-                            data['pricing']['childRates']['age0to6'] = {'threestar': p3, 'fourstar': p4, 'fivestar': p5}
-                        elif '6-12' in label or '12' in label:
-                            data['pricing']['childRates']['age6to12'] = {'threestar': p3, 'fourstar': p4, 'fivestar': p5}
-
-    # Extract destinations from title
-    title_lower = data['title'].lower()
-    destinations = []
-
-    city_map = {
-        'budapest': 'Budapest',
-        'vienna': 'Vienna',
-        'prague': 'Prague',
-        'zagreb': 'Zagreb',
-        'split': 'Split',
-        'dubrovnik': 'Dubrovnik',
-        'helsinki': 'Helsinki',
-        'rovaniemi': 'Rovaniemi',
-        'hvar': 'Hvar'
-    }
-
-    for key, city in city_map.items():
-        if key in title_lower:
-            destinations.append(city)
-
-    # Also check itinerary
-    for day in data['itinerary']:
-        for key, city in city_map.items():
-            if key in day['title'].lower() and city not in destinations:
-                destinations.append(city)
-
-    data['destinations'] = ', '.join(destinations) if destinations else 'Europe'
+def extract_price(cell_text):
+    """Extract the numeric value from a price cell (',' and '.' are thousands separators)"""
+    match = re.search(r'(\d+)', cell_text.replace(',', '').replace('.', ''))
+    return int(match.group(1)) if match else 0
+
+def parse_europe_table(package, grid):
+    """Read hotel and pricing rows from one table grid into a Package record"""
+    if len(grid) < 2:
+        return
+
+    first_cell = grid.cell(0, 0).strip().lower()
+
+    # Hotels table
+    if any(x in first_cell for x in ['city', 'şehir', 'location', 'lokasyon']):
+        for row in grid.rows(1):
+            if len(row) >= 4:
+                city = row[0].strip()
+                h3 = row[1].strip().replace('\n', ' ')
+                h4 = row[2].strip().replace('\n', ' ')
+                h5 = row[3].strip().replace('\n', ' ')
+                if city and h3:
+                    package.hotels['threestar'].append(f"{city}: {h3}")
+                if city and h4:
+                    package.hotels['fourstar'].append(f"{city}: {h4}")
+                if city and h5:
+                    package.hotels['fivestar'].append(f"{city}: {h5}")
+
+    # Pricing table
+    elif any(x in first_cell for x in ['pax', 'kişi', 'person']):
+        for row in grid.rows(1):
+            if len(row) >= 4:
+                label = row[0].strip().upper()
+
+                p3 = extract_price(row[1])
+                p4 = extract_price(row[2])
+                p5 = extract_price(row[3])
+
+                # Map to pax tiers
+                is_tier = 'PAX' in label or 'KİŞİ' in label
+                tier = next((tier for tier in PAX_TIERS if tier in label), None) if is_tier else None
+                if tier:
+                    package.pax_tiers[tier] = PriceTier(p3, p4, p5)
+                elif 'SINGLE' in label or 'TEK' in label:
+                    package.set_single_supplements(p3, p4, p5)
+                elif 'CHILD' in label or 'ÇOCUK' in label:
+                    if '0-6' in label or '0' in label.split()[0]:
+                        package.child_rates['age0to6'] = ChildRates(p3, p4, p5)
+                    elif '6-12' in label or '12' in label:
+                        package.child_rates['age6to12'] = ChildRates(p3, p4, p5)
+
+
+def extract_europe_package(file_path, reader=iter_docx_blocks):
+    """Extract package data from Europe Word file, as the package JSON shape"""
+    return extract_europe_record(file_path, reader).to_dict()
+
+
+def extract_europe_record(file_path, reader=iter_docx_blocks):
+    """Extract package data from Europe Word file into an extraction.records.Package
+
+    reader yields the document body as (kind, content) blocks, see
+    extraction.docx_reader; the default streams the XML without python-docx.
+    """
+    data = Package('WITH_HOTEL', 'PRIVATE', 'PRIVATE', region='Europe')
+
+    # Parse paragraphs and tables in a single pass, in document order
+    _layout.parse(data, metrics.timed_blocks(reader(file_path)), parse_europe_table)
+
+    with metrics.stage('destinations'):
+        # Cities named in the title, then in the day titles, in order of first mention
+        destinations = _find_destinations.find(data.title, *(day.title for day in data.itinerary))
+        data.destinations = ', '.join(destinations) if destinations else 'Europe'
 
     # Create description
-    if data['itinerary']:
-        data['description'] = f"Discover the beauty of {data['destinations']} with this {data['duration']} package. "
-        if data['itinerary'][0]['description']:
-            data['description'] += data['itinerary'][0]['description'][:200] + "..."
+    if data.itinerary:
+        data.description = f"Discover the beauty of {data.destinations} with this {data.duration} package. "
+        first_description = data.itinerary[0].description
+        if first_description:
+            data.description += first_description[:200] + "..."
 
     # Generate highlights
     highlights = []
-    for day in data['itinerary']:
-        if any(x in day['title'].lower() for x in ['tour', 'visit', 'explore', 'cruise']):
-            highlights.append(day['title'])
-    data['highlights'] = highlights[:5] if highlights else [
-        f"Explore {data['destinations']}",
+    for day in data.itinerary:
+        if any(x in day.title.lower() for x in ['tour', 'visit', 'explore', 'cruise']):
+            highlights.append(day.title)
+    data.highlights = highlights[:5] if highlights else [
+        f"Explore {data.destinations}",
         "Professional English-speaking guide",
         "Private airport transfers",
         "Quality 4-star hotel accommodations"
@@ -257,15 +159,12 @@ def extract_europe_package(file_path):
     return data
 
 
-def process_europe_packages():
-    """Process all Europe Word files"""
-    europe_path = r"C:\Users\fatih\Desktop\2026 packages\EUROPE 2026"
+EUROPE_PATH = r"C:\Users\fatih\Desktop\2026 packages\EUROPE 2026"
 
-    all_packages = []
-
-    print(f"\n=== Processing Europe Packages ===")
-    print(f"Path: {europe_path}\n")
 
+def find_europe_files(europe_path=EUROPE_PATH):
+    """List (filename, file_path) for every Europe source document, in processing order"""
+    found = []
     # Only process .docx files (not Turkish translations or temp files)
     for filename in sorted(os.listdir(europe_path)):
         if not filename.endswith('.docx'):
@@ -274,80 +173,172 @@ def process_europe_packages():
             continue
         if 'TR' in filename or 'TURKCE' in filename:
             continue  # Skip Turkish versions for now
+        found.append((filename, os.path.join(europe_path, filename)))
+    return found
 
-        file_path = os.path.join(europe_path, filename)
 
-        try:
-            pkg_data = extract_europe_package(file_path)
+def europe_package_id(filename):
+    """packageId of a Europe source document, from its number prefix"""
+    num_match = re.match(r'^(\d+)', filename)
+    pkg_num = num_match.group(1) if num_match else '00'
+    return f"EUR-PVT-{pkg_num}"
 
-            # Extract package number from filename
-            num_match = re.match(r'^(\d+)', filename)
-            pkg_num = num_match.group(1) if num_match else '00'
 
-            # Create unique package ID for Europe
-            pkg_data['packageId'] = f"EUR-PVT-{pkg_num}"
-            pkg_data['slug'] = slugify(f"{pkg_data['title']}-private")
-            pkg_data['region'] = 'Europe'  # Important: Set region for filtering
+def finalize_europe_package(pkg_data, filename):
+    """Add the ID, slug, region, image and price matrix derived from the source file"""
+    # Create unique package ID for Europe
+    pkg_data['packageId'] = europe_package_id(filename)
+    pkg_data['slug'] = slugify(f"{pkg_data['title']}-private")
+    pkg_data['region'] = 'Europe'  # Important: Set region for filtering
 
-            # Set default image based on destination
-            first_dest = pkg_data['destinations'].split(',')[0].strip().lower() if pkg_data['destinations'] else 'europe'
-            pkg_data['image'] = f"/images/packages/{first_dest}-tour.jpg"
+    # Set default image based on destination
+    first_dest = pkg_data['destinations'].split(',')[0].strip().lower() if pkg_data['destinations'] else 'europe'
+    pkg_data['image'] = f"/images/packages/{first_dest}-tour.jpg"
 
-            all_packages.append(pkg_data)
-            print(f"  ✓ Extracted: {pkg_data['packageId']} - {pkg_data['title']}")
+    # Dense pax tier x hotel class price matrix for fast quoting
+    pkg_data['priceMatrix'] = price_matrix_json(pkg_data['pricing'])
+    return pkg_data
 
-        except Exception as e:
-            print(f"  ✗ Error: {filename} - {e}")
 
-    return all_packages
+def is_europe_package(package_id):
+    """Whether a packageId belongs to this script"""
+    return package_id.startswith('EUR-')
 
 
-def main():
-    """Main function to extract and merge packages"""
+def process_europe_packages(europe_path=EUROPE_PATH, workers=1, cache=None, report=None):
+    """Process all Europe Word files
 
-    # Extract Europe packages
-    europe_packages = process_europe_packages()
+    With workers > 1 (or 0 for every core) the documents are parsed in a
+    process pool; packages are still assembled in filename order.
+    With a cache, unchanged documents are not parsed again.
+    With a report (extraction.metrics.RunReport), per-document stage
+    timings and counters are collected in it.
+    Returns (packages, errors) where errors lists (file_path, message).
+    """
+    files = find_europe_files(europe_path)
+
+    print(f"\n=== Processing Europe Packages ===")
+    print(f"Path: {europe_path} ({len(files)} documents, workers: {resolve_workers(workers)})\n")
+
+    jobs = [(file_path,) for _, file_path in files]
+    outcomes = run_extraction_jobs(extract_europe_package, jobs, workers, cache, report)
 
-    # Load existing Turkey packages
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', '2026-packages.json')
+    all_packages = []
+    errors = []
+
+    for (filename, file_path), (pkg_data, error) in zip(files, outcomes):
+        if error:
+            errors.append((file_path, error))
+            continue
+
+        pkg_data = finalize_europe_package(pkg_data, filename)
+        all_packages.append(pkg_data)
+        print(f"  ✓ Extracted: {pkg_data['packageId']} - {pkg_data['title']}")
+
+    if cache is not None:
+        print(f"\n{cache.summary()}")
+
+    return all_packages, errors
 
-    if os.path.exists(data_path):
-        with open(data_path, 'r', encoding='utf-8') as f:
-            existing_packages = json.load(f)
-        print(f"\nLoaded {len(existing_packages)} existing Turkey packages")
+
+def save_merged_packages(europe_packages, fmt='json'):
+    """Upsert the Europe packages into 2026-packages and write europe-packages, both in fmt
+
+    Turkey packages are left as they are; a changeset of the Europe
+    packages plus a facet index and a search index of the whole catalogue
+    are written next to 2026-packages.
+    """
+    data_path = find_packages('2026-packages', fmt)
+
+    if data_path:
+        existing_packages = read_packages(data_path)
+        print(f"\nLoaded {len(existing_packages)} existing packages from {os.path.basename(data_path)}")
     else:
         existing_packages = []
         print("\nNo existing packages found")
 
-    # Remove any existing Europe packages (to avoid duplicates)
-    turkey_only = [p for p in existing_packages if not p.get('packageId', '').startswith('EUR-')]
-
     # Ensure all Turkey packages have region set
-    for pkg in turkey_only:
-        if 'region' not in pkg:
+    for pkg in existing_packages:
+        if 'region' not in pkg and not is_europe_package(pkg.get('packageId', '')):
             pkg['region'] = 'Turkey'
 
-    print(f"Turkey packages: {len(turkey_only)}")
-
-    # Merge packages
-    all_packages = turkey_only + europe_packages
+    all_packages, changeset = merge_packages(existing_packages, europe_packages, is_europe_package)
+    turkey_count = len(all_packages) - len(europe_packages)
 
-    # Save merged JSON
-    with open(data_path, 'w', encoding='utf-8') as f:
-        json.dump(all_packages, f, indent=2, ensure_ascii=False)
+    # Save merged packages
+    data_path = write_packages(all_packages, '2026-packages', fmt)
+    changes_path = write_changeset(changeset, data_path)
+    index_path = write_facet_index(all_packages, facet_index_path(data_path))
+    search_path = write_search_index(all_packages, search_index_path(data_path))
+    hotels_path = write_hotel_catalogue(all_packages, hotel_catalogue_path(data_path))
 
     print(f"\n=== COMPLETE ===")
     print(f"Total packages: {len(all_packages)}")
-    print(f"  - Turkey: {len(turkey_only)}")
+    print(f"  - Turkey: {turkey_count}")
     print(f"  - Europe: {len(europe_packages)}")
     print(f"Saved to: {data_path}")
-
-    # Also save Europe-only JSON for reference
-    europe_only_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'europe-packages.json')
-    with open(europe_only_path, 'w', encoding='utf-8') as f:
-        json.dump(europe_packages, f, indent=2, ensure_ascii=False)
+    print(changeset_summary(changeset))
+    print(f"Changeset: {changes_path}")
+    print(f"Facet index: {index_path}")
+    print(f"Search index: {search_path}")
+    print(f"Hotel catalogue: {hotels_path}")
+
+    # Also save Europe-only packages for reference
+    europe_only_path = write_packages(europe_packages, 'europe-packages', fmt)
     print(f"Europe packages also saved to: {europe_only_path}")
 
 
+def main():
+    """Main function to extract and merge packages"""
+    parser = argparse.ArgumentParser(description='Extract Europe packages and merge them into 2026-packages.json')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes for parsing (0 = one per CPU core, default 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='parse every document even if it is unchanged since the last run')
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help='discard cached extraction results before running')
+    parser.add_argument('--layout', choices=['single', 'sharded'], default='single',
+                        help='merge into 2026-packages.json, or write only the Europe shards in data/packages')
+    parser.add_argument('--format', choices=['json', 'min', 'gzip', 'msgpack', 'tables', 'ndjson'], default='json',
+                        help='single-file output: indented JSON, minified JSON, gzipped JSON, msgpack, '
+                             'deduplicated string tables or NDJSON (one package per line)')
+    parser.add_argument('--report', metavar='PATH',
+                        help='write a JSON run report with per-document stage timings and counts')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='write run metrics in the Prometheus textfile format')
+    args = parser.parse_args()
+    if args.format not in available_formats():
+        parser.error(f"--format {args.format} needs the {args.format} package (pip install {args.format})")
+
+    cache = None if args.no_cache else ExtractionCache(EXTRACTOR_VERSION)
+    if cache is not None and args.rebuild_cache:
+        cache.clear()
+
+    # Extract Europe packages
+    report = RunReport('europe') if args.report or args.metrics else None
+    europe_packages, errors = process_europe_packages(workers=args.workers, cache=cache, report=report)
+
+    if args.layout == 'sharded':
+        # Only the Europe shards are touched; Turkey shards stay as they are
+        stats = write_package_shards(europe_packages, is_europe_package, SHARD_DIR)
+        write_shard_facet_index(SHARD_DIR)
+        write_shard_search_index(SHARD_DIR)
+        write_shard_hotel_catalogue(SHARD_DIR)
+        print(f"\n=== COMPLETE ===")
+        print(f"Europe packages: {len(europe_packages)}")
+        print(f"Shards: {stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed")
+        print(f"Saved to: {SHARD_DIR}")
+    else:
+        save_merged_packages(europe_packages, args.format)
+
+    if report is not None:
+        write_run_report(report, args.report, args.metrics)
+
+    if errors:
+        print(f"\n=== ERRORS ({len(errors)}) ===")
+        for file_path, error in errors:
+            print(f"  ✗ {os.path.basename(file_path)} - {error}")
+
+
 if __name__ == '__main__':
     main()
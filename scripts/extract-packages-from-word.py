@@ -1,166 +1,125 @@
 import os
 import sys
-import json
 import re
+import argparse
 sys.stdout.reconfigure(encoding='utf-8')
 
-from docx import Document
-
-# Spanish translation dictionary for common tourism terms
-TRANSLATIONS = {
-    # Tour types
-    'Group Tour': 'Tour en Grupo',
-    'Private Tour': 'Tour Privado',
-    'Land Only': 'Solo Terrestre',
-    'Nights': 'Noches',
-
-    # Meals
-    'Breakfast': 'Desayuno',
-    'Lunch': 'Almuerzo',
-    'Dinner': 'Cena',
-    'B': 'D',  # Breakfast -> Desayuno
-    'L': 'A',  # Lunch -> Almuerzo
-    'D': 'C',  # Dinner -> Cena
-
-    # Common terms
-    'Day': 'Día',
-    'Arrival': 'Llegada',
-    'Departure': 'Salida',
-    'Transfer': 'Traslado',
-    'Tour': 'Tour',
-    'Full Day': 'Día Completo',
-    'Half Day': 'Medio Día',
-    'Free Day': 'Día Libre',
-    'at leisure': 'tiempo libre',
-    'hotel': 'hotel',
-    'airport': 'aeropuerto',
-    'cruise': 'crucero',
-    'visit': 'visitar',
-    'explore': 'explorar',
-
-    # Cities
-    'Istanbul': 'Estambul',
-    'Cappadocia': 'Capadocia',
-    'Kusadasi': 'Kusadasi',
-    'Antalya': 'Antalya',
-    'Ephesus': 'Éfeso',
-    'Pamukkale': 'Pamukkale',
-
-    # Inclusions
-    'nights accommodation': 'noches de alojamiento',
-    'Meals as per itinerary': 'Comidas según itinerario',
-    'Return airport transfers': 'Traslados de ida y vuelta al aeropuerto',
-    'Private basis': 'base privada',
-    'Professional English-Speaking Guidance': 'Guía profesional de habla inglesa',
-    'Group Tours': 'Tours en grupo',
-    'entrance fees': 'entradas incluidas',
-    'Local Taxes': 'Impuestos locales',
-
-    # Exclusions
-    'Flights': 'Vuelos',
-    'Personal expenses': 'Gastos personales',
-    'Drinks at meals': 'Bebidas en las comidas',
-    'Tips': 'Propinas',
-    'porterage': 'maleteros',
-    'driver': 'conductor',
-    'guide': 'guía',
+from extraction import metrics
+from extraction.cache import ExtractionCache
+from extraction.docx_reader import iter_docx_blocks
+from extraction.facets import facet_index_path, write_facet_index, write_shard_facet_index
+from extraction.gazetteer import default_gazetteer
+from extraction.hotels import hotel_catalogue_path, write_hotel_catalogue, write_shard_hotel_catalogue
+from extraction.layout import DocumentLayout
+from extraction.merge import (
+    add_changed_routes, changeset_summary, merge_packages, new_changeset, record_change, write_changeset,
+)
+from extraction.metrics import RunReport, write_run_report
+from extraction.output import (
+    PackageStream, available_formats, find_packages, iter_packages, open_package_lookup, packages_path,
+    read_packages, write_package_shards, write_packages,
+)
+from extraction.parallel import iter_extraction_jobs, resolve_workers, run_extraction_jobs
+from extraction.pricing import price_matrix_json
+from extraction.records import PAX_TIERS, ChildRates, Package, PriceTier
+from extraction.search import search_index_path, write_search_index, write_shard_search_index
+from extraction.translate import (
+    DEFAULT_MEMO_PATH, MultiPhraseTranslator, TranslationMemo, dictionary_version, load_locale_packs, locale_tables,
+)
+
+# Bump whenever extraction output changes so cached results are not reused
+EXTRACTOR_VERSION = 'turkey-4'
+
+# Target languages: every locale pack in extraction/locales (Spanish is the site's)
+LOCALE_PACKS = load_locale_packs()
+
+# How the rate sheets are laid out, see extraction.layout
+LAYOUT = {
+    'title': ('package',),
+    'duration': {'words': ('night', 'day'), 'pattern': r'^\d+\s*nights?\s*/\s*\d+\s*days?'},
+    'day_headers': [r'^Day\s*(\d+)\s*[-–]\s*(.+?)\s*\(([^)]*)\)'],
+    'day_like': [r'(?-i:Day )'],
+    'day_end': ('***',),
+    'day_breaks': ('inclusions', 'exclusions', 'information', 'hotel options', 'package rates'),
+    'sections': {
+        'included': ('inclusions',),
+        'notIncluded': ('exclusions',),
+        'information': ('information',),
+    },
+    'collect': {
+        'included': {'field': 'included', 'clean': True, 'skip': ('exclusions', 'information'),
+                     'skip_prefix': '***'},
+        'notIncluded': {'field': 'not_included', 'clean': True, 'skip': ('information', 'hotel options'),
+                        'skip_prefix': '***'},
+        'information': {'field': 'information', 'skip': ('hotel options', 'package rates'), 'skip_prefix': '***'},
+    },
 }
-
-def translate_to_spanish(text):
-    """Simple translation using dictionary"""
-    result = text
-    for en, es in TRANSLATIONS.items():
-        result = re.sub(re.escape(en), es, result, flags=re.IGNORECASE)
-    return result
+_layout = DocumentLayout(LAYOUT)
+
+# Turkey destinations from the shared gazetteer, matched in one scan per string
+_find_destinations = default_gazetteer().matcher(region='Turkey')
+
+# Compiled once; each call is a single scan over the text giving every
+# locale's translation, and text seen before (in this run or, once loaded,
+# an earlier one) is not scanned again
+_memo = TranslationMemo(dictionary_version(*(pack.to_dict() for pack in LOCALE_PACKS)))
+_translate_terms = _memo.memoize(
+    'terms', MultiPhraseTranslator(locale_tables(LOCALE_PACKS, 'terms'), ignore_case=True))
+_translate_title = _memo.memoize('title', MultiPhraseTranslator(locale_tables(LOCALE_PACKS, 'title')))
+_translate_day_title = _memo.memoize('dayTitle', MultiPhraseTranslator(locale_tables(LOCALE_PACKS, 'dayTitle')))
+_translate_description = _memo.memoize(
+    'description', MultiPhraseTranslator(locale_tables(LOCALE_PACKS, 'description')))
+_translate_meals = _memo.memoize('meals', MultiPhraseTranslator(locale_tables(LOCALE_PACKS, 'meals')))
+
+def _per_locale(value):
+    return {pack.code: value for pack in LOCALE_PACKS}
+
+def translate_terms(text):
+    """Translate tourism terms; {locale: text}"""
+    return _translate_terms(text)
 
 def translate_title(title):
-    """Translate package title to Spanish"""
-    result = title
-    result = result.replace('Nights Group Tour', 'Noches Tour en Grupo')
-    result = result.replace('Nights Private Tour', 'Noches Tour Privado')
-    result = result.replace(' - Land Only', ' - Solo Terrestre')
-    result = result.replace('Istanbul', 'Estambul')
-    result = result.replace('Cappadocia', 'Capadocia')
-    result = result.replace('Ephesus', 'Éfeso')
-    return result
+    """Translate package title; {locale: title}"""
+    return _translate_title(title)
 
 def translate_itinerary(itinerary):
-    """Translate itinerary to Spanish"""
-    translated = []
+    """Translate itinerary; {locale: days}"""
+    translated = {pack.code: [] for pack in LOCALE_PACKS}
     for day in itinerary:
-        es_day = {
-            'day': day['day'],
-            'title': translate_day_title(day['title']),
-            'description': translate_description(day['description']),
-            'meals': translate_meals(day['meals'])
-        }
-        translated.append(es_day)
+        titles = translate_day_title(day['title'])
+        descriptions = translate_description(day['description'])
+        meals = translate_meals(day['meals'])
+        for locale, days in translated.items():
+            days.append({
+                'day': day['day'],
+                'title': titles[locale],
+                'description': descriptions[locale],
+                'meals': meals[locale]
+            })
     return translated
 
 def translate_day_title(title):
-    """Translate day title"""
-    result = title
-    result = result.replace('Fly', 'Vuelo')
-    result = result.replace('Full Day Tour', 'Tour de Día Completo')
-    result = result.replace('Half Day Tour', 'Tour de Medio Día')
-    result = result.replace('Free Day', 'Día Libre')
-    result = result.replace('Arrival', 'Llegada')
-    result = result.replace('Departure', 'Salida')
-    result = result.replace('Istanbul', 'Estambul')
-    result = result.replace('Cappadocia', 'Capadocia')
-    result = result.replace('Ephesus', 'Éfeso')
-    result = result.replace('Bosphorus Cruise', 'Crucero por el Bósforo')
-    result = result.replace('incl.', 'incl.')
-    return result
+    """Translate day title; {locale: title}"""
+    return _translate_day_title(title)
 
 def translate_description(desc):
-    """Translate description to Spanish"""
+    """Translate description; {locale: description}"""
     if not desc:
-        return ''
-    result = desc
-    # Common phrases
-    result = result.replace('After breakfast at the hotel', 'Después del desayuno en el hotel')
-    result = result.replace('After breakfast', 'Después del desayuno')
-    result = result.replace('Arrive to', 'Llegada a')
-    result = result.replace('Arrival transfer to the hotel', 'Traslado de llegada al hotel')
-    result = result.replace('check-in', 'registro')
-    result = result.replace('The rest of the day is free', 'El resto del día es libre')
-    result = result.replace('at leisure', 'tiempo libre')
-    result = result.replace('guided tour', 'tour guiado')
-    result = result.replace('your tour will start', 'su tour comenzará')
-    result = result.replace('departure airport transfer', 'traslado al aeropuerto de salida')
-    result = result.replace('overnight', 'pernocte')
-    result = result.replace('Overnight', 'Pernocte')
-    # Places
-    result = result.replace('Istanbul', 'Estambul')
-    result = result.replace('Cappadocia', 'Capadocia')
-    result = result.replace('Ephesus', 'Éfeso')
-    result = result.replace('Blue Mosque', 'Mezquita Azul')
-    result = result.replace('Topkapi Palace', 'Palacio de Topkapi')
-    result = result.replace('Grand Bazaar', 'Gran Bazar')
-    result = result.replace('Spice Bazaar', 'Bazar de las Especias')
-    result = result.replace('Bosphorus', 'Bósforo')
-    result = result.replace('St.Sophia', 'Santa Sofía')
-    result = result.replace('Hagia Sophia', 'Santa Sofía')
-    result = result.replace('Hippodrome', 'Hipódromo')
-    return result
+        return _per_locale('')
+    return _translate_description(desc)
 
 def translate_meals(meals):
-    """Translate meal codes"""
+    """Translate meal codes; {locale: meals}"""
     if not meals or meals == '-':
-        return '-'
-    result = meals
-    result = result.replace('B', 'D')  # Breakfast -> Desayuno
-    result = result.replace('L', 'A')  # Lunch -> Almuerzo
-    # Note: D for Dinner stays as C (Cena) but we need to be careful
-    # Only replace D that's for Dinner, not Desayuno we just added
-    return result
+        return _per_locale('-')
+    return _translate_meals(meals)
 
 def translate_list(items):
-    """Translate list of items"""
-    translated = []
+    """Translate list of items; {locale: items}"""
+    translated = {pack.code: [] for pack in LOCALE_PACKS}
     for item in items:
-        translated.append(translate_to_spanish(item))
+        for locale, text in translate_terms(item).items():
+            translated[locale].append(text)
     return translated
 
 def slugify(text):
@@ -201,297 +160,408 @@ def create_better_title(destinations, duration, tour_type, package_type):
     else:
         return f"{dest_str} {tour_label}{type_suffix}"
 
-def extract_package_from_word(file_path, package_type='WITH_HOTEL', tour_type='SIC'):
-    """Extract all package data from a Word file"""
-    doc = Document(file_path)
-
-    # Initialize data structure
-    data = {
-        'title': '',
-        'duration': '',
-        'description': '',
-        'itinerary': [],
-        'included': [],
-        'notIncluded': [],
-        'information': [],
-        'hotels': {'threestar': [], 'fourstar': [], 'fivestar': []},
-        'pricing': {
-            'paxTiers': {},
-            'childRates': {
-                'age0to6': {'threestar': 0, 'fourstar': 0, 'fivestar': 0},
-                'age6to12': {'threestar': 0, 'fourstar': 0, 'fivestar': 0}
-            }
-        },
-        'destinations': '',
-        'packageType': package_type,
-        'tourType': tour_type,
-        'transferType': 'PRIVATE'  # All packages use private transfers
-    }
-
-    current_section = None
-    current_day = None
-
-    # Parse paragraphs
-    for para in doc.paragraphs:
-        text = para.text.strip()
-        if not text:
-            continue
+def extract_price(cell_text):
+    """Extract the numeric value from a price cell"""
+    match = re.search(r'(\d+)', cell_text.replace(',', ''))
+    return int(match.group(1)) if match else 0
+
+def parse_package_table(package, grid):
+    """Read hotel and pricing rows from one table grid into a Package record"""
+    first_cell = grid.cell(0, 0).strip().lower() if len(grid) else ''
+
+    # Hotels table
+    if 'city' in first_cell:
+        for row in grid.rows(1):
+            if len(row) >= 4:
+                city = row[0].strip()
+                h3 = row[1].strip().replace('\n', ' ').replace('  ', ' ')
+                h4 = row[2].strip().replace('\n', ' ').replace('  ', ' ')
+                h5 = row[3].strip().replace('\n', ' ').replace('  ', ' ')
+                if city:
+                    if h3:
+                        package.hotels['threestar'].append(f"{city}: {h3}")
+                    if h4:
+                        package.hotels['fourstar'].append(f"{city}: {h4}")
+                    if h5:
+                        package.hotels['fivestar'].append(f"{city}: {h5}")
+
+    # Pricing table
+    elif 'pax' in first_cell or 'dbl' in first_cell:
+        for row in grid.rows(1):
+            if len(row) >= 4:
+                label = row[0].strip().upper()
+
+                p3 = extract_price(row[1])
+                p4 = extract_price(row[2])
+                p5 = extract_price(row[3])
+
+                # Map to pax tiers
+                tier = next((tier for tier in PAX_TIERS if tier in label), None) if 'PAX' in label else None
+                if tier:
+                    package.pax_tiers[tier] = PriceTier(p3, p4, p5)
+                elif 'SINGLE' in label:
+                    # Add single supplement to all tiers
+                    package.set_single_supplements(p3, p4, p5)
+                elif 'CHILD' in label and ('0-6' in label or '0' in label.split()[0] if len(label.split()) > 0 else False):
+                    package.child_rates['age0to6'] = ChildRates(p3, p4, p5)
+                elif 'CHILD' in label and ('6-12' in label or '12' in label):
+                    package.child_rates['age6to12'] = ChildRates(p3, p4, p5)
+
+
+def extract_package_from_word(file_path, package_type='WITH_HOTEL', tour_type='SIC', reader=iter_docx_blocks):
+    """Extract all package data from a Word file, as the package JSON shape"""
+    return extract_package_record(file_path, package_type, tour_type, reader).to_dict()
+
+
+def extract_package_record(file_path, package_type='WITH_HOTEL', tour_type='SIC', reader=iter_docx_blocks):
+    """Extract all package data from a Word file into an extraction.records.Package
+
+    reader yields the document body as (kind, content) blocks, see
+    extraction.docx_reader; the default streams the XML without python-docx.
+    """
+    # All packages use private transfers
+    data = Package(package_type, tour_type, 'PRIVATE')
+
+    # Parse paragraphs and tables in a single pass, in document order
+    _layout.parse(data, metrics.timed_blocks(reader(file_path)), parse_package_table)
+
+    with metrics.stage('destinations'):
+        # Destinations named in the title, then in the day titles, in order of first mention
+        destinations = _find_destinations.find(data.title, *(day.title for day in data.itinerary))
+        data.destinations = ', '.join(destinations) if destinations else 'Turkey'
 
-        # Detect title (first significant paragraph, usually bold)
-        if not data['title'] and 'package' in text.lower():
-            data['title'] = text
-            continue
+    # Create better title
+    data.title = create_better_title(data.destinations, data.duration, tour_type, package_type)
 
-        # Detect duration
-        if not data['duration'] and ('night' in text.lower() or 'day' in text.lower()):
-            if re.match(r'^\d+\s*nights?\s*/\s*\d+\s*days?', text, re.I):
-                data['duration'] = text
-                continue
+    # Create description from first day or general intro
+    if data.itinerary:
+        data.description = f"Experience the best of {data.destinations} with this {data.duration} package. "
+        first_description = data.itinerary[0].description
+        if first_description:
+            data.description += first_description[:200] + "..."
 
-        # Detect day entries
-        day_match = re.match(r'^Day\s*(\d+)\s*[-–]\s*(.+?)\s*\(([^)]*)\)', text, re.I)
-        if day_match:
-            current_day = {
-                'day': int(day_match.group(1)),
-                'title': day_match.group(2).strip(),
-                'description': '',
-                'meals': day_match.group(3).strip() or '-'
-            }
-            data['itinerary'].append(current_day)
-            current_section = 'itinerary'
-            continue
+    return data
 
-        # Continue day description
-        if current_section == 'itinerary' and current_day and not text.startswith('Day '):
-            if text.startswith('***'):
-                current_section = None
-                current_day = None
-            elif text.lower() not in ['inclusions', 'exclusions', 'information', 'hotel options', 'package rates']:
-                if current_day['description']:
-                    current_day['description'] += ' '
-                current_day['description'] += text
-                continue
 
-        # Detect sections
-        if text.lower() == 'inclusions':
-            current_section = 'included'
-            continue
-        elif text.lower() == 'exclusions':
-            current_section = 'notIncluded'
-            continue
-        elif text.lower() == 'information':
-            current_section = 'information'
-            continue
+def add_translated_fields(data):
+    """Add the translations of an extracted package in every locale (titleEs, descriptionEs, ...)"""
+    titles = translate_title(data['title'])
+    destinations = translate_terms(data['destinations'])
+    intros = None
+    if data['itinerary'] and data['itinerary'][0]['description']:
+        intros = translate_description(data['itinerary'][0]['description'][:200])
+    itineraries = translate_itinerary(data['itinerary'])
+    included = translate_list(data['included'])
+    not_included = translate_list(data['notIncluded'])
+    highlights = translate_list(data.get('highlights', []))
+
+    for pack in LOCALE_PACKS:
+        locale, suffix = pack.code, pack.field_suffix
+        data[f'title{suffix}'] = titles[locale]
+        data[f'description{suffix}'] = pack.describe(destinations[locale], data['duration'])
+        if intros is not None:
+            data[f'description{suffix}'] += intros[locale] + "..."
+        data[f'itinerary{suffix}'] = itineraries[locale]
+        data[f'included{suffix}'] = included[locale]
+        data[f'notIncluded{suffix}'] = not_included[locale]
+        data[f'highlights{suffix}'] = highlights[locale]
+    return data
 
-        # Add to current section
-        if current_section == 'included' and text and not text.startswith('***'):
-            # Clean up the text
-            clean_text = text.rstrip(',').rstrip('.')
-            if clean_text and clean_text.lower() not in ['exclusions', 'information']:
-                data['included'].append(clean_text)
-        elif current_section == 'notIncluded' and text and not text.startswith('***'):
-            clean_text = text.rstrip(',').rstrip('.')
-            if clean_text and clean_text.lower() not in ['information', 'hotel options']:
-                data['notIncluded'].append(clean_text)
-        elif current_section == 'information' and text and not text.startswith('***'):
-            if text.lower() not in ['hotel options', 'package rates']:
-                data['information'].append(text)
-
-    # Parse tables
-    for table in doc.tables:
-        first_cell = table.rows[0].cells[0].text.strip().lower()
-
-        # Hotels table
-        if 'city' in first_cell:
-            for row in table.rows[1:]:
-                if len(row.cells) >= 4:
-                    city = row.cells[0].text.strip()
-                    h3 = row.cells[1].text.strip().replace('\n', ' ').replace('  ', ' ')
-                    h4 = row.cells[2].text.strip().replace('\n', ' ').replace('  ', ' ')
-                    h5 = row.cells[3].text.strip().replace('\n', ' ').replace('  ', ' ')
-                    if city:
-                        if h3:
-                            data['hotels']['threestar'].append(f"{city}: {h3}")
-                        if h4:
-                            data['hotels']['fourstar'].append(f"{city}: {h4}")
-                        if h5:
-                            data['hotels']['fivestar'].append(f"{city}: {h5}")
-
-        # Pricing table
-        elif 'pax' in first_cell or 'dbl' in first_cell:
-            for row in table.rows[1:]:
-                if len(row.cells) >= 4:
-                    label = row.cells[0].text.strip().upper()
-
-                    # Extract numeric values
-                    def extract_price(cell_text):
-                        match = re.search(r'(\d+)', cell_text.replace(',', ''))
-                        return int(match.group(1)) if match else 0
-
-                    p3 = extract_price(row.cells[1].text)
-                    p4 = extract_price(row.cells[2].text)
-                    p5 = extract_price(row.cells[3].text)
-
-                    # Map to pax tiers
-                    if '10' in label and 'PAX' in label:
-                        data['pricing']['paxTiers']['10'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '8' in label and 'PAX' in label:
-                        data['pricing']['paxTiers']['8'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '6' in label and 'PAX' in label:
-                        data['pricing']['paxTiers']['6'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '4' in label and 'PAX' in label:
-                        data['pricing']['paxTiers']['4'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif '2' in label and 'PAX' in label:
-                        data['pricing']['paxTiers']['2'] = {
-                            'threestar': {'double': p3, 'singleSupplement': 0},
-                            'fourstar': {'double': p4, 'singleSupplement': 0},
-                            'fivestar': {'double': p5, 'singleSupplement': 0}
-                        }
-                    elif 'SINGLE' in label:
-                        # Add single supplement to all tiers
-                        for tier in data['pricing']['paxTiers']:
-                            data['pricing']['paxTiers'][tier]['threestar']['singleSupplement'] = p3
-                            data['pricing']['paxTiers'][tier]['fourstar']['singleSupplement'] = p4
-                            data['pricing']['paxTiers'][tier]['fivestar']['singleSupplement'] = p5
-                    elif 'CHILD' in label and ('0-6' in label or '0' in label.split()[0] if len(label.split()) > 0 else False):
-                        data['pricing']['childRates']['age0to6'] = {'threestar': p3, 'fourstar': p4, 'fivestar': p5}
-                    elif 'CHILD' in label and ('6-12' in label or '12' in label):
-                        data['pricing']['childRates']['age6to12'] = {'threestar': p3, 'fourstar': p4, 'fivestar': p5}
-
-    # Extract destinations from title or itinerary
-    destinations = []
-    title_lower = data['title'].lower()
-    cities = ['istanbul', 'cappadocia', 'kusadasi', 'antalya', 'ephesus', 'pamukkale', 'bodrum', 'fethiye']
-    for city in cities:
-        if city in title_lower:
-            destinations.append(city.title())
-
-    # Also check itinerary for destinations
-    for day in data['itinerary']:
-        for city in cities:
-            if city in day['title'].lower() and city.title() not in destinations:
-                destinations.append(city.title())
-
-    data['destinations'] = ', '.join(destinations) if destinations else 'Turkey'
 
-    # Create better title
-    data['title'] = create_better_title(data['destinations'], data['duration'], tour_type, package_type)
+def load_translation_memo(path=DEFAULT_MEMO_PATH):
+    """Reuse translations remembered by earlier runs; save_translation_memo writes them back"""
+    _memo.load(path)
 
-    # Create description from first day or general intro
-    if data['itinerary']:
-        data['description'] = f"Experience the best of {data['destinations']} with this {data['duration']} package. "
-        if data['itinerary'][0]['description']:
-            data['description'] += data['itinerary'][0]['description'][:200] + "..."
-
-    # Add Spanish translations
-    data['titleEs'] = translate_title(data['title'])
-    data['descriptionEs'] = f"Experimente lo mejor de {translate_to_spanish(data['destinations'])} con este paquete de {data['duration'].replace('Nights', 'Noches').replace('Days', 'Días')}. "
-    if data['itinerary'] and data['itinerary'][0]['description']:
-        data['descriptionEs'] += translate_description(data['itinerary'][0]['description'][:200]) + "..."
-    data['itineraryEs'] = translate_itinerary(data['itinerary'])
-    data['includedEs'] = translate_list(data['included'])
-    data['notIncludedEs'] = translate_list(data['notIncluded'])
-    data['highlightsEs'] = translate_list(data.get('highlights', []))
 
-    return data
+def save_translation_memo():
+    """Persist the translation memo (if it was loaded)"""
+    _memo.save()
 
 
-def process_all_packages():
-    """Process all Word files and create JSON data"""
-    base_path = r"C:\Users\fatih\Desktop\2026 packages\website prices"
+BASE_PATH = r"C:\Users\fatih\Desktop\2026 packages\website prices"
 
-    folders = [
-        ("2026 PACKAGE WITH SIC TOURS & PVT AIRPORT TRANSFERS - FT - done", "WITH_HOTEL", "SIC"),
-        ("2026 PACKAGES WITH PVT TOURS & PVT AIRPORT TRANSFERS - FT", "WITH_HOTEL", "PRIVATE"),
-        ("ONLY LAND SIC TOURS & PVT AIRPORT TRANSFERS - FT", "LAND_ONLY", "SIC"),
-        ("ONLY LAND PVT TOURS & PVT AIRPORT TRANSFERS - FT", "LAND_ONLY", "PRIVATE"),
-    ]
+FOLDERS = [
+    ("2026 PACKAGE WITH SIC TOURS & PVT AIRPORT TRANSFERS - FT - done", "WITH_HOTEL", "SIC"),
+    ("2026 PACKAGES WITH PVT TOURS & PVT AIRPORT TRANSFERS - FT", "WITH_HOTEL", "PRIVATE"),
+    ("ONLY LAND SIC TOURS & PVT AIRPORT TRANSFERS - FT", "LAND_ONLY", "SIC"),
+    ("ONLY LAND PVT TOURS & PVT AIRPORT TRANSFERS - FT", "LAND_ONLY", "PRIVATE"),
+]
+
+# Unique package ID prefix per (package type, tour type)
+TYPE_PREFIX = {
+    ('WITH_HOTEL', 'SIC'): 'SIC',
+    ('WITH_HOTEL', 'PRIVATE'): 'PVT',
+    ('LAND_ONLY', 'SIC'): 'LAND-SIC',
+    ('LAND_ONLY', 'PRIVATE'): 'LAND-PVT',
+}
 
-    all_packages = []
 
-    for folder, package_type, tour_type in folders:
+def iter_package_files(base_path=BASE_PATH):
+    """Yield (filename, file_path, package_type, tour_type) for every source document, in processing order"""
+    for folder, package_type, tour_type in FOLDERS:
         folder_path = os.path.join(base_path, folder)
         if not os.path.exists(folder_path):
             continue
 
-        print(f"\n=== Processing: {folder} ===")
-
         for filename in sorted(os.listdir(folder_path)):
             if not filename.endswith('.docx') or filename.startswith('~$'):
                 continue
+            yield filename, os.path.join(folder_path, filename), package_type, tour_type
+
+
+def find_package_files(base_path=BASE_PATH):
+    """List (filename, file_path, package_type, tour_type) for every source document, in processing order"""
+    return list(iter_package_files(base_path))
+
+
+def package_id(filename, package_type, tour_type):
+    """packageId of a source document, from its folder's type and its number prefix"""
+    num_match = re.match(r'^(\d+)', filename)
+    pkg_num = num_match.group(1) if num_match else '00'
+
+    prefix = TYPE_PREFIX.get((package_type, tour_type), 'PKG')
+    return f"{prefix}-{pkg_num}"
+
+
+def finalize_package(pkg_data, filename, package_type, tour_type):
+    """Add the translated fields, ID, slug, image, highlights and price matrix derived from the source file
+
+    Translation happens here rather than in the extractor so it runs in the
+    main process, where the translation memo lives, and so cached
+    extraction results stay valid when the locale packs change. It is timed
+    as the 'translation' stage of the active recorder (see
+    extraction.metrics.recording_for).
+    """
+    with metrics.stage('translation'):
+        add_translated_fields(pkg_data)
+    pkg_data['packageId'] = package_id(filename, package_type, tour_type)
+    pkg_data['slug'] = slugify(f"{pkg_data['title']}-{tour_type.lower()}")
+
+    # Set default image
+    pkg_data['image'] = f"/images/packages/{pkg_data['slug']}.jpg"
+
+    # Generate highlights from itinerary
+    highlights = []
+    for day in pkg_data['itinerary']:
+        if 'tour' in day['title'].lower() or 'visit' in day['title'].lower():
+            highlights.append(day['title'])
+    pkg_data['highlights'] = highlights[:5] if highlights else [
+        f"Explore {pkg_data['destinations']}",
+        "Professional English-speaking guide",
+        "All transfers included",
+        "Quality hotel accommodations"
+    ]
 
-            file_path = os.path.join(folder_path, filename)
-
-            try:
-                pkg_data = extract_package_from_word(file_path, package_type, tour_type)
-
-                # Extract package number from filename
-                num_match = re.match(r'^(\d+)', filename)
-                pkg_num = num_match.group(1) if num_match else '00'
-
-                # Create unique package ID based on type
-                type_prefix = {
-                    ('WITH_HOTEL', 'SIC'): 'SIC',
-                    ('WITH_HOTEL', 'PRIVATE'): 'PVT',
-                    ('LAND_ONLY', 'SIC'): 'LAND-SIC',
-                    ('LAND_ONLY', 'PRIVATE'): 'LAND-PVT',
-                }
-                prefix = type_prefix.get((package_type, tour_type), 'PKG')
-
-                pkg_data['packageId'] = f"{prefix}-{pkg_num}"
-                pkg_data['slug'] = slugify(f"{pkg_data['title']}-{tour_type.lower()}")
-
-                # Set default image
-                pkg_data['image'] = f"/images/packages/{pkg_data['slug']}.jpg"
+    # Dense pax tier x hotel class price matrix for fast quoting
+    pkg_data['priceMatrix'] = price_matrix_json(pkg_data['pricing'])
+    pkg_data['region'] = 'Turkey'
+    return pkg_data
+
+
+def owns_package(package_id):
+    """Whether a packageId belongs to this script (everything except Europe)"""
+    return not package_id.startswith('EUR-')
+
+
+def process_all_packages(base_path=BASE_PATH, workers=1, cache=None, layout='single', fmt='json', report=None):
+    """Process all Word files and create JSON data
+
+    With workers > 1 (or 0 for every core) the documents are parsed in a
+    process pool; packages are still assembled in folder/filename order.
+    With a cache, unchanged documents are not parsed again.
+    layout 'sharded' writes data/packages/<packageId>.json plus a manifest
+    instead of the single 2026-packages.json; fmt picks how the single file
+    is written (see extraction.output.FORMATS; a single NDJSON file is
+    better written by stream_all_packages). The single file is merged by
+    packageId, so Europe packages already in it are kept, and a changeset is
+    written next to it. Either way a facet index and a search index of the
+    whole catalogue are written alongside (see extraction.facets and
+    extraction.search).
+    With a report (extraction.metrics.RunReport), per-document stage
+    timings and counters are collected in it.
+    Returns (packages, errors) where errors lists (file_path, message).
+    """
+    files = find_package_files(base_path)
+    jobs = [(file_path, package_type, tour_type) for _, file_path, package_type, tour_type in files]
+
+    print(f"\n=== Processing {len(files)} documents (workers: {resolve_workers(workers)}) ===")
+    outcomes = run_extraction_jobs(extract_package_from_word, jobs, workers, cache, report)
 
-                # Generate highlights from itinerary
-                highlights = []
-                for day in pkg_data['itinerary']:
-                    if 'tour' in day['title'].lower() or 'visit' in day['title'].lower():
-                        highlights.append(day['title'])
-                pkg_data['highlights'] = highlights[:5] if highlights else [
-                    f"Explore {pkg_data['destinations']}",
-                    "Professional English-speaking guide",
-                    "All transfers included",
-                    "Quality hotel accommodations"
-                ]
+    all_packages = []
+    errors = []
 
-                all_packages.append(pkg_data)
-                print(f"  Extracted: {pkg_data['packageId']} - {pkg_data['title']}")
+    for (filename, file_path, package_type, tour_type), (pkg_data, error) in zip(files, outcomes):
+        if error:
+            errors.append((file_path, error))
+            continue
 
-            except Exception as e:
-                print(f"  Error: {filename} - {e}")
+        with metrics.recording_for(report, file_path):
+            pkg_data = finalize_package(pkg_data, filename, package_type, tour_type)
+        all_packages.append(pkg_data)
+        print(f"  Extracted: {pkg_data['packageId']} - {pkg_data['title']}")
+    if report is not None:
+        # Translation runs after the extraction jobs; count it in the wall time
+        report.finish(resolve_workers(workers))
 
     # Save to JSON
     output_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
     os.makedirs(output_dir, exist_ok=True)
 
-    output_path = os.path.join(output_dir, '2026-packages.json')
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(all_packages, f, indent=2, ensure_ascii=False)
+    if layout == 'sharded':
+        output_path = os.path.join(output_dir, 'packages')
+        stats = write_package_shards(all_packages, owns_package, output_path)
+        index_path = write_shard_facet_index(output_path)
+        search_path = write_shard_search_index(output_path)
+        hotels_path = write_shard_hotel_catalogue(output_path)
+    else:
+        existing_path = find_packages('2026-packages', fmt, output_dir)
+        existing = read_packages(existing_path) if existing_path else []
+        merged, changeset = merge_packages(existing, all_packages, owns_package)
+        output_path = write_packages(merged, '2026-packages', fmt, output_dir)
+        changes_path = write_changeset(changeset, output_path)
+        index_path = write_facet_index(merged, facet_index_path(output_path))
+        search_path = write_search_index(merged, search_index_path(output_path))
+        hotels_path = write_hotel_catalogue(merged, hotel_catalogue_path(output_path))
 
     print(f"\n=== COMPLETE ===")
     print(f"Extracted {len(all_packages)} packages")
     print(f"Saved to: {output_path}")
+    if layout == 'sharded':
+        print(f"Shards: {stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed")
+    else:
+        print(f"Total packages in file: {len(merged)}")
+        print(changeset_summary(changeset))
+        print(f"Changeset: {changes_path}")
+    print(f"Facet index: {index_path}")
+    print(f"Search index: {search_path}")
+    print(f"Hotel catalogue: {hotels_path}")
+    if cache is not None:
+        print(cache.summary())
+    print(_memo.summary())
+    print_errors(errors)
+
+    return all_packages, errors
+
+
+def stream_all_packages(base_path=BASE_PATH, workers=1, cache=None, report=None):
+    """Extract every document into 2026-packages.ndjson, writing each package as soon as it is ready
+
+    Document discovery, parsing and writing form a pipeline joined by
+    bounded queues (see extraction.parallel.iter_extraction_jobs and
+    extraction.output.PackageStream), so memory stays flat however many
+    documents there are, and an interrupted run leaves the packages
+    extracted so far in 2026-packages.ndjson.partial. As with
+    process_all_packages, packages this script does not own keep their
+    place, and a changeset, facet index and search index are written next
+    to the file (built by reading it back one package at a time).
+    Returns (number of packages extracted, errors).
+    """
+    output_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = packages_path('2026-packages', 'ndjson', output_dir)
+    existing_path = find_packages('2026-packages', 'ndjson', output_dir)
+
+    jobs = ((file_path, package_type, tour_type)
+            for _, file_path, package_type, tour_type in iter_package_files(base_path))
+    changeset = new_changeset()
+    extracted = set()
+    errors = []
+
+    print(f"\n=== Streaming documents (workers: {resolve_workers(workers)}) ===")
+    with PackageStream(output_path) as stream, open_package_lookup(existing_path) as previous:
+        existing_ids = list(previous)
+        first_owned = next((i for i, pid in enumerate(existing_ids) if owns_package(pid)), len(existing_ids))
+        # Same order as merge_packages: the owned block replaces the first owned package
+        for pid in existing_ids[:first_owned]:
+            stream.write(previous.get(pid))
+
+        for (file_path, package_type, tour_type), pkg_data, error in iter_extraction_jobs(
+                extract_package_from_word, jobs, workers, cache, report):
+            if error:
+                errors.append((file_path, error))
+                continue
+            with metrics.recording_for(report, file_path):
+                pkg_data = finalize_package(pkg_data, os.path.basename(file_path), package_type, tour_type)
+            record_change(changeset, previous.get(pkg_data['packageId']), pkg_data)
+            extracted.add(pkg_data['packageId'])
+            stream.write(pkg_data)
+            print(f"  Extracted: {pkg_data['packageId']} - {pkg_data['title']}")
+
+        for pid in existing_ids[first_owned:]:
+            if not owns_package(pid):
+                stream.write(previous.get(pid))
+        changeset['removed'] = [pid for pid in existing_ids if owns_package(pid) and pid not in extracted]
+
+    add_changed_routes(changeset, iter_packages(output_path))
+    changes_path = write_changeset(changeset, output_path)
+    index_path = write_facet_index(iter_packages(output_path), facet_index_path(output_path))
+    search_path = write_search_index(iter_packages(output_path), search_index_path(output_path))
+    hotels_path = write_hotel_catalogue(iter_packages(output_path), hotel_catalogue_path(output_path))
+
+    print(f"\n=== COMPLETE ===")
+    print(f"Extracted {len(extracted)} packages")
+    print(f"Saved to: {output_path}")
+    print(f"Total packages in file: {stream.count}")
+    print(changeset_summary(changeset))
+    print(f"Changeset: {changes_path}")
+    print(f"Facet index: {index_path}")
+    print(f"Search index: {search_path}")
+    print(f"Hotel catalogue: {hotels_path}")
+    if cache is not None:
+        print(cache.summary())
+    print(_memo.summary())
+    print_errors(errors)
+
+    return len(extracted), errors
+
+
+def print_errors(errors):
+    """List the documents that failed, if any"""
+    if errors:
+        print(f"\n=== ERRORS ({len(errors)}) ===")
+        for file_path, error in errors:
+            print(f"  {os.path.basename(file_path)} - {error}")
+
+
+def main():
+    """Parse command line options and run the extraction"""
+    parser = argparse.ArgumentParser(description='Extract 2026 packages from the Word rate sheets')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes for parsing (0 = one per CPU core, default 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='parse and translate every document even if it is unchanged since the last run')
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help='discard cached extraction results and translations before running')
+    parser.add_argument('--layout', choices=['single', 'sharded'], default='single',
+                        help='one 2026-packages.json, or one file per package plus a manifest in data/packages')
+    parser.add_argument('--format', choices=['json', 'min', 'gzip', 'msgpack', 'tables', 'ndjson'], default='json',
+                        help='single-file output: indented JSON, minified JSON, gzipped JSON, msgpack, '
+                             'deduplicated string tables, or NDJSON streamed while documents are parsed')
+    parser.add_argument('--report', metavar='PATH',
+                        help='write a JSON run report with per-document stage timings and counts')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='write run metrics in the Prometheus textfile format')
+    args = parser.parse_args()
+    if args.format not in available_formats():
+        parser.error(f"--format {args.format} needs the {args.format} package (pip install {args.format})")
+
+    cache = None if args.no_cache else ExtractionCache(EXTRACTOR_VERSION)
+    if cache is not None:
+        load_translation_memo()
+        if args.rebuild_cache:
+            cache.clear()
+            _memo.clear()
+
+    report = RunReport('turkey') if args.report or args.metrics else None
+    if args.layout == 'single' and args.format == 'ndjson':
+        stream_all_packages(workers=args.workers, cache=cache, report=report)
+    else:
+        process_all_packages(workers=args.workers, cache=cache, layout=args.layout, fmt=args.format, report=report)
+    save_translation_memo()
 
-    return all_packages
+    if report is not None:
+        write_run_report(report, args.report, args.metrics)
 
 
 if __name__ == '__main__':
-    process_all_packages()
+    main()
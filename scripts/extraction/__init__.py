@@ -0,0 +1 @@
+"""Shared helpers for the Word package extraction scripts"""
@@ -0,0 +1,69 @@
+"""Content-hash cache for extracted package data"""
+import hashlib
+import json
+import os
+import shutil
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '.cache', 'extraction')
+
+
+def file_digest(file_path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Persistent cache of extractor output keyed by document content and extractor version
+
+    Entries live as one JSON file per key, so a cache hit returns the same
+    package dict the extractor produced without opening the .docx at all.
+    Bump the extractor version whenever its output changes.
+    """
+
+    def __init__(self, version, cache_dir=DEFAULT_CACHE_DIR):
+        self.version = version
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, file_path, *args):
+        """Cache key for a document plus the extractor arguments used on it"""
+        parts = [self.version, file_digest(file_path)] + [str(a) for a in args]
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Return the cached package dict for key, or None"""
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store a package dict under key"""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """Drop every cached entry"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def summary(self):
+        """One-line hit/miss report"""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0
+        return f"Cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
@@ -0,0 +1,219 @@
+"""Streaming reader for the body of a .docx file
+
+The extractors only need paragraph text and table cell text, so instead of
+building python-docx's full object model this streams the main document part
+straight out of the zip and yields body blocks in document order:
+
+    ('paragraph', text)
+    ('table', grid)     grid is a TableGrid of cell texts
+
+Text follows python-docx's rules (runs and hyperlinks only, tabs, breaks and
+no-break hyphens translated) and table rows repeat horizontally merged cells
+and resolve vertically merged ones exactly like ``row.cells``, so the output
+matches ``para.text`` / ``cell.text`` character for character.
+"""
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+_BODY = W + 'body'
+_P = W + 'p'
+_R = W + 'r'
+_HYPERLINK = W + 'hyperlink'
+_TBL = W + 'tbl'
+_TR = W + 'tr'
+_TC = W + 'tc'
+_TRPR = W + 'trPr'
+_TCPR = W + 'tcPr'
+_VAL = W + 'val'
+_TYPE = W + 'type'
+
+_SIMPLE_RUN_TEXT = {
+    W + 'tab': '\t',
+    W + 'ptab': '\t',
+    W + 'cr': '\n',
+    W + 'noBreakHyphen': '-',
+}
+
+
+def _main_part_name(archive):
+    """Name of the main document part, from the package relationships"""
+    try:
+        rels = ET.fromstring(archive.read('_rels/.rels'))
+    except KeyError:
+        return 'word/document.xml'
+    for rel in rels.iter(REL + 'Relationship'):
+        if rel.get('Type') == OFFICE_DOCUMENT:
+            return posixpath.normpath(rel.get('Target').lstrip('/'))
+    return 'word/document.xml'
+
+
+def _run_text(run):
+    """Text of a w:r element, as python-docx's Run.text"""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W + 't':
+            parts.append(child.text or '')
+        elif tag == W + 'br':
+            # Only line breaks count as text; page and column breaks do not
+            if child.get(_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag in _SIMPLE_RUN_TEXT:
+            parts.append(_SIMPLE_RUN_TEXT[tag])
+    return ''.join(parts)
+
+
+def paragraph_text(p):
+    """Text of a w:p element, as python-docx's Paragraph.text"""
+    parts = []
+    for child in p:
+        if child.tag == _R:
+            parts.append(_run_text(child))
+        elif child.tag == _HYPERLINK:
+            parts.extend(_run_text(r) for r in child if r.tag == _R)
+    return ''.join(parts)
+
+
+def _int_property(parent, props_tag, name, default):
+    """Integer w:val of a row/cell property such as gridSpan"""
+    props = parent.find(props_tag)
+    if props is None:
+        return default
+    el = props.find(W + name)
+    if el is None:
+        return default
+    try:
+        return int(el.get(_VAL))
+    except (TypeError, ValueError):
+        return default
+
+
+def _vmerge(tc):
+    """Vertical merge state of a cell: None, 'restart' or 'continue'"""
+    tcPr = tc.find(_TCPR)
+    if tcPr is None:
+        return None
+    el = tcPr.find(W + 'vMerge')
+    if el is None:
+        return None
+    return el.get(_VAL, 'continue')
+
+
+class TableGrid:
+    """Cell texts of one table, materialized once as a flat row x column grid
+
+    Merged cells are resolved when the grid is built (a merged cell's text is
+    shared by every grid position it covers), so reading a cell is a plain
+    tuple index. Rows keep their populated width, which like python-docx's
+    row.cells may be shorter than the table width.
+    """
+    __slots__ = ('width', 'row_widths', '_cells')
+
+    def __init__(self, rows):
+        self.width = max((len(row) for row in rows), default=0)
+        self.row_widths = tuple(len(row) for row in rows)
+        cells = []
+        for row in rows:
+            cells.extend(row)
+            cells.extend([''] * (self.width - len(row)))
+        self._cells = tuple(cells)
+
+    @classmethod
+    def from_python_docx(cls, table):
+        """Build a grid from a python-docx Table in one pass over its XML
+
+        Unlike row.cells, which walks back up the table for every vertically
+        merged cell on every access, merges are resolved once here.
+        """
+        return table_grid(table._tbl)
+
+    def __len__(self):
+        return len(self.row_widths)
+
+    def __eq__(self, other):
+        return (isinstance(other, TableGrid) and self.row_widths == other.row_widths
+                and self._cells == other._cells)
+
+    def __repr__(self):
+        return f"TableGrid({[list(row) for row in self.rows()]!r})"
+
+    def cell(self, row, column):
+        """Text at a grid position ('' outside the populated part of a row)"""
+        if column >= self.width:
+            return ''
+        return self._cells[row * self.width + column]
+
+    def rows(self, start=0):
+        """Yield each row from start as a tuple of its populated cell texts"""
+        width = self.width
+        for index in range(start, len(self.row_widths)):
+            offset = index * width
+            yield self._cells[offset:offset + self.row_widths[index]]
+
+
+def table_grid(tbl):
+    """Cell texts of a w:tbl element, resolved the same way as python-docx's row.cells"""
+    rows = []
+    above = {}  # grid offset -> (text, repeat) of each cell in the previous row
+    for tr in tbl.iterfind(_TR):
+        offset = _int_property(tr, _TRPR, 'gridBefore', 0)
+        cells = []
+        current = {}
+        for tc in tr.iterfind(_TC):
+            span = _int_property(tc, _TCPR, 'gridSpan', 1)
+            if _vmerge(tc) == 'continue' and offset in above:
+                # Continuation of a vertical merge repeats the cell above
+                text, repeat = above[offset]
+            else:
+                text = '\n'.join(paragraph_text(p) for p in tc.iterfind(_P))
+                repeat = span
+            current[offset] = (text, repeat)
+            cells.extend([text] * repeat)
+            offset += span
+        rows.append(cells)
+        above = current
+    return TableGrid(rows)
+
+
+def iter_docx_blocks(file_path):
+    """Yield ('paragraph', text) and ('table', grid) for each body block in document order"""
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open(_main_part_name(archive)) as stream:
+            body = None
+            depth = 0
+            for event, el in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if el.tag == _BODY and depth == 2:
+                        body = el
+                    continue
+
+                depth -= 1
+                if body is None or depth != 2:
+                    continue
+                if el.tag == _P:
+                    yield 'paragraph', paragraph_text(el)
+                elif el.tag == _TBL:
+                    yield 'table', table_grid(el)
+                # Finished body blocks are dropped so memory stays flat
+                body.remove(el)
+
+
+def iter_python_docx_blocks(file_path):
+    """Same blocks as iter_docx_blocks, read through python-docx (reference implementation)"""
+    from docx import Document
+
+    doc = Document(file_path)
+    paragraphs = iter(doc.paragraphs)
+    tables = iter(doc.tables)
+    for child in doc.element.body.iterchildren():
+        if child.tag == _P:
+            yield 'paragraph', next(paragraphs).text
+        elif child.tag == _TBL:
+            table = next(tables)
+            yield 'table', TableGrid([[cell.text for cell in row.cells] for row in table.rows])
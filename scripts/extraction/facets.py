@@ -0,0 +1,174 @@
+"""Precomputed facet index for filtering the package catalogue
+
+Written next to the package list (2026-packages.index.json, or index.json
+covering every shard in the shard folder) so a listing can be filtered with
+set intersections and binary searches instead of scanning every package:
+
+    {"version": 1,
+     "packageIds": [...],                       catalogue order
+     "facets": {"region": {"Turkey": [ids]}, "destinations": {...},
+                "tourType": {...}, "packageType": {...}},
+     "byNights": {"values": [3, 3, 4], "ids": [...]},
+     "byMinPrice": {"threestar": {"values": [...], "ids": [...]}, ...}}
+
+Inverted lists keep catalogue order; the sorted arrays are ordered by value
+and then catalogue order. byMinPrice holds each package's lowest double
+rate over all pax tiers for that hotel class.
+"""
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right
+
+from extraction.output import SHARD_DIR, load_package_shards, min_price, write_json_atomic
+from extraction.pricing import HOTEL_CLASSES
+
+FACET_INDEX_VERSION = 1
+SHARD_INDEX_NAME = 'index.json'
+
+_NIGHTS = re.compile(r'(\d+)\s*(?:nights?|noches?|gece)', re.IGNORECASE)
+
+
+def package_nights(pkg):
+    """Number of nights from a duration like '3 Nights / 4 Days', or None"""
+    match = _NIGHTS.search(pkg.get('duration') or '')
+    return int(match.group(1)) if match else None
+
+
+def package_destinations(pkg):
+    """Destinations of a package as a list"""
+    return [name.strip() for name in (pkg.get('destinations') or '').split(',') if name.strip()]
+
+
+def min_class_prices(pkg):
+    """{hotel class: lowest per-person double rate over the pax tiers} for the classes that have one
+
+    Uses output.min_price, which gives the manifest's minPrice, so facet and
+    listing prices agree.
+    """
+    lowest = {hotel_class: min_price(pkg, hotel_class) for hotel_class in HOTEL_CLASSES}
+    return {hotel_class: price for hotel_class, price in lowest.items() if price is not None}
+
+
+def _sorted_array(pairs):
+    """{'values', 'ids'} for (value, catalogue position, id) triples, sorted by value"""
+    pairs.sort(key=lambda pair: (pair[0], pair[1]))
+    return {'values': [pair[0] for pair in pairs], 'ids': [pair[2] for pair in pairs]}
+
+
+def build_facet_index(packages):
+    """Facet index of a package list or iterable (see the module docstring)"""
+    facets = {'region': {}, 'destinations': {}, 'tourType': {}, 'packageType': {}}
+    nights = []
+    prices = {hotel_class: [] for hotel_class in HOTEL_CLASSES}
+    ids = []
+
+    for position, pkg in enumerate(packages):
+        package_id = pkg['packageId']
+        ids.append(package_id)
+        facets['region'].setdefault(pkg.get('region', 'Turkey'), []).append(package_id)
+        for destination in package_destinations(pkg):
+            postings = facets['destinations'].setdefault(destination, [])
+            if not postings or postings[-1] != package_id:
+                postings.append(package_id)
+        for field in ('tourType', 'packageType'):
+            if pkg.get(field):
+                facets[field].setdefault(pkg[field], []).append(package_id)
+
+        count = package_nights(pkg)
+        if count is not None:
+            nights.append((count, position, package_id))
+        for hotel_class, price in min_class_prices(pkg).items():
+            prices[hotel_class].append((price, position, package_id))
+
+    return {
+        'version': FACET_INDEX_VERSION,
+        'packageIds': ids,
+        'facets': {name: dict(sorted(values.items())) for name, values in facets.items()},
+        'byNights': _sorted_array(nights),
+        'byMinPrice': {hotel_class: _sorted_array(pairs) for hotel_class, pairs in prices.items()},
+    }
+
+
+def facet_index_path(packages_path):
+    """Index path for a package list (<name>.index.json next to it)"""
+    base = os.path.basename(packages_path).split('.')[0]
+    return os.path.join(os.path.dirname(packages_path), f"{base}.index.json")
+
+
+def write_facet_index(packages, path):
+    """Build and write the facet index of packages to path, returning the path"""
+    write_json_atomic(path, build_facet_index(packages), indent=None)
+    return path
+
+
+def write_shard_facet_index(shard_dir=SHARD_DIR):
+    """Rebuild index.json of the shard folder from every shard, returning its path"""
+    return write_facet_index(load_package_shards(shard_dir), os.path.join(shard_dir, SHARD_INDEX_NAME))
+
+
+class FacetIndex:
+    """Filter packageIds with a facet index
+
+        index = FacetIndex.load('data/2026-packages.index.json')
+        index.query(region='Turkey', destinations=['Istanbul'], nights=(4, 7),
+                    max_price=('fourstar', 900))
+    """
+
+    def __init__(self, data):
+        if data.get('version') != FACET_INDEX_VERSION:
+            raise ValueError(f"unsupported facet index version: {data.get('version')}")
+        self.data = data
+        self.package_ids = data['packageIds']
+        self._position = {package_id: i for i, package_id in enumerate(self.package_ids)}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def values(self, facet):
+        """Values of a facet with their package counts"""
+        return {value: len(ids) for value, ids in self.data['facets'][facet].items()}
+
+    @staticmethod
+    def _range(array, low=None, high=None):
+        """ids of a sorted array whose value lies in [low, high] (either bound may be None)"""
+        start = 0 if low is None else bisect_left(array['values'], low)
+        end = len(array['values']) if high is None else bisect_right(array['values'], high)
+        return set(array['ids'][start:end])
+
+    def query(self, region=None, destinations=None, tourType=None, packageType=None,
+              nights=None, max_price=None):
+        """packageIds matching every given filter, in catalogue order
+
+        destinations requires all the listed places; nights is (min, max)
+        with either bound None; max_price is (hotel class, highest price).
+        """
+        candidates = []
+        facets = self.data['facets']
+        for facet, value in (('region', region), ('tourType', tourType), ('packageType', packageType)):
+            if value is not None:
+                candidates.append(set(facets[facet].get(value, [])))
+        for destination in destinations or []:
+            candidates.append(set(facets['destinations'].get(destination, [])))
+        if nights is not None:
+            candidates.append(self._range(self.data['byNights'], *nights))
+        if max_price is not None:
+            hotel_class, highest = max_price
+            candidates.append(self._range(self.data['byMinPrice'][hotel_class], None, highest))
+
+        if not candidates:
+            return list(self.package_ids)
+        # Intersect the smallest sets first
+        candidates.sort(key=len)
+        matched = candidates[0].intersection(*candidates[1:])
+        return sorted(matched, key=self._position.__getitem__)
+
+    def cheapest(self, hotel_class, ids=None):
+        """packageIds by lowest price for a hotel class (only those in ids, when given)"""
+        array = self.data['byMinPrice'][hotel_class]
+        if ids is None:
+            return list(array['ids'])
+        wanted = set(ids)
+        return [package_id for package_id in array['ids'] if package_id in wanted]
@@ -0,0 +1,93 @@
+"""Destination gazetteer and a compiled matcher that finds places in text
+
+The places (cities and countries, with their region and Turkish and Spanish
+aliases) live in gazetteer.json next to this module. A PlaceMatcher compiles
+every name and alias of the places it covers into one trie-shaped regex
+(see extraction.translate.compile_phrases), so a string is scanned once
+however many places there are.
+"""
+import functools
+import json
+import os
+import re
+
+from extraction.translate import compile_phrases
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'gazetteer.json')
+
+
+def fold(text):
+    """Case-insensitive key for a place name; Turkish dotted and dotless i both become i
+
+    casefold() rather than lower() so letters IGNORECASE matches to their
+    plain form (the long s, the Kelvin sign) fold to it too.
+    """
+    return text.casefold().replace('\u0307', '').replace('ı', 'i')
+
+
+class PlaceMatcher:
+    """Finds places by name or alias, on word boundaries and ignoring case
+
+        matcher.find('Istanbul & Kapadokya')  # ['Istanbul', 'Cappadocia']
+    """
+
+    def __init__(self, places):
+        self._lookup = {}
+        for place in places:
+            names = [place['name']] + [alias for aliases in place.get('aliases', {}).values() for alias in aliases]
+            for name in names:
+                # Keep the first place when two names fold to the same key
+                self._lookup.setdefault(fold(name), place['name'])
+        keys = [key for key in self._lookup if key]
+        # IGNORECASE also treats i, I, İ and ı as one letter, matching fold()
+        self._regex = compile_phrases(keys, re.IGNORECASE) if keys else None
+
+    def __len__(self):
+        return len(set(self._lookup.values()))
+
+    def find(self, *texts):
+        """Places mentioned in the texts, each once, in order of first occurrence"""
+        found = {}
+        if self._regex is None:
+            return []
+        for text in texts:
+            if not text:
+                continue
+            for match in self._regex.finditer(text):
+                place = self._lookup.get(fold(match.group(0)))
+                if place is not None:  # a case match fold() cannot map back is not worth failing a document
+                    found.setdefault(place, None)
+        return list(found)
+
+    def search(self, text):
+        """Whether text mentions any place"""
+        return bool(text) and self._regex is not None and self._regex.search(text) is not None
+
+
+class Gazetteer:
+    """Places loaded from a gazetteer file"""
+
+    def __init__(self, places):
+        self.places = places
+
+    @classmethod
+    def load(cls, path=DEFAULT_GAZETTEER_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['places'])
+
+    def select(self, region=None, kinds=('city',)):
+        """Places of one region (all when None) and of the given kinds (all when None)"""
+        return [
+            place for place in self.places
+            if (region is None or place['region'] == region) and (kinds is None or place['kind'] in kinds)
+        ]
+
+    def matcher(self, region=None, kinds=('city',)):
+        """PlaceMatcher over the selected places"""
+        return PlaceMatcher(self.select(region, kinds))
+
+
+@functools.lru_cache(maxsize=None)
+def default_gazetteer():
+    """The gazetteer shipped with the extractors, loaded once per process"""
+    return Gazetteer.load()
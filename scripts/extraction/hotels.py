@@ -0,0 +1,220 @@
+"""Hotel catalogue: every hotel of the package hotel tables, once, under a stable id
+
+Packages list their hotels per class as "City: Hotel" strings, repeated in
+every package that stops in the city:
+
+    "hotels": {"fourstar": ["Istanbul: Elite World Comfy Taksim or similar",
+                            "Helsinki (2 nts): Hotel Kämp or similar"], ...}
+
+The catalogue is written next to the package list (2026-packages.hotels.json,
+or hotels.json covering every shard in the shard folder) and references
+hotels by id, so finding or changing the packages of a hotel is an index
+lookup rather than a text scan of every package:
+
+    {"version": 1,
+     "hotels": {"istanbul-elite-world-comfy-taksim":
+                    {"name": "Elite World Comfy Taksim", "city": "Istanbul", "classes": ["fourstar"]}},
+     "byCity": {"Istanbul": {"fourstar": [ids], ...}},
+     "packages": {"SIC-01": {"fourstar": [ids], ...}},
+     "usedBy": {"istanbul-elite-world-comfy-taksim": [packageIds]}}
+
+An id is the city and hotel name slugged, so it stays the same between runs.
+"A / B" entries name alternative hotels, each catalogued on its own; a
+trailing "or similar" and a stay note such as "(2 nts)" are not part of the
+hotel. The package hotel strings themselves are left as they are: the site
+and the Package table display them.
+"""
+import json
+import os
+import re
+import unicodedata
+
+from extraction.output import SHARD_DIR, load_package_shards, write_json_atomic
+from extraction.pricing import HOTEL_CLASSES
+
+HOTEL_CATALOGUE_VERSION = 1
+SHARD_HOTELS_NAME = 'hotels.json'
+
+# "City (2 nts): Hotel A / Hotel B or similar"
+_ENTRY = re.compile(r'^\s*(?P<city>[^:(]+?)\s*(?:\([^)]*\))?\s*:\s*(?P<hotels>.+)$', re.DOTALL)
+_OR_SIMILAR = re.compile(r'\s+or\s+similar\W*$', re.IGNORECASE)
+_ALTERNATIVES = re.compile(r'(\s+/\s+)')
+
+
+def _slug(text):
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+
+
+def hotel_id(city, name):
+    """Stable id of a hotel ('istanbul-hera-montagna')"""
+    return f"{_slug(city)}-{_slug(name)}"
+
+
+def _hotel_name(piece):
+    """Hotel name of one alternative, without a trailing 'or similar'"""
+    return _OR_SIMILAR.sub('', piece).strip()
+
+
+def parse_hotel_entry(entry):
+    """(city, [hotel names]) of a package hotel string, or None when it names no city"""
+    match = _ENTRY.match(entry)
+    if not match:
+        return None
+    # split() keeps the captured separators at the odd positions
+    names = [_hotel_name(piece) for piece in _ALTERNATIVES.split(match.group('hotels'))[::2]]
+    return match.group('city'), [name for name in names if name]
+
+
+def rename_hotel_entry(entry, key, new_name):
+    """A package hotel string with the hotel of id key renamed (unchanged when it does not name it)"""
+    match = _ENTRY.match(entry)
+    if not match:
+        return entry
+    city = match.group('city')
+    pieces = _ALTERNATIVES.split(match.group('hotels'))
+    for position in range(0, len(pieces), 2):
+        name = _hotel_name(pieces[position])
+        if name and hotel_id(city, name) == key:
+            pieces[position] = pieces[position].replace(name, new_name, 1)
+    return entry[:match.start('hotels')] + ''.join(pieces)
+
+
+def build_hotel_catalogue(packages):
+    """Hotel catalogue of a package list or iterable (see the module docstring)"""
+    hotels = {}
+    by_city = {}
+    references = {}
+    used_by = {}
+
+    for pkg in packages:
+        package_id = pkg['packageId']
+        for hotel_class in HOTEL_CLASSES:
+            for entry in (pkg.get('hotels') or {}).get(hotel_class, []):
+                parsed = parse_hotel_entry(entry)
+                if parsed is None:
+                    continue
+                city, names = parsed
+                for name in names:
+                    key = hotel_id(city, name)
+                    hotel = hotels.setdefault(key, {'name': name, 'city': city, 'classes': []})
+                    if hotel_class not in hotel['classes']:
+                        hotel['classes'].append(hotel_class)
+                    # dicts as ordered sets: first-seen order, each id once
+                    by_city.setdefault(city, {}).setdefault(hotel_class, {})[key] = None
+                    references.setdefault(package_id, {}).setdefault(hotel_class, {})[key] = None
+                    users = used_by.setdefault(key, [])
+                    if not users or users[-1] != package_id:
+                        users.append(package_id)
+
+    return {
+        'version': HOTEL_CATALOGUE_VERSION,
+        'hotels': dict(sorted(hotels.items())),
+        'byCity': {
+            city: {hotel_class: list(ids) for hotel_class, ids in classes.items()}
+            for city, classes in sorted(by_city.items())
+        },
+        'packages': {
+            package_id: {hotel_class: list(ids) for hotel_class, ids in classes.items()}
+            for package_id, classes in references.items()
+        },
+        'usedBy': dict(sorted(used_by.items())),
+    }
+
+
+def hotel_catalogue_path(packages_path):
+    """Catalogue path for a package list (<name>.hotels.json next to it)"""
+    base = os.path.basename(packages_path).split('.')[0]
+    return os.path.join(os.path.dirname(packages_path), f"{base}.hotels.json")
+
+
+def write_hotel_catalogue(packages, path):
+    """Build and write the hotel catalogue of packages to path, returning the path"""
+    write_json_atomic(path, build_hotel_catalogue(packages), indent=None)
+    return path
+
+
+def write_shard_hotel_catalogue(shard_dir=SHARD_DIR):
+    """Rebuild hotels.json of the shard folder from every shard, returning its path"""
+    return write_hotel_catalogue(load_package_shards(shard_dir), os.path.join(shard_dir, SHARD_HOTELS_NAME))
+
+
+class HotelCatalogue:
+    """Look hotels and their packages up in a hotel catalogue
+
+        catalogue = HotelCatalogue.load('data/2026-packages.hotels.json')
+        catalogue.in_city('Istanbul', 'fourstar')            # hotel ids
+        catalogue.packages_using('istanbul-hera-montagna')   # packageIds
+        catalogue.replace_hotel(packages, 'istanbul-hera-montagna', 'Hera Palace')
+    """
+
+    def __init__(self, data):
+        if data.get('version') != HOTEL_CATALOGUE_VERSION:
+            raise ValueError(f"unsupported hotel catalogue version: {data.get('version')}")
+        self.data = data
+        self.hotels = data['hotels']
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.hotels)
+
+    def hotel(self, hotel_id):
+        """{'name', 'city', 'classes'} of a hotel"""
+        return self.hotels[hotel_id]
+
+    def cities(self):
+        """Cities with hotels and how many each has"""
+        return {city: len({key for ids in classes.values() for key in ids})
+                for city, classes in self.data['byCity'].items()}
+
+    def in_city(self, city, hotel_class=None):
+        """Hotel ids of a city, of one class or (in class order) of all"""
+        classes = self.data['byCity'].get(city, {})
+        if hotel_class is not None:
+            return list(classes.get(hotel_class, []))
+        return list(dict.fromkeys(key for name in HOTEL_CLASSES for key in classes.get(name, [])))
+
+    def find(self, name):
+        """Ids of hotels whose name contains name (ignoring case and accents)"""
+        wanted = _slug(name)
+        return [key for key, hotel in self.hotels.items() if wanted in _slug(hotel['name'])]
+
+    def package_hotels(self, package_id):
+        """{hotel class: hotel ids} of a package"""
+        return self.data['packages'].get(package_id, {})
+
+    def packages_using(self, hotel_id):
+        """packageIds of the packages offering a hotel, in catalogue order"""
+        return list(self.data['usedBy'].get(hotel_id, []))
+
+    def replace_hotel(self, packages, key, name):
+        """Rename a hotel in the hotel strings of the packages that offer it
+
+        packages maps packageId to package dicts (or is a list of them). Only
+        the packages the catalogue lists for the hotel are looked at, and in
+        them only the classes that name it. Returns the packageIds changed;
+        rebuild the catalogue from the packages afterwards.
+        """
+        if isinstance(packages, list):
+            packages = {pkg['packageId']: pkg for pkg in packages}
+        changed = []
+        for package_id in self.packages_using(key):
+            pkg = packages.get(package_id)
+            if pkg is None:
+                continue
+            renamed = False
+            for hotel_class, keys in self.package_hotels(package_id).items():
+                if key not in keys:
+                    continue
+                entries = pkg['hotels'][hotel_class]
+                updated = [rename_hotel_entry(entry, key, name) for entry in entries]
+                if updated != entries:
+                    pkg['hotels'][hotel_class] = updated
+                    renamed = True
+            if renamed:
+                changed.append(package_id)
+        return changed
@@ -0,0 +1,206 @@
+"""Sharing near-identical itineraries between package variants
+
+The SIC, PVT, LAND-SIC and LAND-PVT sheets of a route describe the same
+days; usually only the meal codes differ. Itineraries are grouped into
+routes by content hash (identical) and MinHash similarity over the day
+titles and descriptions (near-identical), using LSH banding so only likely
+pairs are compared. Each route is stored once as a canonical itinerary
+(per day and field, the value most variants use) and every variant keeps
+only the fields where its text differs.
+
+Only itineraries with the same shape (number of days and day fields) are
+grouped, so a variant can always be rebuilt from the canonical days.
+"""
+import json
+import random
+import re
+import zlib
+from collections import Counter, defaultdict
+from hashlib import sha256
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; signatures fall back to pure Python
+    np = None
+
+SHINGLE_WORDS = 3
+NUM_PERM = 64
+BANDS = 16  # of NUM_PERM // BANDS rows; pairs around 0.8 similar collide almost surely
+SIMILARITY_THRESHOLD = 0.8
+
+_PRIME = (1 << 31) - 1
+_rng = random.Random(20260101)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r'\w+')
+if np is not None:
+    _A = np.asarray([a for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    _B = np.asarray([b for _, b in _PERMUTATIONS], dtype=np.uint64)[:, None]
+
+
+def itinerary_hash(itinerary):
+    """Stable content hash of an itinerary"""
+    canonical = json.dumps(itinerary, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def itinerary_shape(itinerary):
+    """Number of days and the fields of each day, in order"""
+    return tuple(tuple(day) for day in itinerary)
+
+
+def _shingles(itinerary):
+    """Hashed word shingles of the day titles and descriptions"""
+    words = []
+    for day in itinerary:
+        words.extend(_WORD.findall(f"{day.get('title', '')} {day.get('description', '')}".lower()))
+    if len(words) < SHINGLE_WORDS:
+        grams = {' '.join(words)}
+    else:
+        grams = {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return [zlib.crc32(gram.encode('utf-8')) for gram in grams]
+
+
+def minhash_signature(itinerary):
+    """MinHash signature (NUM_PERM ints) of an itinerary's text"""
+    hashes = _shingles(itinerary)
+    if np is not None:
+        values = np.asarray(hashes, dtype=np.uint64)
+        # a, b < 2**31 and values < 2**32, so a * values + b fits in 64 bits
+        return tuple(((_A * values + _B) % _PRIME).min(axis=1).tolist())
+    return tuple(min((a * x + b) % _PRIME for x in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(x == y for x, y in zip(signature_a, signature_b)) / len(signature_a)
+
+
+def group_itineraries(itineraries, threshold=SIMILARITY_THRESHOLD):
+    """Group identical or near-identical itineraries into routes
+
+    Returns lists of indices into itineraries, ordered by their first
+    member. Empty or missing itineraries are left out.
+    """
+    parent = {}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    # Identical itineraries first; only one representative of each is signed
+    by_hash = {}
+    for i, itinerary in enumerate(itineraries):
+        if not itinerary:
+            continue
+        parent[i] = i
+        key = itinerary_hash(itinerary)
+        if key in by_hash:
+            union(by_hash[key], i)
+        else:
+            by_hash[key] = i
+
+    by_shape = defaultdict(list)
+    for i in by_hash.values():
+        by_shape[itinerary_shape(itineraries[i])].append(i)
+
+    rows = NUM_PERM // BANDS
+    for members in by_shape.values():
+        if len(members) < 2:
+            continue
+        signatures = {i: minhash_signature(itineraries[i]) for i in members}
+        buckets = defaultdict(list)
+        for i, signature in signatures.items():
+            for band in range(BANDS):
+                buckets[(band, signature[band * rows:(band + 1) * rows])].append(i)
+        compared = set()
+        for bucket in buckets.values():
+            for x in range(len(bucket)):
+                for y in range(x + 1, len(bucket)):
+                    pair = (bucket[x], bucket[y])
+                    if pair in compared:
+                        continue
+                    compared.add(pair)
+                    if similarity(signatures[pair[0]], signatures[pair[1]]) >= threshold:
+                        union(*pair)
+
+    groups = defaultdict(list)
+    for i in sorted(parent):
+        groups[find(i)].append(i)
+    return list(groups.values())
+
+
+def _most_common(values):
+    """Most frequent value, the earliest on ties (values may be unhashable)"""
+    try:
+        return Counter(values).most_common(1)[0][0]
+    except TypeError:
+        votes = Counter(json.dumps(value, sort_keys=True, ensure_ascii=False) for value in values)
+        return json.loads(votes.most_common(1)[0][0])
+
+
+def canonical_itinerary(itineraries):
+    """Per day and field, the value most of the (same-shaped) itineraries use
+
+    Ties go to the earliest itinerary.
+    """
+    canonical = []
+    for days in zip(*itineraries):
+        day = {}
+        for field in days[0]:
+            day[field] = _most_common([d[field] for d in days])
+        canonical.append(day)
+    return canonical
+
+
+def itinerary_overrides(canonical, itinerary):
+    """{day index (str): {field: value}} where itinerary differs from canonical"""
+    overrides = {}
+    for index, (base_day, day) in enumerate(zip(canonical, itinerary)):
+        changed = {field: value for field, value in day.items() if base_day[field] != value}
+        if changed:
+            overrides[str(index)] = changed
+    return overrides
+
+
+def apply_overrides(canonical, overrides=None):
+    """Rebuild a variant's itinerary from its canonical days and overrides (new dicts)"""
+    overrides = overrides or {}
+    itinerary = []
+    for index, base_day in enumerate(canonical):
+        changed = overrides.get(str(index), {})
+        itinerary.append({field: changed.get(field, value) for field, value in base_day.items()})
+    return itinerary
+
+
+def share_itineraries(itineraries, threshold=SIMILARITY_THRESHOLD):
+    """Store itineraries once per route
+
+    Returns (canonicals, refs): refs[i] is {'base': index into canonicals}
+    plus 'days' overrides where itinerary i differs, or None for an empty or
+    missing itinerary, which is kept as it is.
+    """
+    canonicals = []
+    refs = [None] * len(itineraries)
+    for group in group_itineraries(itineraries, threshold):
+        canonical = canonical_itinerary([itineraries[i] for i in group])
+        for i in group:
+            ref = {'base': len(canonicals)}
+            overrides = itinerary_overrides(canonical, itineraries[i])
+            if overrides:
+                ref['days'] = overrides
+            refs[i] = ref
+        canonicals.append(canonical)
+    return canonicals, refs
+
+
+def itinerary_routes(packages, field='itinerary'):
+    """packageIds of the packages sharing a route, one list per route"""
+    groups = group_itineraries([pkg.get(field) for pkg in packages])
+    return [[packages[i]['packageId'] for i in group] for group in groups]
@@ -0,0 +1,135 @@
+"""Rule-driven parsing of a rate sheet's paragraphs into a package record
+
+Both extractors read the same kind of document: a title, a duration line,
+day-by-day itinerary headers with descriptions underneath, and headed
+sections (inclusions, exclusions, information, ...). What differs between
+document layouts is described by a rule table instead of code (see
+LAYOUT in extract-packages-from-word.py and extract-europe-packages.py):
+
+    layout = DocumentLayout(LAYOUT)
+    layout.parse(package, blocks, parse_table)
+
+Rules, in the order they are applied to each non-empty paragraph:
+
+    title        first paragraph containing one of the words (or passing the predicate)
+    duration     first paragraph containing one of the words and matching the pattern
+    day_headers  start a new itinerary day; groups are (day number, title, meals)
+    day_like     lines that look like a day header but are not one; never day text
+    day_end      lowercase prefixes ending the itinerary (such as '***')
+    day_breaks   lowercase lines that are not day text (headings)
+    sections     lowercase headings starting each section
+    collect      how a section's lines are added to a record list: the Package
+                 attribute, whether trailing ',' and '.' are stripped, lowercase
+                 lines to skip and a prefix of lines to skip
+
+Anything else inside the itinerary is added to the current day's
+description. The day header grammars are compiled into one regex with the
+day_like patterns after them, and headings into one dict, so each
+paragraph is lowercased once and dispatched with one match and one lookup.
+"""
+import re
+
+from extraction import metrics
+from extraction.records import ItineraryDay
+
+ITINERARY = 'itinerary'
+
+
+class _Collect:
+    """How one section's lines are added to a Package list attribute"""
+    __slots__ = ('field', 'clean', 'skip', 'skip_prefix')
+
+    def __init__(self, field, clean=False, skip=(), skip_prefix=None):
+        self.field = field
+        self.clean = clean
+        self.skip = frozenset(skip)
+        self.skip_prefix = skip_prefix
+
+
+class DocumentLayout:
+    """A compiled rule table (see the module docstring)"""
+
+    def __init__(self, rules):
+        title = rules['title']
+        self._title_words = None if callable(title) else tuple(title)
+        self._is_title = title if callable(title) else None
+        self._duration_words = tuple(rules['duration']['words'])
+        self._duration = re.compile(rules['duration']['pattern'], re.I)
+
+        # One alternative per grammar, each wrapped in a named group so
+        # lastgroup tells which one matched: day headers first, then day_like
+        alternatives = [f"(?P<header{index}>{pattern})" for index, pattern in enumerate(rules['day_headers'])]
+        alternatives += [f"(?P<like{index}>{pattern})" for index, pattern in enumerate(rules.get('day_like', ()))]
+        self._lines = re.compile('|'.join(alternatives), re.I)
+        # Day header name -> number of its first own group (day number, title, meals follow)
+        self._headers = {
+            name: number + 1 for name, number in self._lines.groupindex.items() if name.startswith('header')
+        }
+
+        self._day_end = tuple(rules.get('day_end', ()))
+        self._day_breaks = frozenset(rules.get('day_breaks', ()))
+        self._sections = {
+            heading: section for section, headings in rules['sections'].items() for heading in headings
+        }
+        self._collect = {section: _Collect(**spec) for section, spec in rules.get('collect', {}).items()}
+
+    def parse(self, package, blocks, parse_table):
+        """Fill package (an extraction.records.Package) from (kind, content) body blocks
+
+        Tables are handed to parse_table(package, grid) in document order.
+        """
+        section = None
+        day = None
+        for kind, content in blocks:
+            if kind == 'table':
+                with metrics.stage('tables'):
+                    parse_table(package, content)
+                continue
+
+            text = content.strip()
+            if not text:
+                continue
+            lower = text.lower()
+
+            if not package.title and self._matches_title(text, lower):
+                package.title = text
+                continue
+
+            if (not package.duration and any(word in lower for word in self._duration_words)
+                    and self._duration.match(text)):
+                package.duration = text
+                continue
+
+            line = self._lines.match(text)
+            first = line and self._headers.get(line.lastgroup)
+            if first:
+                day = ItineraryDay(int(line.group(first)), line.group(first + 1).strip(),
+                                   line.group(first + 2).strip() or '-')
+                package.itinerary.append(day)
+                section = ITINERARY
+                continue
+
+            if section == ITINERARY and day is not None:
+                if lower.startswith(self._day_end):
+                    section = None
+                    day = None
+                elif line is None and lower not in self._day_breaks:
+                    day.add_text(text)
+                    continue
+
+            heading = self._sections.get(lower)
+            if heading is not None:
+                section = heading
+                continue
+
+            collect = self._collect.get(section)
+            if collect is None or (collect.skip_prefix and text.startswith(collect.skip_prefix)):
+                continue
+            value = text.rstrip(',').rstrip('.') if collect.clean else text
+            if value and value.lower() not in collect.skip:
+                getattr(package, collect.field).append(value)
+
+    def _matches_title(self, text, lower):
+        if self._is_title is not None:
+            return self._is_title(text)
+        return any(word in lower for word in self._title_words)
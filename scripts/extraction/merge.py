@@ -0,0 +1,187 @@
+"""Keyed merge of package lists, with a changeset of what changed
+
+Each extractor owns part of the catalogue (Europe owns the EUR- ids, the
+Turkey script everything else). A merge upserts the packages a run
+extracted by packageId, drops the owned packages it no longer produces and
+leaves every other record exactly as it was. The changeset lists added,
+modified (with a field-level diff) and removed ids so the seeder only has
+to touch those rows. Itinerary changes are also reported per route (the
+SIC/PVT/LAND variants sharing an itinerary, see extraction.itineraries).
+"""
+import json
+import os
+
+from extraction.itineraries import itinerary_routes
+from extraction.output import SHARED_ITINERARY_FIELDS, splice_owned, write_json_atomic
+
+CHANGESET_VERSION = 1
+
+
+def field_changes(old, new, prefix=''):
+    """Field-level differences between two records as [{'field', 'old', 'new'}]
+
+    Nested dicts are compared key by key with dotted field names; lists and
+    scalars are compared as a whole. A field missing on one side is None.
+    """
+    changes = []
+    for name in list(old) + [k for k in new if k not in old]:
+        field = f"{prefix}{name}"
+        before, after = old.get(name), new.get(name)
+        if before == after:
+            continue
+        if isinstance(before, dict) and isinstance(after, dict):
+            changes.extend(field_changes(before, after, f"{field}."))
+        else:
+            changes.append({'field': field, 'old': before, 'new': after})
+    return changes
+
+
+def new_changeset():
+    """Empty changeset, filled by record_change"""
+    return {'version': CHANGESET_VERSION, 'added': [], 'modified': [], 'removed': [], 'unchanged': 0}
+
+
+def record_change(changeset, old, pkg):
+    """Add an incoming package to the changeset, given its previous version (None when it is new)"""
+    if old is None:
+        changeset['added'].append(pkg['packageId'])
+    elif old == pkg:
+        changeset['unchanged'] += 1
+    else:
+        changeset['modified'].append({'packageId': pkg['packageId'], 'changes': field_changes(old, pkg)})
+
+
+def add_changed_routes(changeset, packages):
+    """Set changeset['routes'] from the merged packages when itineraries were added or changed
+
+    Only the packageId and itinerary of each package are kept while the
+    routes are found, so packages may be a generator over a large file.
+    """
+    itinerary_changed = set(changeset['added']) | {
+        entry['packageId'] for entry in changeset['modified']
+        if any(change['field'] in SHARED_ITINERARY_FIELDS for change in entry['changes'])
+    }
+    if not itinerary_changed:
+        return
+    itineraries = [{'packageId': pkg['packageId'], 'itinerary': pkg.get('itinerary')}
+                   for pkg in packages if 'packageId' in pkg]
+    changeset['routes'] = [
+        {'packages': route, 'changed': [pid for pid in route if pid in itinerary_changed]}
+        for route in itinerary_routes(itineraries)
+        if itinerary_changed.intersection(route)
+    ]
+
+
+def merge_packages(existing, incoming, owns):
+    """Upsert incoming packages into existing by packageId
+
+    owns(package_id) tells which packages the incoming run is responsible
+    for. Returns (merged, changeset).
+
+    When itineraries were added or changed, changeset['routes'] lists each
+    affected route as {'packages': every packageId on the route, 'changed':
+    the ones whose itinerary changed}, so one edit to a route shows up once.
+    """
+    incoming_ids = {pkg['packageId'] for pkg in incoming}
+    previous = {pkg.get('packageId', ''): pkg for pkg in existing if owns(pkg.get('packageId', ''))}
+
+    changeset = new_changeset()
+    for pkg in incoming:
+        record_change(changeset, previous.get(pkg['packageId']), pkg)
+    changeset['removed'] = [pid for pid in previous if pid not in incoming_ids]
+
+    merged = splice_owned(existing, incoming, owns, lambda pkg: pkg.get('packageId', ''))
+    add_changed_routes(changeset, merged)
+    return merged, changeset
+
+
+def _combine_field_changes(first, second):
+    """Field changes of two consecutive edits: each field's first old and last new value"""
+    fields = {change['field']: dict(change) for change in first}
+    for change in second:
+        if change['field'] in fields:
+            fields[change['field']]['new'] = change['new']
+        else:
+            fields[change['field']] = dict(change)
+    return [change for change in fields.values() if change['old'] != change['new']]
+
+
+def combine_changesets(earlier, later):
+    """One changeset covering two consecutive ones, so patches accumulate until the next seed
+
+    Per package: added then modified stays added, added then removed drops
+    out, modified twice keeps each field's first old and last new value
+    (and counts as unchanged again when nothing is left), removed then added
+    is added, and anything then removed is removed. routes is not carried
+    over; set it again with add_changed_routes over the merged packages.
+    """
+    state = {pid: ('added', None) for pid in earlier['added']}
+    state.update((entry['packageId'], ('modified', entry['changes'])) for entry in earlier['modified'])
+    state.update((pid, ('removed', None)) for pid in earlier['removed'])
+    unchanged = earlier['unchanged']
+
+    steps = ([(pid, 'added', None) for pid in later['added']]
+             + [(entry['packageId'], 'modified', entry['changes']) for entry in later['modified']]
+             + [(pid, 'removed', None) for pid in later['removed']])
+    for pid, kind, changes in steps:
+        prior, prior_changes = state.get(pid, (None, None))
+        if prior is None:
+            if kind != 'added':
+                unchanged = max(0, unchanged - 1)  # counted as unchanged before
+            state[pid] = (kind, changes)
+        elif kind == 'removed':
+            if prior == 'added':
+                del state[pid]
+            else:
+                state[pid] = ('removed', None)
+        elif kind == 'added' or prior == 'added':
+            state[pid] = ('added', None)
+        else:
+            combined = _combine_field_changes(prior_changes or [], changes)
+            if combined:
+                state[pid] = ('modified', combined)
+            else:
+                del state[pid]
+                unchanged += 1
+
+    changeset = new_changeset()
+    for pid, (kind, changes) in state.items():
+        if kind == 'modified':
+            changeset['modified'].append({'packageId': pid, 'changes': changes})
+        else:
+            changeset[kind].append(pid)
+    changeset['unchanged'] = unchanged
+    return changeset
+
+
+def changeset_summary(changeset):
+    """One-line summary of a changeset"""
+    summary = (f"Changes: {len(changeset['added'])} added, {len(changeset['modified'])} modified, "
+               f"{len(changeset['removed'])} removed, {changeset['unchanged']} unchanged")
+    if changeset.get('routes'):
+        routes = len(changeset['routes'])
+        summary += f" (itineraries changed on {routes} route{'s' if routes != 1 else ''})"
+    return summary
+
+
+def changeset_path(packages_path):
+    """Changeset path for a package list (<name>.changes.json next to it)"""
+    base = os.path.basename(packages_path).split('.')[0]
+    return os.path.join(os.path.dirname(packages_path), f"{base}.changes.json")
+
+
+def read_changeset(packages_path):
+    """The changeset written next to a package list, or None when there is none"""
+    try:
+        with open(changeset_path(packages_path), 'r', encoding='utf-8') as f:
+            changeset = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return changeset if changeset.get('version') == CHANGESET_VERSION else None
+
+
+def write_changeset(changeset, packages_path):
+    """Write the changeset next to the package list and return its path"""
+    path = changeset_path(packages_path)
+    write_json_atomic(path, changeset)
+    return path
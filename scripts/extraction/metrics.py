@@ -0,0 +1,275 @@
+"""Per-document stage timings and counters, and the run report built from them
+
+The extractors mark their stages unconditionally:
+
+    with metrics.stage('tables'):
+        ...
+    for kind, content in metrics.timed_blocks(reader(file_path)):
+        ...
+
+Nothing is measured unless a recorder is active (see recording()). While
+none is, stage() returns a shared no-op context manager and timed_blocks()
+returns the iterator unchanged, so a run without a report pays a few
+function calls per document. Stages nest: a stage's time excludes the stages (and block
+reads) inside it, so every second is attributed to exactly one stage.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from extraction.output import write_json_atomic
+
+_recorder = None
+
+
+class _NullStage:
+    """Context manager used for every stage while instrumentation is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """A running stage of the active recorder"""
+    __slots__ = ('recorder', 'name')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.recorder.enter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.exit(self.name)
+        return False
+
+
+class DocumentMetrics:
+    """Stage seconds and counters for one document"""
+
+    def __init__(self):
+        self.stages = {}
+        self.counts = {}
+        self._open = []  # [start, seconds spent in nested stages] per running stage
+
+    def enter(self):
+        self._open.append([time.perf_counter(), 0.0])
+
+    def exit(self, name):
+        start, nested = self._open.pop()
+        elapsed = time.perf_counter() - start
+        self.add_time(name, elapsed - nested)
+        if self._open:
+            self._open[-1][1] += elapsed
+
+    def add_time(self, name, seconds):
+        """Attribute seconds to a stage (excluded from the enclosing stage)"""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_nested_time(self, name, seconds):
+        """Attribute seconds measured inside the running stage"""
+        self.add_time(name, seconds)
+        if self._open:
+            self._open[-1][1] += seconds
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def as_dict(self):
+        return {'seconds': sum(self.stages.values()), 'stages': dict(self.stages), 'counts': dict(self.counts)}
+
+
+def stage(name):
+    """Context manager timing a stage of the current document"""
+    if _recorder is None:
+        return _NULL_STAGE
+    return _Stage(_recorder, name)
+
+
+def count(name, n=1):
+    """Add to a counter of the current document"""
+    if _recorder is not None:
+        _recorder.count(name, n)
+
+
+def timed_blocks(blocks):
+    """Record the time spent producing body blocks as 'read' and count paragraphs, tables and rows"""
+    if _recorder is None:
+        return blocks
+    return _timed_blocks(_recorder, iter(blocks))
+
+
+def _timed_blocks(recorder, blocks):
+    while True:
+        start = time.perf_counter()
+        block = next(blocks, None)
+        recorder.add_nested_time('read', time.perf_counter() - start)
+        if block is None:
+            return
+        if block[0] == 'table':
+            recorder.count('tables')
+            recorder.count('tableRows', len(block[1]))
+        else:
+            recorder.count('paragraphs')
+        yield block
+
+
+@contextmanager
+def recording():
+    """Activate a fresh DocumentMetrics for the duration of the block"""
+    global _recorder
+    previous = _recorder
+    _recorder = DocumentMetrics()
+    try:
+        yield _recorder
+    finally:
+        _recorder = previous
+
+
+@contextmanager
+def recording_for(report, file_path):
+    """Record the stages of the block into a document already in report
+
+    For work done in the main process after a document was extracted (such
+    as translation), so it is attributed to that document. Records nothing
+    without a report.
+    """
+    if report is None:
+        yield None
+        return
+    with recording() as recorder:
+        yield recorder
+    report.add_metrics(file_path, recorder)
+
+
+class RunReport:
+    """Per-document metrics of one extraction run, written as JSON and Prometheus text"""
+
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.wall_seconds = None
+        self.workers = 1
+        self.documents = []
+        self._entries = {}
+
+    def add(self, file_path, status, metrics=None, error=None):
+        """Record one document; status is 'ok', 'cached' or 'error'"""
+        entry = {'file': os.path.basename(file_path), 'status': status}
+        if metrics is not None:
+            entry.update(metrics)
+        if error is not None:
+            entry['error'] = error
+        self.documents.append(entry)
+        self._entries[file_path] = entry
+
+    def add_metrics(self, file_path, doc_metrics):
+        """Add a DocumentMetrics recorded outside the extractor to a document's entry"""
+        entry = self._entries[file_path]
+        stages = entry.setdefault('stages', {})
+        for name, seconds in doc_metrics.stages.items():
+            stages[name] = stages.get(name, 0.0) + seconds
+        counts = entry.setdefault('counts', {})
+        for name, n in doc_metrics.counts.items():
+            counts[name] = counts.get(name, 0) + n
+        if 'seconds' in entry:  # cached documents were not parsed and keep no total
+            entry['seconds'] += sum(doc_metrics.stages.values())
+
+    def finish(self, workers=1):
+        self.wall_seconds = time.perf_counter() - self._start
+        self.workers = workers
+
+    def totals(self):
+        """Summed stage seconds and counters over all parsed documents"""
+        stages, counts = {}, {}
+        for doc in self.documents:
+            for name, seconds in doc.get('stages', {}).items():
+                stages[name] = stages.get(name, 0.0) + seconds
+            for name, n in doc.get('counts', {}).items():
+                counts[name] = counts.get(name, 0) + n
+        return stages, counts
+
+    def status_counts(self):
+        statuses = {'ok': 0, 'cached': 0, 'error': 0}
+        for doc in self.documents:
+            statuses[doc['status']] += 1
+        return statuses
+
+    def as_dict(self):
+        stages, counts = self.totals()
+        parsed = [doc for doc in self.documents if 'seconds' in doc]
+        return {
+            'extractor': self.extractor,
+            'startedAt': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'wallSeconds': self.wall_seconds,
+            'workers': self.workers,
+            'documents': self.status_counts(),
+            'stages': stages,
+            'counts': counts,
+            'slowest': [doc['file'] for doc in sorted(parsed, key=lambda d: d['seconds'], reverse=True)[:5]],
+            'perDocument': self.documents,
+        }
+
+    def write_json(self, path):
+        write_json_atomic(path, self.as_dict())
+
+    def write_prometheus(self, path):
+        """Write the run totals in the Prometheus textfile format (for node_exporter's textfile collector)"""
+        stages, counts = self.totals()
+        label = f'extractor="{self.extractor}"'
+        lines = [
+            '# HELP package_extraction_documents Documents handled in the last run, by status.',
+            '# TYPE package_extraction_documents gauge',
+        ]
+        lines += [f'package_extraction_documents{{{label},status="{status}"}} {n}'
+                  for status, n in self.status_counts().items()]
+        lines += [
+            '# HELP package_extraction_stage_seconds Time spent per extraction stage in the last run.',
+            '# TYPE package_extraction_stage_seconds gauge',
+        ]
+        lines += [f'package_extraction_stage_seconds{{{label},stage="{name}"}} {seconds:.6f}'
+                  for name, seconds in sorted(stages.items())]
+        lines += [
+            '# HELP package_extraction_items Paragraphs, tables and table rows parsed in the last run.',
+            '# TYPE package_extraction_items gauge',
+        ]
+        lines += [f'package_extraction_items{{{label},kind="{name}"}} {n}' for name, n in sorted(counts.items())]
+        lines += [
+            '# HELP package_extraction_run_seconds Wall time of the last run.',
+            '# TYPE package_extraction_run_seconds gauge',
+            f'package_extraction_run_seconds{{{label}}} {self.wall_seconds or 0:.6f}',
+            '# HELP package_extraction_last_run_timestamp_seconds Start time of the last run.',
+            '# TYPE package_extraction_last_run_timestamp_seconds gauge',
+            f'package_extraction_last_run_timestamp_seconds{{{label}}} {self.started:.0f}',
+        ]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+
+def write_run_report(report, json_path=None, prometheus_path=None):
+    """Write whichever report files were requested and print the stage totals"""
+    stages, counts = report.totals()
+    parsed = sum(1 for doc in report.documents if 'seconds' in doc)
+    print(f"\n=== STAGES ({parsed} documents parsed) ===")
+    for name, seconds in sorted(stages.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name:<13} {seconds * 1000:>9.1f} ms")
+    print('  ' + ', '.join(f"{n} {name}" for name, n in sorted(counts.items())))
+
+    if json_path:
+        report.write_json(json_path)
+        print(f"Run report: {json_path}")
+    if prometheus_path:
+        report.write_prometheus(prometheus_path)
+        print(f"Metrics: {prometheus_path}")
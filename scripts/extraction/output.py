@@ -0,0 +1,540 @@
+"""Writing extracted packages to the data folder"""
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+from collections.abc import Sequence
+from contextlib import nullcontext
+
+from extraction.itineraries import apply_overrides, share_itineraries
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; only the msgpack format needs it
+    msgpack = None
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'data'))
+SHARD_DIR = os.path.join(DATA_DIR, 'packages')
+MANIFEST_NAME = 'manifest.json'
+
+# Output format -> file extension. 'min' is still plain JSON (same file name,
+# readable by every consumer), just without indentation. 'tables' is minified
+# JSON with the repeated string lists stored once (see encode_tables).
+# 'ndjson' is one minified package per line, which can be written as packages
+# are extracted and read one at a time (see PackageStream and iter_packages).
+FORMATS = {
+    'json': '.json',
+    'min': '.json',
+    'gzip': '.json.gz',
+    'msgpack': '.msgpack',
+    'tables': '.tables.json',
+    'ndjson': '.ndjson',
+}
+
+TABLES_VERSION = 2
+
+# String-list fields that repeat across packages and variants; in the tables
+# format each holds an index into the shared list table ('a.b' is nested)
+TABLED_FIELDS = (
+    'included', 'notIncluded', 'information', 'highlights',
+    'includedEs', 'notIncludedEs', 'highlightsEs',
+    'hotels.threestar', 'hotels.fourstar', 'hotels.fivestar',
+)
+
+# Itinerary fields stored once per route in the tables format (see extraction.itineraries)
+SHARED_ITINERARY_FIELDS = ('itinerary', 'itineraryEs')
+
+
+def write_json_atomic(path, data, indent=2):
+    """Write JSON to a temporary file and move it into place (indent None writes it minified)"""
+    separators = (',', ':') if indent is None else None
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False, separators=separators)
+    os.replace(tmp_path, path)
+
+
+def available_formats():
+    """Output formats usable in this environment"""
+    return [fmt for fmt in FORMATS if fmt != 'msgpack' or msgpack is not None]
+
+
+def packages_path(name, fmt='json', data_dir=DATA_DIR):
+    """Path of a package list such as '2026-packages' written in the given format"""
+    return os.path.join(data_dir, name + FORMATS[fmt])
+
+
+def _copy_for_fields(pkg, fields):
+    """Copy of a package whose dicts holding any of fields are copies too"""
+    pkg = dict(pkg)
+    for parent in {field.split('.')[0] for field in fields if '.' in field}:
+        if isinstance(pkg.get(parent), dict):
+            pkg[parent] = dict(pkg[parent])
+    return pkg
+
+
+def _field_holder(pkg, field):
+    """(dict holding a TABLED_FIELDS entry, key in it), or (None, None) when absent"""
+    *parents, key = field.split('.')
+    holder = pkg
+    for parent in parents:
+        holder = holder.get(parent)
+        if not isinstance(holder, dict):
+            return None, None
+    return (holder, key) if key in holder else (None, None)
+
+
+def encode_tables(packages):
+    """Package list as a tables document: each distinct string, string list and route itinerary stored once
+
+        {"version": 2, "fields": [...], "strings": [...], "lists": [[string ids]],
+         "itineraryFields": [...], "itineraries": [[days]], "packages": [...]}
+
+    Every TABLED_FIELDS value that is a list of strings is replaced by the
+    index of its list in "lists". Every SHARED_ITINERARY_FIELDS itinerary
+    is replaced by {"base": index into "itineraries"} plus "days" overrides
+    where the variant's text differs from its route's canonical days. All
+    other values are kept as they are.
+    """
+    strings, string_ids = [], {}
+    lists, list_ids = [], {}
+
+    def intern_list(items):
+        ids = []
+        for item in items:
+            if item not in string_ids:
+                string_ids[item] = len(strings)
+                strings.append(item)
+            ids.append(string_ids[item])
+        key = tuple(ids)
+        if key not in list_ids:
+            list_ids[key] = len(lists)
+            lists.append(ids)
+        return list_ids[key]
+
+    encoded = []
+    for pkg in packages:
+        pkg = _copy_for_fields(pkg, TABLED_FIELDS)
+        for field in TABLED_FIELDS:
+            holder, key = _field_holder(pkg, field)
+            if holder is None:
+                continue
+            value = holder[key]
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                holder[key] = intern_list(value)
+        encoded.append(pkg)
+
+    itineraries = []
+    for field in SHARED_ITINERARY_FIELDS:
+        values = [pkg.get(field) if isinstance(pkg.get(field), list) else None for pkg in encoded]
+        canonicals, refs = share_itineraries(values)
+        for pkg, ref in zip(encoded, refs):
+            if ref is not None:
+                pkg[field] = dict(ref, base=ref['base'] + len(itineraries))
+        itineraries.extend(canonicals)
+
+    return {'version': TABLES_VERSION, 'fields': list(TABLED_FIELDS), 'strings': strings, 'lists': lists,
+            'itineraryFields': list(SHARED_ITINERARY_FIELDS), 'itineraries': itineraries, 'packages': encoded}
+
+
+class TabledPackages(Sequence):
+    """Read-only package list over a tables document, rehydrated on access
+
+    Only the packages that are actually indexed (or iterated) have their list
+    fields and itineraries expanded, and each is expanded once. Every package
+    gets its own list and day objects, so changing one package never affects
+    another. Version 1 documents (no shared itineraries) are read as well.
+    """
+
+    def __init__(self, document):
+        if document.get('version') not in (1, TABLES_VERSION):
+            raise ValueError(f"unsupported tables version: {document.get('version')}")
+        self.fields = document['fields']
+        self.strings = document['strings']
+        self.lists = document['lists']
+        self.itinerary_fields = document.get('itineraryFields', [])
+        self.itineraries = document.get('itineraries', [])
+        self._records = document['packages']
+        self._loaded = {}
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._records)
+        if index not in self._loaded:
+            self._loaded[index] = self._rehydrate(self._records[index])
+        return self._loaded[index]
+
+    def _rehydrate(self, record):
+        pkg = _copy_for_fields(record, self.fields)
+        for field in self.fields:
+            holder, key = _field_holder(pkg, field)
+            if holder is not None and isinstance(holder[key], int):
+                holder[key] = [self.strings[i] for i in self.lists[holder[key]]]
+        for field in self.itinerary_fields:
+            ref = pkg.get(field)
+            if isinstance(ref, dict):
+                pkg[field] = apply_overrides(self.itineraries[ref['base']], ref.get('days'))
+        return pkg
+
+    def record(self, index):
+        """Package index without rehydrating it (list fields and itineraries are still references)"""
+        return self._records[index]
+
+
+def load_tabled_packages(path):
+    """Lazily rehydrated packages of a tables file (see TabledPackages)"""
+    with open(path, 'rb') as f:
+        return TabledPackages(json.loads(f.read()))
+
+
+def encode_packages(packages, fmt='json'):
+    """Serialize a package list to bytes in one of FORMATS"""
+    if fmt == 'json':
+        return json.dumps(packages, indent=2, ensure_ascii=False).encode('utf-8')
+    if fmt == 'min':
+        return json.dumps(packages, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if fmt == 'gzip':
+        raw = json.dumps(packages, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # mtime=0 keeps the output byte-identical between runs
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    if fmt == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError('the msgpack format needs the msgpack package (pip install msgpack)')
+        return msgpack.packb(packages, use_bin_type=True)
+    if fmt == 'tables':
+        return json.dumps(encode_tables(packages), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if fmt == 'ndjson':
+        return b''.join(_ndjson_line(pkg) for pkg in packages)
+    raise ValueError(f"unknown output format: {fmt}")
+
+
+def decode_packages(payload, fmt):
+    """Inverse of encode_packages"""
+    if fmt in ('json', 'min'):
+        return json.loads(payload)
+    if fmt == 'gzip':
+        return json.loads(gzip.decompress(payload))
+    if fmt == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError('reading msgpack output needs the msgpack package (pip install msgpack)')
+        return msgpack.unpackb(payload, raw=False)
+    if fmt == 'tables':
+        return list(TabledPackages(json.loads(payload)))
+    if fmt == 'ndjson':
+        # One parse of the joined lines is faster than a parse per line
+        return json.loads(b'[' + b','.join(_complete_lines(payload.splitlines(keepends=True))) + b']')
+    raise ValueError(f"unknown output format: {fmt}")
+
+
+def format_of(path):
+    """Format of a package file, from its extension ('json' covers minified JSON too)"""
+    if path.endswith('.json.gz'):
+        return 'gzip'
+    if path.endswith('.msgpack'):
+        return 'msgpack'
+    if path.endswith('.tables.json'):
+        return 'tables'
+    if path.endswith(('.ndjson', '.ndjson.partial')):
+        return 'ndjson'
+    return 'json'
+
+
+def write_packages(packages, name, fmt='json', data_dir=DATA_DIR):
+    """Write a package list atomically in the given format and return its path"""
+    path = packages_path(name, fmt, data_dir)
+    payload = encode_packages(packages, fmt)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_packages(path):
+    """Load a package list written by write_packages, in whatever format it has"""
+    with open(path, 'rb') as f:
+        return decode_packages(f.read(), format_of(path))
+
+
+def iter_packages(path):
+    """Packages of a package list one at a time; NDJSON files are read line by line"""
+    if format_of(path) != 'ndjson':
+        yield from read_packages(path)
+        return
+    with open(path, 'rb') as f:
+        for line in _complete_lines(f):
+            yield json.loads(line)
+
+
+def _ndjson_line(pkg):
+    return json.dumps(pkg, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def _complete_lines(lines):
+    """Non-blank lines that end in a newline; a line cut off by an interrupted write is skipped"""
+    for line in lines:
+        if line.endswith(b'\n') and line.strip():
+            yield line
+
+
+class PackageLines:
+    """Packages of an NDJSON package list by packageId, read from disk one line at a time
+
+    Only the byte offset of each line is kept in memory. Iterating yields
+    the packageIds in file order.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._offsets = {}
+        offset = 0
+        for line in self._file:
+            if line.endswith(b'\n') and line.strip():
+                self._offsets.setdefault(json.loads(line).get('packageId', ''), offset)
+            offset += len(line)
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __contains__(self, package_id):
+        return package_id in self._offsets
+
+    def get(self, package_id):
+        """The package with this packageId, or None"""
+        offset = self._offsets.get(package_id)
+        if offset is None:
+            return None
+        self._file.seek(offset)
+        return json.loads(self._file.readline())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_package_lookup(path):
+    """Packages of a package list by packageId, for a with block
+
+    An NDJSON file is read one line at a time (see PackageLines); any other
+    format is loaded into a dict. path None gives an empty lookup.
+    """
+    if path is not None and format_of(path) == 'ndjson':
+        return PackageLines(path)
+    packages = read_packages(path) if path is not None else []
+    return nullcontext({pkg.get('packageId', ''): pkg for pkg in packages})
+
+
+_END_OF_STREAM = object()
+
+
+class PackageStream:
+    """Write packages to an NDJSON package list as they are produced
+
+        with PackageStream(packages_path('2026-packages', 'ndjson')) as stream:
+            for pkg in packages:
+                stream.write(pkg)
+
+    A writer thread serializes the packages and appends them to
+    <path>.partial, flushing after every flush_every packages and whenever
+    it runs out of work, so an interrupted run leaves the packages finished
+    so far readable there (see iter_packages). write() blocks while
+    queue_size packages are waiting, so a fast producer cannot pile them up
+    in memory. Leaving the with block normally moves the file into place;
+    on an exception the previous output is left untouched.
+    """
+
+    def __init__(self, path, queue_size=32, flush_every=8):
+        self.path = path
+        self.partial_path = f"{path}.partial"
+        self.count = 0
+        self._flush_every = flush_every
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._file = open(self.partial_path, 'wb')
+        self._writer = threading.Thread(target=self._run, name='package-stream', daemon=True)
+        self._writer.start()
+
+    def _run(self):
+        unflushed = 0
+        while True:
+            pkg = self._queue.get()
+            if pkg is _END_OF_STREAM:
+                break
+            if self._error is not None:
+                continue  # keep draining so write() never blocks forever
+            try:
+                self._file.write(_ndjson_line(pkg))
+                unflushed += 1
+                if unflushed >= self._flush_every or self._queue.empty():
+                    self._file.flush()
+                    unflushed = 0
+            except Exception as e:  # raised again in the producer by write() or close()
+                self._error = e
+
+    def write(self, pkg):
+        """Queue a package for writing; it must not be modified afterwards"""
+        if self._error is not None:
+            raise self._error
+        self._queue.put(pkg)
+        self.count += 1
+
+    def close(self, commit=True):
+        """Write the queued packages and, with commit, replace path with the new file"""
+        self._queue.put(_END_OF_STREAM)
+        self._writer.join()
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+        if commit:
+            os.replace(self.partial_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close(commit=exc_type is None)
+
+
+def find_packages(name, fmt='json', data_dir=DATA_DIR):
+    """Path of the most recently written package list, in any format
+
+    Looks at every format so switching --format does not lose the packages
+    written by the previous run, and a file left over from an older run in
+    the given format does not shadow a newer one. The given format wins ties.
+    Returns None when nothing exists.
+    """
+    preferred = packages_path(name, fmt, data_dir)
+    candidates = dict.fromkeys([preferred] + [packages_path(name, other, data_dir) for other in available_formats()])
+    existing = [path for path in candidates if os.path.exists(path)]
+    # max keeps the first of equal keys, and the preferred path comes first
+    return max(existing, key=os.path.getmtime) if existing else None
+
+
+def package_hash(pkg):
+    """Stable content hash of a package (key order does not matter)"""
+    canonical = json.dumps(pkg, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def min_price(pkg, hotel_class=None):
+    """Lowest per-person double rate over all pax tiers, of one hotel class or of all, or None"""
+    prices = [
+        prices['double']
+        for tier in pkg.get('pricing', {}).get('paxTiers', {}).values()
+        for name, prices in tier.items()
+        if (hotel_class is None or name == hotel_class) and prices.get('double')
+    ]
+    return min(prices) if prices else None
+
+
+def manifest_entry(pkg, content_hash):
+    """Manifest summary of one package shard"""
+    return {
+        'id': pkg['packageId'],
+        'slug': pkg.get('slug', ''),
+        'region': pkg.get('region', 'Turkey'),
+        'duration': pkg.get('duration', ''),
+        'destinations': pkg.get('destinations', ''),
+        'minPrice': min_price(pkg),
+        'hash': content_hash,
+        'file': f"{pkg['packageId']}.json",
+    }
+
+
+def load_manifest(shard_dir=SHARD_DIR):
+    """Manifest entries in catalogue order ([] when there is no manifest yet)"""
+    path = os.path.join(shard_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['packages']
+
+
+def splice_owned(existing, owned, owns, key):
+    """Replace the owned items of existing with owned, keeping the rest in place
+
+    The owned block goes where the first owned item used to be (at the end
+    when there was none), so records of other regions never move.
+    """
+    merged = []
+    inserted = False
+    for item in existing:
+        if owns(key(item)):
+            if not inserted:
+                merged.extend(owned)
+                inserted = True
+        else:
+            merged.append(item)
+    if not inserted:
+        merged.extend(owned)
+    return merged
+
+
+def write_package_shards(packages, owns, shard_dir=SHARD_DIR):
+    """Write one JSON file per packageId plus a manifest
+
+    owns(package_id) tells which packages this run is responsible for: those
+    shards are rewritten (only when their content changed) or removed when no
+    longer extracted, and every other shard and manifest entry is left alone.
+    Returns counts of written, unchanged and removed shards.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    existing = load_manifest(shard_dir)
+    previous = {e['id']: e for e in existing if owns(e['id'])}
+
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+    new_entries = []
+    for pkg in packages:
+        content_hash = package_hash(pkg)
+        entry = manifest_entry(pkg, content_hash)
+        old = previous.pop(pkg['packageId'], None)
+        shard_path = os.path.join(shard_dir, entry['file'])
+        if old and old['hash'] == content_hash and os.path.exists(shard_path):
+            stats['unchanged'] += 1
+        else:
+            write_json_atomic(shard_path, pkg)
+            stats['written'] += 1
+        new_entries.append(entry)
+
+    # Owned packages that were not extracted this time are gone
+    for old in previous.values():
+        try:
+            os.remove(os.path.join(shard_dir, old['file']))
+        except FileNotFoundError:
+            pass
+        stats['removed'] += 1
+
+    # Keep other regions where they were; this run's entries replace its old block
+    entries = splice_owned(existing, new_entries, owns, lambda entry: entry['id'])
+
+    write_json_atomic(os.path.join(shard_dir, MANIFEST_NAME), {'version': 1, 'packages': entries})
+    return stats
+
+
+def load_package_shards(shard_dir=SHARD_DIR, ids=None, region=None):
+    """Load packages from shards, optionally only some ids or one region"""
+    wanted = set(ids) if ids is not None else None
+    packages = []
+    for entry in load_manifest(shard_dir):
+        if wanted is not None and entry['id'] not in wanted:
+            continue
+        if region is not None and entry['region'] != region:
+            continue
+        with open(os.path.join(shard_dir, entry['file']), 'r', encoding='utf-8') as f:
+            packages.append(json.load(f))
+    return packages
@@ -0,0 +1,148 @@
+"""Process-pool runner for the Word package extractors"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from extraction import metrics
+
+
+def resolve_workers(workers):
+    """Turn a --workers value into a process count (0 or None means all cores)"""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def _run_job(extractor, args, instrument=False):
+    """Run a single extraction, returning (result, error, metrics) instead of raising
+
+    metrics is the document's stage timings and counters when instrument is
+    set, otherwise None. Extractor time outside its named stages (for both
+    extractors, the paragraph state machine) is reported as 'parse'.
+    """
+    if not instrument:
+        try:
+            return extractor(*args), None, None
+        except Exception as e:
+            return None, str(e), None
+
+    with metrics.recording() as recorder:
+        try:
+            with metrics.stage('parse'):
+                result, error = extractor(*args), None
+        except Exception as e:
+            result, error = None, str(e)
+    return result, error, recorder.as_dict()
+
+
+def run_extraction_jobs(extractor, jobs, workers=1, cache=None, report=None):
+    """Run extractor over a list of argument tuples
+
+    Outcomes are returned as (result, error) pairs in the same order as jobs,
+    so callers can assign IDs deterministically whatever the worker count.
+    With a cache, only documents whose content (or extractor version) changed
+    are parsed; the first element of each job must be the document path.
+    With a report (extraction.metrics.RunReport), every document's stage
+    timings and counters are recorded in it.
+    """
+    outcomes = [None] * len(jobs)
+    keys = [None] * len(jobs)
+    pending = []
+
+    for i, args in enumerate(jobs):
+        if cache is not None:
+            keys[i], outcomes[i] = _cache_lookup(cache, args, report)
+            if outcomes[i] is not None:
+                continue
+        pending.append(i)
+
+    results = _run_pending(extractor, [jobs[i] for i in pending], workers, report is not None)
+
+    for i, (result, error, doc_metrics) in zip(pending, results):
+        outcomes[i] = (result, error)
+        if cache is not None and error is None:
+            cache.put(keys[i], result)
+        if report is not None:
+            report.add(jobs[i][0], 'error' if error else 'ok', doc_metrics, error)
+
+    if report is not None:
+        report.finish(resolve_workers(workers))
+    return outcomes
+
+
+def _cache_lookup(cache, args, report=None):
+    """(cache key, (result, error) outcome) of a job, the outcome None when it has to be parsed"""
+    try:
+        key = cache.key(*args)
+    except OSError as e:
+        if report is not None:
+            report.add(args[0], 'error', error=str(e))
+        return None, (None, str(e))
+    cached = cache.get(key)
+    if cached is None:
+        return key, None
+    if report is not None:
+        report.add(args[0], 'cached')
+    return key, (cached, None)
+
+
+def iter_extraction_jobs(extractor, jobs, workers=1, cache=None, report=None, window=None):
+    """Like run_extraction_jobs, but yields (args, result, error) as documents finish
+
+    jobs may be any iterable, such as a generator discovering documents, and
+    is only consumed as fast as the workers keep up: at most window jobs
+    (default twice the workers) are taken from it and not yet yielded, so
+    memory stays constant however many documents there are. Outcomes are
+    still yielded in job order.
+    """
+    workers = resolve_workers(workers)
+    window = window or 2 * workers
+    instrument = report is not None
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    in_flight = deque()
+    jobs = iter(jobs)
+
+    def take():
+        """Start the next job; False when there are none left"""
+        args = next(jobs, None)
+        if args is None:
+            return False
+        key, outcome = _cache_lookup(cache, args, report) if cache is not None else (None, None)
+        if outcome is None:
+            outcome = pool.submit(_run_job, extractor, args, instrument) if pool else None
+        in_flight.append((args, key, outcome))
+        return True
+
+    try:
+        while len(in_flight) < window and take():
+            pass
+        while in_flight:
+            args, key, outcome = in_flight.popleft()
+            take()
+            if isinstance(outcome, tuple):
+                yield args, *outcome
+                continue
+            result, error, doc_metrics = outcome.result() if pool else _run_job(extractor, args, instrument)
+            if cache is not None and error is None:
+                cache.put(key, result)
+            if report is not None:
+                report.add(args[0], 'error' if error else 'ok', doc_metrics, error)
+            yield args, result, error
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    if report is not None:
+        report.finish(workers)
+
+
+def _run_pending(extractor, jobs, workers, instrument=False):
+    """Run jobs in-process or in a process pool, preserving order"""
+    workers = min(resolve_workers(workers), len(jobs))
+    if workers <= 1:
+        return [_run_job(extractor, args, instrument) for args in jobs]
+
+    # Small chunks keep the pool balanced when documents differ in size
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_job, [extractor] * len(jobs), jobs, [instrument] * len(jobs),
+                             chunksize=chunksize))
@@ -0,0 +1,172 @@
+"""Dense price matrices and batch quotes built from pricing.paxTiers
+
+Each package's nested pricing dict is flattened into a matrix of
+pax tier x hotel class x price field, stored in an array('d'). The
+extractors write it to each package as priceMatrix (price_matrix_json),
+which is what PriceCatalog reads back. A PriceCatalog stacks the matrices
+of many packages so a group can be priced against the whole catalogue in
+one vectorized pass (NumPy when installed, a plain loop over the arrays
+otherwise).
+
+singleSupplement is what the rate sheets call it: the amount a guest in a
+single room pays on top of the per-person double rate, not the single rate
+itself (every sheet's supplement is below its double rate).
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; quotes fall back to pure Python
+    np = None
+
+HOTEL_CLASSES = ('threestar', 'fourstar', 'fivestar')
+PRICE_FIELDS = ('double', 'singleSupplement', 'child0to6', 'child6to12')
+
+DOUBLE, SINGLE_SUPPLEMENT, CHILD_0_TO_6, CHILD_6_TO_12 = range(len(PRICE_FIELDS))
+MISSING = float('nan')
+
+
+def price_matrix(pricing):
+    """Flatten a pricing dict into {'tiers': [...], 'values': array('d')}
+
+    values is laid out [tier][hotel class][field]; child rates do not depend
+    on the tier and are repeated for every tier. A missing or non-positive
+    double rate is stored as NaN: the class is not offered at that tier.
+    """
+    tiers = sorted(int(t) for t in pricing.get('paxTiers', {}))
+    child_rates = pricing.get('childRates', {})
+    values = array('d')
+    for tier in tiers:
+        tier_prices = pricing['paxTiers'][str(tier)]
+        for hotel_class in HOTEL_CLASSES:
+            prices = tier_prices.get(hotel_class, {})
+            # A zero double rate is an empty cell of the sheet, not a free tier
+            double = prices.get('double')
+            values.append(double if double and double > 0 else MISSING)
+            values.append(prices.get('singleSupplement', 0))
+            values.append(child_rates.get('age0to6', {}).get(hotel_class, 0))
+            values.append(child_rates.get('age6to12', {}).get(hotel_class, 0))
+    return {'tiers': tiers, 'values': values}
+
+
+def price_matrix_json(pricing):
+    """The price matrix in a JSON-friendly form, for the package output"""
+    matrix = price_matrix(pricing)
+    return {
+        'tiers': matrix['tiers'],
+        'hotelClasses': list(HOTEL_CLASSES),
+        'fields': list(PRICE_FIELDS),
+        'values': [None if v != v else int(v) if v == int(v) else v for v in matrix['values']],
+    }
+
+
+def load_price_matrix(pkg):
+    """Price matrix of a package, from its stored priceMatrix when it has one
+
+    Falls back to flattening pricing when the package has no priceMatrix or
+    one laid out for other hotel classes or price fields.
+    """
+    stored = pkg.get('priceMatrix')
+    if (not stored or stored.get('hotelClasses') != list(HOTEL_CLASSES)
+            or stored.get('fields') != list(PRICE_FIELDS)):
+        return price_matrix(pkg.get('pricing', {}))
+    values = array('d', (MISSING if v is None else v for v in stored['values']))
+    return {'tiers': list(stored['tiers']), 'values': values}
+
+
+def split_children(child_ages):
+    """Count children per rate band; 12 and over pay the adult rate"""
+    young = sum(1 for age in child_ages if age < 6)
+    older = sum(1 for age in child_ages if 6 <= age < 12)
+    return young, older, len(child_ages) - young - older
+
+
+class PriceCatalog:
+    """Price matrices of many packages stacked for batch quoting
+
+    Packages are read through their stored priceMatrix (see
+    load_price_matrix). Every package is padded to the union of all pax
+    tiers; tiers a package does not offer hold NaN so they are never selected.
+    """
+
+    def __init__(self, packages):
+        self.package_ids = [pkg.get('packageId', '') for pkg in packages]
+        matrices = [load_price_matrix(pkg) for pkg in packages]
+        self.tiers = sorted({t for m in matrices for t in m['tiers']})
+
+        width = len(HOTEL_CLASSES) * len(PRICE_FIELDS)
+        self._row = len(self.tiers) * width
+        self.values = array('d', [MISSING]) * (len(packages) * self._row)
+        for p, matrix in enumerate(matrices):
+            for i, tier in enumerate(matrix['tiers']):
+                start = p * self._row + self.tiers.index(tier) * width
+                self.values[start:start + width] = matrix['values'][i * width:(i + 1) * width]
+
+        self._array = None
+        if np is not None:
+            self._array = np.frombuffer(self.values, dtype=np.float64).reshape(
+                len(packages), len(self.tiers), len(HOTEL_CLASSES), len(PRICE_FIELDS))
+
+    def __len__(self):
+        return len(self.package_ids)
+
+    def quote(self, adults, singles=0, child_ages=(), hotel_class='threestar'):
+        """Total price of a group for every package, in catalogue order
+
+        The group size (adults plus children) picks each package's pax tier:
+        the smallest tier that fits, or the largest tier for bigger groups, as
+        on the package pages. singles is how many of the adults take a single
+        room and pay the single supplement on top of the double rate. Packages
+        without a price for the hotel class quote None.
+        """
+        young, older, adult_children = split_children(child_ages)
+        payers = adults + adult_children
+        group = adults + len(child_ages)
+        weights = (payers, singles, young, older)
+        h = HOTEL_CLASSES.index(hotel_class)
+
+        if self._array is not None:
+            return self._quote_numpy(group, weights, h)
+        return self._quote_python(group, weights, h)
+
+    def _quote_numpy(self, group, weights, h):
+        """Vectorized quote over all packages"""
+        if not self.tiers:  # no package has pax tiers, so nothing is priced
+            return [None] * len(self.package_ids)
+        prices = self._array[:, :, h, :]
+        available = ~np.isnan(prices[:, :, DOUBLE])
+        tiers = np.asarray(self.tiers)
+        fits = available & (tiers >= group)
+        # First tier that fits, otherwise the largest available tier
+        largest = len(self.tiers) - 1 - np.argmax(available[:, ::-1], axis=1)
+        chosen = np.where(fits.any(axis=1), np.argmax(fits, axis=1), largest)
+        selected = prices[np.arange(len(prices)), chosen]
+        totals = selected @ np.asarray(weights, dtype=np.float64)
+        priced = available.any(axis=1)
+        return [float(t) if ok else None for t, ok in zip(totals, priced)]
+
+    def _quote_python(self, group, weights, h):
+        """Quote package by package when NumPy is not installed"""
+        fields = len(PRICE_FIELDS)
+        width = len(HOTEL_CLASSES) * fields
+        totals = []
+        for p in range(len(self.package_ids)):
+            chosen = None
+            for i, tier in enumerate(self.tiers):
+                start = p * self._row + i * width + h * fields
+                if self.values[start + DOUBLE] != self.values[start + DOUBLE]:  # NaN: tier not offered
+                    continue
+                chosen = start
+                if tier >= group:
+                    break
+            if chosen is None:
+                totals.append(None)
+                continue
+            totals.append(sum(w * self.values[chosen + f] for f, w in enumerate(weights)))
+        return totals
+
+    def cheapest(self, adults, singles=0, child_ages=(), hotel_class='threestar', limit=10):
+        """(packageId, total) pairs for the cheapest packages for a group"""
+        totals = self.quote(adults, singles, child_ages, hotel_class)
+        priced = [(pid, total) for pid, total in zip(self.package_ids, totals) if total is not None]
+        return sorted(priced, key=lambda item: item[1])[:limit]
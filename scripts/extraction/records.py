@@ -0,0 +1,139 @@
+"""Slotted records the extractors build packages in
+
+A package is assembled as a Package holding ItineraryDay, PriceTier (one
+HotelOption per hotel class) and ChildRates records instead of nested dicts,
+which keeps a parsed package a fraction of the size while it is being built
+or held. Day descriptions are collected as fragments and joined once.
+
+to_dict() gives the package JSON shape the rest of the pipeline uses, with
+the same key order as the dict templates the extractors used to fill, so the
+serialized output is byte-identical.
+"""
+from extraction.pricing import HOTEL_CLASSES
+
+# Pax tier labels, checked in this order ('10' before the '0' it contains)
+PAX_TIERS = ('10', '8', '6', '4', '2')
+
+
+class HotelOption:
+    """Per-person double rate and single supplement of one hotel class"""
+    __slots__ = ('double', 'single_supplement')
+
+    def __init__(self, double, single_supplement=0):
+        self.double = double
+        self.single_supplement = single_supplement
+
+    def to_dict(self):
+        return {'double': self.double, 'singleSupplement': self.single_supplement}
+
+
+class PriceTier:
+    """Rates of one pax tier, one HotelOption per hotel class"""
+    __slots__ = HOTEL_CLASSES
+
+    def __init__(self, threestar, fourstar, fivestar):
+        self.threestar = HotelOption(threestar)
+        self.fourstar = HotelOption(fourstar)
+        self.fivestar = HotelOption(fivestar)
+
+    def set_single_supplements(self, threestar, fourstar, fivestar):
+        self.threestar.single_supplement = threestar
+        self.fourstar.single_supplement = fourstar
+        self.fivestar.single_supplement = fivestar
+
+    def to_dict(self):
+        return {'threestar': self.threestar.to_dict(), 'fourstar': self.fourstar.to_dict(),
+                'fivestar': self.fivestar.to_dict()}
+
+
+class ChildRates:
+    """Child price per hotel class for one age band"""
+    __slots__ = HOTEL_CLASSES
+
+    def __init__(self, threestar=0, fourstar=0, fivestar=0):
+        self.threestar = threestar
+        self.fourstar = fourstar
+        self.fivestar = fivestar
+
+    def to_dict(self):
+        return {'threestar': self.threestar, 'fourstar': self.fourstar, 'fivestar': self.fivestar}
+
+
+class ItineraryDay:
+    """One itinerary day; description paragraphs are added with add_text"""
+    __slots__ = ('day', 'title', 'meals', '_fragments')
+
+    def __init__(self, day, title, meals):
+        self.day = day
+        self.title = title
+        self.meals = meals
+        self._fragments = []
+
+    def add_text(self, text):
+        """Append a paragraph to the description (paragraphs are joined with a space)"""
+        self._fragments.append(text)
+
+    @property
+    def description(self):
+        return ' '.join(self._fragments)
+
+    def to_dict(self):
+        return {'day': self.day, 'title': self.title, 'description': self.description, 'meals': self.meals}
+
+
+class Package:
+    """A package as the extractors build it; region and highlights are only output when set"""
+    __slots__ = (
+        'title', 'duration', 'description', 'itinerary', 'included', 'not_included', 'information',
+        'hotels', 'pax_tiers', 'child_rates', 'destinations', 'package_type', 'tour_type',
+        'transfer_type', 'region', 'highlights',
+    )
+
+    def __init__(self, package_type='WITH_HOTEL', tour_type='SIC', transfer_type='PRIVATE', region=None):
+        self.title = ''
+        self.duration = ''
+        self.description = ''
+        self.itinerary = []
+        self.included = []
+        self.not_included = []
+        self.information = []
+        self.hotels = {hotel_class: [] for hotel_class in HOTEL_CLASSES}
+        self.pax_tiers = {}
+        self.child_rates = {'age0to6': ChildRates(), 'age6to12': ChildRates()}
+        self.destinations = ''
+        self.package_type = package_type
+        self.tour_type = tour_type
+        self.transfer_type = transfer_type
+        self.region = region
+        self.highlights = None
+
+    def set_single_supplements(self, threestar, fourstar, fivestar):
+        """Single supplements of every pax tier read so far"""
+        for tier in self.pax_tiers.values():
+            tier.set_single_supplements(threestar, fourstar, fivestar)
+
+    def to_dict(self):
+        """The package as the extractors' JSON shape"""
+        data = {
+            'title': self.title,
+            'duration': self.duration,
+            'description': self.description,
+            'itinerary': [day.to_dict() for day in self.itinerary],
+            'included': self.included,
+            'notIncluded': self.not_included,
+            'information': self.information,
+            'hotels': self.hotels,
+            'pricing': {
+                'paxTiers': {label: tier.to_dict() for label, tier in self.pax_tiers.items()},
+                'childRates': {band: rates.to_dict() for band, rates in self.child_rates.items()},
+            },
+            'destinations': self.destinations,
+            'packageType': self.package_type,
+            'tourType': self.tour_type,
+            'transferType': self.transfer_type,
+        }
+        if self.region is not None:
+            data['region'] = self.region
+        if self.highlights is not None:
+            data['highlights'] = self.highlights
+        return data
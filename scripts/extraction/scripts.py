@@ -0,0 +1,28 @@
+"""Import the hyphenated extractor scripts as regular modules"""
+import importlib.util
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script(filename):
+    """Load scripts/<filename> once and return it as a module
+
+    The module is registered under its underscored name (for example
+    extract_packages_from_word) so its functions can be pickled into
+    worker processes.
+    """
+    name = os.path.splitext(filename)[0].replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
@@ -0,0 +1,238 @@
+"""Bilingual full-text search over package itineraries, scored with BM25
+
+Each package is indexed as one document per language: the English title
+and itinerary days (or Turkish, when a sheet's days are written in
+Turkish) and the Spanish titleEs and itineraryEs. Tokens are normalized per
+language: lower case with Turkish dotted/dotless i folded, accents
+removed, stopwords dropped, apostrophe suffixes handled (English 's,
+Turkish İstanbul'da) and plurals reduced. Queries are analyzed with every
+language, so 'Capadocia globo' and 'Cappadocia balloon' both work.
+
+Written next to the package list (2026-packages.search.json, or search.json
+in the shard folder) as compact JSON with delta-encoded postings:
+
+    {"version": 1, "k1": 1.2, "b": 0.75, "packageIds": [...],
+     "docs": {"package": [i], "lang": ["en"], "length": [n]}, "avgLength": x,
+     "terms": {"term": [doc, tf, doc gap, tf, ...]}}
+"""
+import heapq
+import json
+import math
+import os
+import re
+import unicodedata
+
+from extraction.output import SHARD_DIR, load_package_shards, write_json_atomic
+
+SEARCH_INDEX_VERSION = 1
+SHARD_SEARCH_NAME = 'search.json'
+K1 = 1.2
+B = 0.75
+
+LANGUAGES = ('en', 'es', 'tr')
+
+STOPWORDS = {
+    'en': {
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it', 'its',
+        'of', 'on', 'or', 'our', 'the', 'then', 'this', 'that', 'to', 'will', 'with', 'you', 'your',
+    },
+    'es': {
+        'a', 'al', 'con', 'de', 'del', 'el', 'en', 'es', 'la', 'las', 'lo', 'los', 'o', 'para', 'por',
+        'que', 'se', 'su', 'sus', 'un', 'una', 'unas', 'unos', 'y',
+    },
+    'tr': {
+        'bir', 'bu', 'da', 'de', 'gibi', 'her', 'icin', 'ile', 'ise', 'kadar', 'olan', 'olarak', 've',
+        'veya', 'ya', 'sonra', 'once',
+    },
+}
+
+_TOKEN = re.compile(r"\w+(?:['’]\w+)?")
+
+
+def normalize(text):
+    """Lower case without accents; Turkish dotted and dotless i become i"""
+    text = text.lower().replace('ı', 'i')
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _stem(token, lang):
+    """Light plural stripping, enough to match singular and plural forms"""
+    if lang == 'en':
+        if len(token) > 4 and token.endswith('ies'):
+            return token[:-3] + 'y'
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            return token[:-1]
+    elif lang == 'es':
+        if len(token) > 4 and token.endswith('es'):
+            return token[:-2]
+        if len(token) > 3 and token.endswith('s'):
+            return token[:-1]
+    elif lang == 'tr':
+        if len(token) > 5 and token.endswith(('ler', 'lar')):
+            return token[:-3]
+    return token
+
+
+def analyze(text, lang):
+    """Search terms of text in one of LANGUAGES"""
+    terms = []
+    stopwords = STOPWORDS[lang]
+    for token in _TOKEN.findall(normalize(text or '')):
+        if "'" in token or '’' in token:
+            word, suffix = re.split(r"['’]", token, maxsplit=1)
+            # Turkish suffixes (İstanbul'da) and the English possessive are dropped
+            token = word if lang == 'tr' or suffix == 's' else word + suffix
+        if token in stopwords or token.isdigit():
+            continue
+        terms.append(_stem(token, lang))
+    return terms
+
+
+def detect_language(text, candidates=('en', 'tr')):
+    """The candidate language whose stopwords occur most often in text (the first on ties)"""
+    tokens = _TOKEN.findall(normalize(text or ''))
+    counts = {lang: sum(token in STOPWORDS[lang] for token in tokens) for lang in candidates}
+    return max(candidates, key=lambda lang: (counts[lang], -candidates.index(lang)))
+
+
+def _itinerary_text(title, itinerary):
+    parts = [title or '']
+    for day in itinerary or []:
+        parts.append(day.get('title', ''))
+        parts.append(day.get('description', ''))
+    return '\n'.join(parts)
+
+
+def package_documents(pkg):
+    """(language, text) documents of a package: its English (or Turkish) and Spanish itinerary"""
+    documents = []
+    text = _itinerary_text(pkg.get('title'), pkg.get('itinerary'))
+    if text.strip():
+        documents.append((detect_language(text), text))
+    text_es = _itinerary_text(pkg.get('titleEs'), pkg.get('itineraryEs'))
+    if text_es.strip():
+        documents.append(('es', text_es))
+    return documents
+
+
+def build_search_index(packages):
+    """BM25 search index of a package list or iterable (see the module docstring)"""
+    package_ids, doc_package, doc_lang, doc_length = [], [], [], []
+    postings = {}
+    for package_index, pkg in enumerate(packages):
+        package_ids.append(pkg['packageId'])
+        for lang, text in package_documents(pkg):
+            doc = len(doc_package)
+            terms = analyze(text, lang)
+            doc_package.append(package_index)
+            doc_lang.append(lang)
+            doc_length.append(len(terms))
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc, tf))
+
+    terms = {}
+    for term in sorted(postings):
+        flat, previous = [], 0
+        for doc, tf in postings[term]:
+            flat.extend((doc - previous, tf))
+            previous = doc
+        terms[term] = flat
+
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'k1': K1,
+        'b': B,
+        'packageIds': package_ids,
+        'docs': {'package': doc_package, 'lang': doc_lang, 'length': doc_length},
+        'avgLength': (sum(doc_length) / len(doc_length)) if doc_length else 0,
+        'terms': terms,
+    }
+
+
+def search_index_path(packages_path):
+    """Search index path for a package list (<name>.search.json next to it)"""
+    base = os.path.basename(packages_path).split('.')[0]
+    return os.path.join(os.path.dirname(packages_path), f"{base}.search.json")
+
+
+def write_search_index(packages, path):
+    """Build and write the search index of packages to path, returning the path"""
+    write_json_atomic(path, build_search_index(packages), indent=None)
+    return path
+
+
+def write_shard_search_index(shard_dir=SHARD_DIR):
+    """Rebuild search.json of the shard folder from every shard, returning its path"""
+    return write_search_index(load_package_shards(shard_dir), os.path.join(shard_dir, SHARD_SEARCH_NAME))
+
+
+class SearchIndex:
+    """Ranked search over a search index
+
+        index = SearchIndex.load('data/2026-packages.search.json')
+        index.search('hot air balloon cappadocia')  # [(packageId, score), ...]
+    """
+
+    def __init__(self, data):
+        if data.get('version') != SEARCH_INDEX_VERSION:
+            raise ValueError(f"unsupported search index version: {data.get('version')}")
+        self.k1 = data['k1']
+        self.b = data['b']
+        self.package_ids = data['packageIds']
+        self.doc_package = data['docs']['package']
+        self.doc_length = data['docs']['length']
+        self.avg_length = data['avgLength'] or 1
+        self._terms = data['terms']
+        self._postings = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(json.loads(f.read()))
+
+    def postings(self, term):
+        """[(doc, tf)] of a term, decoded on first use"""
+        if term not in self._postings:
+            flat = self._terms.get(term, [])
+            decoded, doc = [], 0
+            for i in range(0, len(flat), 2):
+                doc += flat[i]
+                decoded.append((doc, flat[i + 1]))
+            self._postings[term] = decoded
+        return self._postings[term]
+
+    def query_terms(self, query):
+        """Distinct terms of a query analyzed in every language"""
+        terms = {}
+        for lang in LANGUAGES:
+            for term in analyze(query, lang):
+                terms.setdefault(term, None)
+        return list(terms)
+
+    def search(self, query, limit=10):
+        """Best matching packageIds with their BM25 scores, best first
+
+        A package scores as its best matching language document.
+        """
+        doc_count = len(self.doc_package)
+        doc_scores = {}
+        for term in self.query_terms(query):
+            postings = self.postings(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_length[doc] / self.avg_length)
+                doc_scores[doc] = doc_scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        package_scores = {}
+        for doc, score in doc_scores.items():
+            package = self.doc_package[doc]
+            if score > package_scores.get(package, 0.0):
+                package_scores[package] = score
+        best = heapq.nlargest(limit, package_scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self.package_ids[package], round(score, 4)) for package, score in best]
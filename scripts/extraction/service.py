@@ -0,0 +1,112 @@
+"""Warm worker pool behind the extraction service
+
+Worker processes load both extractor scripts once, in the pool initializer
+(module import, translation matchers, regexes), so a request only pays for
+reading its own document. The pool admits a bounded number of jobs: when
+every worker is busy and the queue is full, submit() raises PoolBusy
+instead of letting requests pile up.
+"""
+import io
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from extraction.parallel import resolve_workers
+from extraction.scripts import load_script
+
+KINDS = ('turkey', 'europe')
+
+_turkey = None
+_europe = None
+
+
+class PoolBusy(Exception):
+    """Raised when the pool already holds as many jobs as it admits"""
+
+
+def warm_worker():
+    """Pool initializer: import the extractors and load the translation memo so requests start warm"""
+    global _turkey, _europe
+    if _turkey is not None:
+        return
+    _turkey = load_script('extract-packages-from-word.py')
+    _europe = load_script('extract-europe-packages.py')
+    # Read-only here: workers never save, so concurrent runs keep owning the file
+    _turkey.load_translation_memo()
+
+
+def extract_job(kind, source, filename, package_type='WITH_HOTEL', tour_type='SIC'):
+    """Extract and finalize one document in a worker; source is a path or the .docx bytes
+
+    Returns (package, seconds spent extracting).
+    """
+    if _turkey is None:
+        warm_worker()
+    document = io.BytesIO(source) if isinstance(source, bytes) else source
+    start = time.perf_counter()
+    if kind == 'europe':
+        pkg_data = _europe.finalize_europe_package(_europe.extract_europe_package(document), filename)
+    else:
+        pkg_data = _turkey.extract_package_from_word(document, package_type, tour_type)
+        pkg_data = _turkey.finalize_package(pkg_data, filename, package_type, tour_type)
+    return pkg_data, time.perf_counter() - start
+
+
+class ExtractionPool:
+    """Process pool with admission control
+
+    At most workers + queue_size jobs are accepted at a time; the rest are
+    refused with PoolBusy so callers can answer 'try again' right away.
+    """
+
+    def __init__(self, workers=0, queue_size=None):
+        self.workers = resolve_workers(workers)
+        self.capacity = self.workers + (self.workers * 2 if queue_size is None else queue_size)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+
+    def warm_up(self):
+        """Start every worker now instead of on the first requests"""
+        futures = [self._executor.submit(warm_worker) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, kind, source, filename, package_type='WITH_HOTEL', tour_type='SIC'):
+        """Queue an extraction and return its future, or raise PoolBusy"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolBusy(f"all {self.capacity} extraction slots are taken")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(extract_job, kind, source, filename, package_type, tour_type)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            if future is not None:
+                self.completed += 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'capacity': self.capacity,
+                'inFlight': self.in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
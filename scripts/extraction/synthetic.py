@@ -0,0 +1,204 @@
+"""Synthetic Word rate sheets for benchmarking the extractors
+
+The generated documents follow the layout of the real rate sheets: title,
+duration, one heading plus description paragraphs per day, inclusions,
+exclusions, information, a hotel table and a pax pricing table. Turkey
+sheets use the English headings; Europe sheets mix in the Turkish ones
+(1. Gün, Dahil Olan Hizmetler, Şehir, KİŞİ, TEK, ÇOCUK). Everything is
+derived from a seed, so a corpus can be regenerated identically.
+"""
+import os
+import random
+
+# Bump when the generated documents change so cached corpora are rebuilt
+GENERATOR_VERSION = 1
+
+TURKEY_CITIES = ['Istanbul', 'Cappadocia', 'Kusadasi', 'Antalya', 'Ephesus', 'Pamukkale', 'Bodrum', 'Fethiye']
+EUROPE_CITIES = ['Budapest', 'Vienna', 'Prague', 'Zagreb', 'Split', 'Dubrovnik', 'Helsinki', 'Rovaniemi']
+
+DAY_ACTIVITIES = [
+    'Arrival', 'Full Day Tour', 'Half Day Tour', 'Free Day', 'Fly to {city}',
+    'Bosphorus Cruise', 'Old Town Walking Tour', 'Departure',
+]
+MEALS = ['B', 'B/L', 'B/D', 'B/L/D', '-']
+TURKISH_MEALS = ['K', 'K/Ö', 'K/A', '-']
+
+DESCRIPTION_SENTENCES = [
+    'After breakfast at the hotel, meet your guide in the lobby.',
+    'Visit the Hippodrome, Topkapi Palace and the Blue Mosque.',
+    'Transfer to the airport for your flight to {city}.',
+    'Upon arrival, meet and greet by our representative and transfer to your hotel.',
+    'Enjoy a panoramic tour of {city} with a professional guide.',
+    'Lunch is served at a local restaurant.',
+    'Free time for shopping at the Grand Bazaar.',
+    'In the afternoon, return to the hotel.',
+    'Overnight in {city}.',
+]
+INCLUSIONS = [
+    '{nights} nights accommodation in the mentioned hotels below',
+    'Daily breakfast at the hotels',
+    'Return airport transfers on Private basis',
+    'Professional English-speaking guide on tour days',
+    'Entrance fees to the mentioned sites',
+    'Local Taxes.',
+]
+EXCLUSIONS = ['Flights', 'Personal expenses,', 'Tips to the driver and the guide', 'Drinks at meals', 'Visa fees']
+INFORMATION = [
+    'Grand Bazaar is closed on Sundays,',
+    'Topkapi Palace is closed on Tuesdays.',
+    'Hotel check-in time is 14:00.',
+    'The itinerary may change due to local conditions.',
+]
+HOTEL_NAMES = ['Grand', 'Plaza', 'Park', 'Palace', 'Garden', 'Royal', 'Boutique', 'Cave', 'Bay', 'Central']
+PAX_TIERS = [2, 4, 6, 8, 10]
+
+
+def _sentence(rng, city):
+    return rng.choice(DESCRIPTION_SENTENCES).format(city=city)
+
+
+def _route(rng, cities, nights):
+    """Cities visited, one per day, following a shuffled stop order"""
+    stops = rng.sample(cities, rng.randint(2, min(4, len(cities))))
+    return stops, [stops[min(day * len(stops) // (nights + 1), len(stops) - 1)] for day in range(nights + 1)]
+
+
+def _hotel_rows(rng, stops):
+    rows = []
+    for city in stops:
+        names = [f"{rng.choice(HOTEL_NAMES)} {city} Hotel" for _ in range(3)]
+        if rng.random() < 0.3:
+            names[0] += '\nor similar'
+        rows.append([city] + names)
+    return rows
+
+
+def _price_rows(rng, tier_label, single_label, child_labels, thousands):
+    """Pricing table body: descending prices per pax tier, supplements and child rates"""
+    base = rng.randint(6, 20) * 100
+    rows = []
+
+    def money(value):
+        return f"{value:,}".replace(',', thousands) + rng.choice(['', ' EUR', ' €'])
+
+    for tier in PAX_TIERS[:rng.randint(3, len(PAX_TIERS))]:
+        price = base - tier * 25
+        rows.append([tier_label.format(tier=tier)] + [money(price + step * 250) for step in range(3)])
+    rows.append([single_label] + [money(base // 3 + step * 100) for step in range(3)])
+    rows.append([child_labels[0]] + ['0', '0', '0'])
+    rows.append([child_labels[1]] + [money(base // 2 + step * 50) for step in range(3)])
+    return rows
+
+
+def _add_table(doc, header, rows):
+    table = doc.add_table(rows=len(rows) + 1, cols=len(header))
+    for column, text in enumerate(header):
+        table.cell(0, column).text = text
+    for r, row in enumerate(rows, start=1):
+        for column, text in enumerate(row):
+            table.cell(r, column).text = text
+
+
+def build_turkey_sheet(rng, path):
+    """Write one Turkey rate sheet and return the number of itinerary days"""
+    from docx import Document
+
+    nights = rng.randint(3, 12)
+    stops, route = _route(rng, TURKEY_CITIES, nights)
+    doc = Document()
+    doc.add_paragraph(f"{' & '.join(stops)} Package")
+    doc.add_paragraph(f"{nights} Nights / {nights + 1} Days")
+    for day, city in enumerate(route, start=1):
+        activity = rng.choice(DAY_ACTIVITIES).format(city=city)
+        doc.add_paragraph(f"Day {day} – {city} – {activity} ({rng.choice(MEALS)})")
+        for _ in range(rng.randint(1, 4)):
+            doc.add_paragraph(_sentence(rng, city))
+    doc.add_paragraph('*** End of the tour')
+
+    doc.add_paragraph('Inclusions')
+    for item in rng.sample(INCLUSIONS, rng.randint(3, len(INCLUSIONS))):
+        doc.add_paragraph(item.format(nights=nights))
+    doc.add_paragraph('Exclusions')
+    for item in rng.sample(EXCLUSIONS, rng.randint(2, len(EXCLUSIONS))):
+        doc.add_paragraph(item)
+    doc.add_paragraph('Information')
+    for item in rng.sample(INFORMATION, rng.randint(1, len(INFORMATION))):
+        doc.add_paragraph(item)
+
+    doc.add_paragraph('Hotel Options')
+    _add_table(doc, ['City', '3* HOTELS', '4* HOTELS', '5* HOTELS'], _hotel_rows(rng, stops))
+    doc.add_paragraph('Package Rates')
+    _add_table(doc, ['PAX', '3*', '4*', '5*'],
+               _price_rows(rng, '{tier} PAX', 'SINGLE SUPPLEMENT', ['CHILD 0-6', 'CHILD 6-12'], ','))
+    doc.save(path)
+    return nights + 1
+
+
+def build_europe_sheet(rng, path):
+    """Write one Europe rate sheet (English or Turkish headings) and return the number of itinerary days"""
+    from docx import Document
+
+    turkish = rng.random() < 0.5
+    nights = rng.randint(3, 9)
+    stops, route = _route(rng, EUROPE_CITIES, nights)
+    doc = Document()
+    doc.add_paragraph(' - '.join(stops))
+    doc.add_paragraph(f"{nights} Gece / {nights + 1} Gün" if turkish else f"{nights} Nights / {nights + 1} Days")
+    for day, city in enumerate(route, start=1):
+        activity = rng.choice(DAY_ACTIVITIES).format(city=city)
+        if turkish:
+            doc.add_paragraph(f"{day}. Gün - {city} {activity} ({rng.choice(TURKISH_MEALS)})")
+        else:
+            doc.add_paragraph(f"Day {day} - {city} {activity}\t({rng.choice(MEALS)})")
+        for _ in range(rng.randint(1, 4)):
+            doc.add_paragraph(_sentence(rng, city))
+    doc.add_paragraph('End of service')
+
+    doc.add_paragraph('Dahil Olan Hizmetler' if turkish else 'Inclusions')
+    for item in rng.sample(INCLUSIONS, rng.randint(3, len(INCLUSIONS))):
+        doc.add_paragraph(item.format(nights=nights))
+    doc.add_paragraph('Dahil Olmayan Hizmetler' if turkish else 'Exclusions')
+    for item in rng.sample(EXCLUSIONS, rng.randint(2, len(EXCLUSIONS))):
+        doc.add_paragraph(item)
+    doc.add_paragraph('Önemli Bilgiler' if turkish else 'Important Information')
+    for item in rng.sample(INFORMATION, rng.randint(1, len(INFORMATION))):
+        doc.add_paragraph(item)
+
+    doc.add_paragraph('Otel Seçenekleri' if turkish else 'Hotel Options')
+    _add_table(doc, ['Şehir' if turkish else 'City', '3*', '4*', '5*'], _hotel_rows(rng, stops))
+    doc.add_paragraph('Paket Fiyatları' if turkish else 'Package Rates')
+    if turkish:
+        rows = _price_rows(rng, '{tier} KİŞİ', 'TEK KİŞİ FARKI', ['ÇOCUK 0-6', 'ÇOCUK 6-12'], '.')
+    else:
+        rows = _price_rows(rng, '{tier} PAX', 'SINGLE SUPPLEMENT', ['CHILD 0-6', 'CHILD 6-12'], '.')
+    _add_table(doc, ['Kişi' if turkish else 'PAX', '3*', '4*', '5*'], rows)
+    doc.save(path)
+    return nights + 1
+
+
+def generate_corpus(root, count, turkey_folders, europe_folder, seed=0, europe_share=0.15):
+    """Write count rate sheets under root and return [(kind, file_path, folder_info)]
+
+    turkey_folders are the extractor's FOLDERS entries (folder name,
+    package type, tour type); sheets are spread over them round robin, and
+    about europe_share of the corpus goes to europe_folder. Sheets already
+    present (same seed and generator version) are reused.
+    """
+    documents = []
+    europe_count = round(count * europe_share)
+    for i in range(count):
+        rng = random.Random(f"{GENERATOR_VERSION}:{seed}:{i}")
+        if i < europe_count:
+            folder = os.path.join(root, europe_folder)
+            path = os.path.join(folder, f"{i + 1:04d} - Europe Synthetic.docx")
+            kind, info, build = 'europe', None, build_europe_sheet
+        else:
+            info = turkey_folders[i % len(turkey_folders)]
+            folder = os.path.join(root, info[0])
+            path = os.path.join(folder, f"{i + 1:04d} - Turkey Synthetic.docx")
+            kind, build = 'turkey', build_turkey_sheet
+        if not os.path.exists(path):
+            os.makedirs(folder, exist_ok=True)
+            build(rng, path)
+        documents.append((kind, path, info))
+    return documents
@@ -0,0 +1,294 @@
+"""Compiled phrase translation used for the translated package fields
+
+Each target language is a locale pack, locales/<code>.json next to this
+module: its phrase tables and the wording of the generated package
+description. Adding a pack adds its fields (titleEs, titleDe, ...) to every
+package; MultiPhraseTranslator translates a string into all of them in a
+single scan.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+
+DEFAULT_MEMO_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '.cache', 'translations.json')
+LOCALES_DIR = os.path.join(os.path.dirname(__file__), 'locales')
+
+# Phrase tables every locale pack provides
+LOCALE_TABLES = ('terms', 'title', 'dayTitle', 'description', 'meals')
+
+
+def _trie_pattern(node):
+    """Regex for a trie node; longer continuations are tried before ending here"""
+    branches = []
+    for char, child in sorted(node.items(), key=lambda item: item[0] or ''):
+        if char is None:
+            continue
+        branches.append(re.escape(char) + _trie_pattern(child))
+    if None in node:
+        # End of a phrase: require a word boundary if it ends on a word character
+        branches.append(node[None])
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+def compile_phrases(phrases, flags):
+    """Compile phrases into one trie-shaped regex matching on word boundaries"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[None] = r'(?!\w)' if re.match(r'\w', phrase[-1]) else ''
+
+    branches = []
+    for char, child in sorted(trie.items()):
+        # Phrases starting on a word character must not start mid-word. The
+        # check sits after the first literal so the regex engine can still
+        # skip ahead using the set of possible first characters.
+        boundary = r'(?<!\w.)' if re.match(r'\w', char) else ''
+        branch = re.escape(char) + boundary + _trie_pattern(child)
+        branches.append(branch)
+    return re.compile('|'.join(branches), flags)
+
+
+class PhraseTranslator:
+    """Replaces dictionary phrases in a single left-to-right scan
+
+    All phrases are compiled into one trie-shaped regex, so each position is
+    tested against one character class instead of every phrase, the longest
+    matching phrase wins, and replaced text is never matched again (no
+    'B' -> 'D' -> 'C' chains).
+    """
+
+    def __init__(self, phrases, ignore_case=False):
+        self.ignore_case = ignore_case
+        self._lookup = {}
+        for source, target in phrases.items():
+            key = source.lower() if ignore_case else source
+            # Keep the first entry when two phrases only differ by case
+            self._lookup.setdefault(key, target)
+
+        keys = [p for p in self._lookup if p]
+        flags = re.IGNORECASE if ignore_case else 0
+        self._regex = compile_phrases(keys, flags) if keys else None
+
+    def _replace(self, match):
+        text = match.group(0)
+        return self._lookup[text.lower() if self.ignore_case else text]
+
+    def __call__(self, text):
+        if not text or self._regex is None:
+            return text
+        return self._regex.sub(self._replace, text)
+
+
+class MultiPhraseTranslator:
+    """Translates into several locales at once, scanning each string a single time
+
+        translate = MultiPhraseTranslator({'es': {'Arrival': 'Llegada'}, 'de': {'Arrival': 'Ankunft'}})
+        translate('Arrival Istanbul')  # {'es': 'Llegada Istanbul', 'de': 'Ankunft Istanbul'}
+
+    The phrases of every locale are compiled into one trie-shaped regex, as
+    in PhraseTranslator, and each match is looked up once for all locales.
+    With the same phrases in every table the output per locale is exactly
+    PhraseTranslator's; a matched phrase that only other locales define is
+    translated with the locale's own table within the matched span.
+    """
+
+    def __init__(self, tables, ignore_case=False):
+        self.locales = tuple(tables)
+        self.ignore_case = ignore_case
+        self._lookup = {}
+        self._own = {}
+        for index, (locale, phrases) in enumerate(tables.items()):
+            for source, target in phrases.items():
+                key = source.lower() if ignore_case else source
+                targets = self._lookup.setdefault(key, [None] * len(self.locales))
+                # Keep the first entry when two phrases only differ by case
+                if targets[index] is None:
+                    targets[index] = target
+        if len(self.locales) == 1 or any(None in targets for targets in self._lookup.values()):
+            self._own = {locale: PhraseTranslator(phrases, ignore_case) for locale, phrases in tables.items()}
+
+        keys = [p for p in self._lookup if p]
+        flags = re.IGNORECASE if ignore_case else 0
+        # Captured, so split() returns the text between phrases and the phrases alternately
+        self._regex = re.compile(f"({compile_phrases(keys, flags).pattern})", flags) if keys else None
+
+    def __call__(self, text):
+        if not text or self._regex is None:
+            return {locale: text for locale in self.locales}
+        if len(self.locales) == 1:
+            locale = self.locales[0]
+            return {locale: self._own[locale](text)}
+        parts = self._regex.split(text)
+        if len(parts) == 1:
+            return {locale: text for locale in self.locales}
+        sources = parts[1::2]
+        rows = [self._lookup[source.lower() if self.ignore_case else source] for source in sources]
+        translated = {}
+        for index, locale in enumerate(self.locales):
+            parts[1::2] = [
+                row[index] if row[index] is not None else self._own[locale](source)
+                for row, source in zip(rows, sources)
+            ]
+            translated[locale] = ''.join(parts)
+        return translated
+
+
+class LocalePack:
+    """One target language: phrase tables plus the generated description's wording
+
+    fieldSuffix names the package fields it fills (titleEs for 'Es'). The
+    description template takes {destinations} and {duration}, the duration
+    with durationWords replaced in order.
+    """
+
+    def __init__(self, code, field_suffix, tables, description_template, duration_words=None, name=None):
+        self.code = code
+        self.field_suffix = field_suffix
+        self.tables = tables
+        self.description_template = description_template
+        self.duration_words = duration_words or {}
+        self.name = name or code
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        tables = data['tables']
+        for table in LOCALE_TABLES:
+            tables.setdefault(table, {})
+        return cls(data['locale'], data['fieldSuffix'], tables, data['description']['template'],
+                   data['description'].get('durationWords'), data.get('name'))
+
+    def describe(self, destinations, duration):
+        """Opening sentence of the package description from translated destinations"""
+        for source, target in self.duration_words.items():
+            duration = duration.replace(source, target)
+        return self.description_template.format(destinations=destinations, duration=duration)
+
+    def to_dict(self):
+        return {
+            'locale': self.code, 'name': self.name, 'fieldSuffix': self.field_suffix,
+            'description': {'template': self.description_template, 'durationWords': self.duration_words},
+            'tables': self.tables,
+        }
+
+
+def load_locale_packs(codes=None, directory=LOCALES_DIR):
+    """Locale packs by code, in the order given (default: every pack in directory, by code)"""
+    if codes is None:
+        codes = sorted(os.path.splitext(os.path.basename(path))[0]
+                       for path in glob.glob(os.path.join(directory, '*.json')))
+    return [LocalePack.load(os.path.join(directory, f"{code}.json")) for code in codes]
+
+
+def locale_tables(packs, table):
+    """{locale: phrases} of one table across packs, for MultiPhraseTranslator"""
+    return {pack.code: pack.tables[table] for pack in packs}
+
+
+def dictionary_version(*dictionaries):
+    """Short hash of translation dictionaries; changes whenever any entry does"""
+    digest = hashlib.sha256()
+    for dictionary in dictionaries:
+        digest.update(json.dumps(dictionary, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class TranslationMemo:
+    """Bounded LRU memo of translated strings, persisted between runs
+
+    The same inclusion lines and day descriptions appear in every package
+    variant, so translations are remembered by (translator, source text).
+    Entries belong to one dictionary version: a memo file written with other
+    dictionaries is ignored on load. Past max_entries the least recently
+    used translations are evicted.
+
+        memo = TranslationMemo(dictionary_version(TERMS))
+        translate = memo.memoize('terms', PhraseTranslator(TERMS))
+    """
+
+    def __init__(self, version, max_entries=20000):
+        self.version = version
+        self.max_entries = max_entries
+        self.path = None
+        self._entries = OrderedDict()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def memoize(self, name, translator):
+        """Wrap a translator so each distinct text is translated once"""
+        def translate(text):
+            if not text:
+                return translator(text)
+            key = (name, text)
+            try:
+                result = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                result = translator(text)
+                self._store(key, result)
+                return result
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+        return translate
+
+    def _store(self, key, result):
+        self._entries[key] = result
+        self._dirty = True
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def load(self, path=DEFAULT_MEMO_PATH):
+        """Read remembered translations from path (kept as the save target)"""
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != self.version:
+            self._dirty = True  # rewrite the stale file on save
+            return
+        for name, text, result in data.get('entries', [])[-self.max_entries:]:
+            self._entries[(name, text)] = result
+
+    def save(self):
+        """Write the memo back (least recently used first) if anything changed"""
+        if self.path is None or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        data = {
+            'version': self.version,
+            'entries': [[name, text, result] for (name, text), result in self._entries.items()],
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def clear(self):
+        """Forget every translation"""
+        self._entries.clear()
+        self._dirty = True
+
+    def summary(self):
+        """One-line hit/miss report"""
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0
+        return (f"Translation memo: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), "
+                f"{len(self._entries)} entries, {self.evictions} evicted")
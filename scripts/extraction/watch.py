@@ -0,0 +1,167 @@
+"""Watch the rate sheet folders and report settled changes to .docx files
+
+Uses watchdog (inotify on Linux, ReadDirectoryChangesW on Windows, FSEvents
+on macOS) when it is installed and falls back to polling file stamps
+otherwise. Events are debounced per file: Word saves a document in several
+steps (temporary file, rename, lock file), so a path is only reported once
+it has been quiet for the debounce interval. Word's ~$ lock files are
+ignored.
+"""
+import os
+import queue
+import threading
+import time
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; changes are found by polling instead
+    FileSystemEventHandler = object
+    Observer = None
+
+# watchdog event types that can mean a document's content changed
+_CHANGE_EVENTS = {'created', 'modified', 'moved', 'deleted', 'closed'}
+
+
+def is_watched_document(path):
+    """Whether a path is a rate sheet (a .docx that is not a Word lock file)"""
+    name = os.path.basename(path)
+    return name.lower().endswith('.docx') and not name.startswith('~$')
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forward watchdog events on rate sheets to a queue"""
+
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in _CHANGE_EVENTS:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            if path and is_watched_document(path):
+                self.events.put(os.path.abspath(path))
+
+
+class _WatchdogBackend:
+    """Native file system notifications through watchdog"""
+    name = 'watchdog'
+
+    def __init__(self, folders, events):
+        self.observer = Observer()
+        for folder in folders:
+            self.observer.schedule(_EventHandler(events), folder, recursive=False)
+
+    def start(self):
+        self.observer.start()
+
+    def stop(self):
+        self.observer.stop()
+        self.observer.join()
+
+
+class _PollingBackend:
+    """Compare (mtime, size) stamps of every rate sheet at a fixed interval"""
+    name = 'polling'
+
+    def __init__(self, folders, events, interval):
+        self.folders = folders
+        self.events = events
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rate-sheet-poller', daemon=True)
+
+    def _scan(self):
+        stamps = {}
+        for folder in self.folders:
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.abspath(os.path.join(folder, name))
+                if not is_watched_document(path):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _run(self):
+        previous = self._scan()
+        while not self._stop.wait(self.interval):
+            current = self._scan()
+            for path in previous.keys() | current.keys():
+                if previous.get(path) != current.get(path):
+                    self.events.put(path)
+            previous = current
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class DocumentWatcher:
+    """Report rate sheets that changed, once their writes have settled
+
+        with DocumentWatcher(folders) as watcher:
+            for paths in watcher.batches():
+                ...
+
+    Each batch lists the absolute paths that were created, modified,
+    replaced or deleted and then left alone for debounce seconds.
+    """
+
+    def __init__(self, folders, debounce=0.5, poll_interval=0.5, polling=False):
+        self.folders = [os.path.abspath(folder) for folder in folders if os.path.isdir(folder)]
+        self.debounce = debounce
+        self._events = queue.Queue()
+        self._pending = {}  # path -> time of its last event
+        if polling or Observer is None:
+            self.backend = _PollingBackend(self.folders, self._events, poll_interval)
+        else:
+            self.backend = _WatchdogBackend(self.folders, self._events)
+
+    def __enter__(self):
+        self.backend.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.backend.stop()
+        return False
+
+    def retry(self, paths, delay):
+        """Report paths again once delay seconds pass without another event for them
+
+        For paths whose handling failed, such as a sheet Word still holds
+        open; an event for one of them in the meantime restarts its debounce.
+        """
+        due = time.monotonic() + delay - self.debounce
+        for path in paths:
+            self._pending[path] = due
+
+    def batches(self):
+        """Yield lists of settled paths, forever"""
+        pending = self._pending
+        while True:
+            if pending:
+                wait = max(0.0, min(pending.values()) + self.debounce - time.monotonic())
+            else:
+                wait = 1.0  # wake up regularly so Ctrl+C is handled on Windows
+            try:
+                pending[self._events.get(timeout=wait)] = time.monotonic()
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            settled = sorted(path for path, last in pending.items() if now - last >= self.debounce)
+            for path in settled:
+                del pending[path]
+            if settled:
+                yield settled
@@ -0,0 +1,75 @@
+"""Look up hotels and the packages offering them, or rename a hotel everywhere
+
+    python scripts/hotel-catalogue.py                        # hotels per city
+    python scripts/hotel-catalogue.py --city Istanbul --class fourstar
+    python scripts/hotel-catalogue.py --hotel "hera"         # packages offering matching hotels
+    python scripts/hotel-catalogue.py --rename istanbul-hera-montagna "Hera Palace"
+
+Uses the hotel catalogue written next to the package list (see
+extraction.hotels); when there is none yet it is built from the packages
+first. --rename rewrites the package list and its catalogue.
+"""
+import os
+import sys
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.hotels import HotelCatalogue, hotel_catalogue_path, write_hotel_catalogue
+from extraction.output import format_of, packages_path, read_packages, write_packages
+from extraction.pricing import HOTEL_CLASSES
+
+
+def print_hotels(catalogue, ids):
+    for key in ids:
+        hotel = catalogue.hotel(key)
+        classes = ', '.join(hotel['classes'])
+        print(f"  {key:<45} {hotel['name']} ({hotel['city']}; {classes}; "
+              f"{len(catalogue.packages_using(key))} packages)")
+
+
+def main():
+    """Load the hotel catalogue and answer one lookup"""
+    parser = argparse.ArgumentParser(description='Hotel catalogue lookups')
+    parser.add_argument('--data', default=packages_path('2026-packages'))
+    parser.add_argument('--city', help='list the hotels of a city')
+    parser.add_argument('--class', dest='hotel_class', choices=HOTEL_CLASSES, help='only hotels of this class')
+    parser.add_argument('--hotel', help='list the packages offering hotels whose name contains this')
+    parser.add_argument('--rename', nargs=2, metavar=('HOTEL_ID', 'NAME'),
+                        help='rename a hotel in every package that offers it')
+    args = parser.parse_args()
+
+    catalogue_path = hotel_catalogue_path(args.data)
+    packages = None
+    if not os.path.exists(catalogue_path):
+        packages = read_packages(args.data)
+        write_hotel_catalogue(packages, catalogue_path)
+        print(f"Built {catalogue_path}")
+    catalogue = HotelCatalogue.load(catalogue_path)
+
+    if args.rename:
+        key, name = args.rename
+        if key not in catalogue.hotels:
+            parser.error(f"unknown hotel id: {key}")
+        packages = packages if packages is not None else read_packages(args.data)
+        changed = catalogue.replace_hotel(packages, key, name)
+        base = os.path.basename(args.data).split('.')[0]
+        write_packages(packages, base, format_of(args.data), os.path.dirname(args.data))
+        write_hotel_catalogue(packages, catalogue_path)
+        print(f"Renamed {catalogue.hotel(key)['name']} to {name} in {len(changed)} packages: {', '.join(changed)}")
+    elif args.hotel:
+        ids = catalogue.find(args.hotel)
+        for key in ids:
+            hotel = catalogue.hotel(key)
+            print(f"{hotel['name']} ({hotel['city']}): {', '.join(catalogue.packages_using(key))}")
+        if not ids:
+            print('No matching hotels')
+    elif args.city:
+        print_hotels(catalogue, catalogue.in_city(args.city, args.hotel_class))
+    else:
+        print(f"{len(catalogue)} hotels")
+        for city, count in catalogue.cities().items():
+            print(f"  {city:<20} {count:>3}")
+
+
+if __name__ == '__main__':
+    main()
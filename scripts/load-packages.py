@@ -0,0 +1,76 @@
+"""Load the extracted packages into the website database in a few bulk statements
+
+The Python counterpart of seed-2026-packages.ts (see extraction.database):
+
+    python scripts/load-packages.py                  # everything, into $DATABASE_URL
+    python scripts/load-packages.py --changes        # only what the last extraction changed
+    python scripts/load-packages.py --database-url sqlite:///data/packages.db --create-schema
+
+Reads 2026-packages in whichever format the extractors last wrote it.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.database import (
+    DEFAULT_BATCH_SIZE, ConnectionPool, changed_packages, create_schema, load_packages,
+)
+from extraction.merge import changeset_path
+from extraction.output import find_packages, iter_packages
+
+
+def main():
+    """Upsert the packages (or only the changed ones) and deactivate removed ones"""
+    parser = argparse.ArgumentParser(description='Bulk load extracted packages into the database')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help='mysql://... or sqlite:///path (default: $DATABASE_URL)')
+    parser.add_argument('--data', help='package list to load (default: data/2026-packages in any format)')
+    parser.add_argument('--changes', action='store_true',
+                        help='load only the packages the last extraction added or modified, '
+                             'and deactivate the ones it removed')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'packages per INSERT statement (default {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--create-schema', action='store_true',
+                        help='create the Package table first (SQLite stand-in databases only)')
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error('no database: pass --database-url or set DATABASE_URL')
+    data_path = args.data or find_packages('2026-packages')
+    if not data_path or not os.path.exists(data_path):
+        print('Error: 2026-packages not found! Run an extraction script first.')
+        return 1
+
+    pool = ConnectionPool(args.database_url, size=1)
+    if args.create_schema:
+        if pool.dialect != 'sqlite':
+            parser.error('--create-schema is for SQLite; the MySQL schema comes from the Prisma migrations')
+        with pool.connection() as conn:
+            create_schema(conn)
+
+    packages = iter_packages(data_path)
+    removed = []
+    if args.changes:
+        with open(changeset_path(data_path), 'r', encoding='utf-8') as f:
+            changeset = json.load(f)
+        packages = changed_packages(packages, changeset)
+        removed = changeset['removed']
+        print(f"Skipping {changeset['unchanged']} unchanged packages")
+
+    start = time.perf_counter()
+    try:
+        stats = load_packages(pool, packages, removed, args.batch_size)
+    finally:
+        pool.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Upserted {stats['upserted']} packages and deactivated {stats['deactivated']} "
+          f"from {os.path.basename(data_path)} in {stats['statements']} statements ({elapsed * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""Quote a group against every package in the catalogue
+
+    python scripts/quote-packages.py --adults 2 --singles 0 --child-ages 4 9 --hotel fourstar
+    python scripts/quote-packages.py --layout sharded --adults 4
+
+Reads data/2026-packages in whichever output format was written last, or the
+shards of data/packages with --layout sharded.
+"""
+import os
+import sys
+import time
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.output import SHARD_DIR, find_packages, load_package_shards, read_packages
+from extraction.pricing import HOTEL_CLASSES, PriceCatalog
+
+
+def main():
+    """Build the price catalogue and print the cheapest packages for a group"""
+    parser = argparse.ArgumentParser(description='Quote a group against every package')
+    parser.add_argument('--data', help='package list to quote (default: data/2026-packages in any format)')
+    parser.add_argument('--layout', choices=['single', 'sharded'], default='single',
+                        help='sharded: quote the shards of data/packages instead of a package list')
+    parser.add_argument('--adults', type=int, default=2)
+    parser.add_argument('--singles', type=int, default=0, help='adults in single rooms')
+    parser.add_argument('--child-ages', type=int, nargs='*', default=[])
+    parser.add_argument('--hotel', choices=HOTEL_CLASSES, default='threestar')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.layout == 'sharded':
+        packages = load_package_shards(SHARD_DIR)
+    else:
+        data_path = args.data or find_packages('2026-packages')
+        if not data_path or not os.path.exists(data_path):
+            print('Error: 2026-packages not found! Run an extraction script first.')
+            return 1
+        packages = read_packages(data_path)
+
+    catalog = PriceCatalog(packages)
+    titles = {pkg['packageId']: pkg['title'] for pkg in packages}
+
+    start = time.perf_counter()
+    results = catalog.cheapest(args.adults, args.singles, args.child_ages, args.hotel, args.limit)
+    elapsed = time.perf_counter() - start
+
+    print(f"Quoted {len(catalog)} packages in {elapsed * 1000:.3f} ms\n")
+    for package_id, total in results:
+        print(f"  {package_id:<12} {total:>9.0f}  {titles.get(package_id, '')}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Search the package itineraries in English, Spanish or Turkish
+
+    python scripts/search-packages.py "hot air balloon cappadocia"
+    python scripts/search-packages.py "crucero por el Bósforo" --limit 5
+
+Uses the search index written next to the package list; when there is none
+yet it is built from the packages first.
+"""
+import os
+import sys
+import time
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.output import packages_path, read_packages
+from extraction.search import SearchIndex, search_index_path, write_search_index
+
+
+def main():
+    """Load the search index and print the best matching packages for a query"""
+    parser = argparse.ArgumentParser(description='Search package itineraries')
+    parser.add_argument('query')
+    parser.add_argument('--data', default=packages_path('2026-packages'))
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    packages = read_packages(args.data)
+    index_path = search_index_path(args.data)
+    if not os.path.exists(index_path):
+        write_search_index(packages, index_path)
+        print(f"Built {index_path}")
+    titles = {pkg['packageId']: pkg['title'] for pkg in packages}
+
+    start = time.perf_counter()
+    index = SearchIndex.load(index_path)
+    loaded = time.perf_counter()
+    results = index.search(args.query, args.limit)
+    elapsed = time.perf_counter() - loaded
+
+    print(f"Loaded the index in {(loaded - start) * 1000:.1f} ms, searched in {elapsed * 1000:.3f} ms\n")
+    for package_id, score in results:
+        print(f"  {package_id:<12} {score:>7.2f}  {titles.get(package_id, '')}")
+    if not results:
+        print('  No matches')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import { PrismaClient } from '@prisma/client';
 import * as fs from 'fs';
 import * as path from 'path';
+import * as zlib from 'zlib';
 import { fileURLToPath } from 'url';
 
 const __filename = fileURLToPath(import.meta.url);
@@ -65,18 +66,254 @@ interface PackageData {
   notIncludedEs?: string[];
 }
 
-async function seedPackages() {
-  // Read the extracted JSON data
-  const dataPath = path.join(__dirname, '..', 'data', '2026-packages.json');
+interface ManifestEntry {
+  id: string;
+  slug: string;
+  region: string;
+  duration: string;
+  destinations: string;
+  minPrice: number | null;
+  hash: string;
+  file: string;
+}
+
+// Load packages from the per-package shards (extract scripts run with --layout sharded).
+// Pass --region=Europe to load only one region's shards.
+function loadShardedPackages(): PackageData[] {
+  const shardDir = path.join(__dirname, '..', 'data', 'packages');
+  const manifestPath = path.join(shardDir, 'manifest.json');
+
+  if (!fs.existsSync(manifestPath)) {
+    console.error('Error: data/packages/manifest.json not found!');
+    console.log('Please run the Python extraction script with sharded output first:');
+    console.log('  python scripts/extract-packages-from-word.py --layout sharded');
+    process.exit(1);
+  }
+
+  const regionArg = process.argv.find(arg => arg.startsWith('--region='));
+  const region = regionArg ? regionArg.split('=')[1] : null;
+
+  const manifest: { packages: ManifestEntry[] } = JSON.parse(fs.readFileSync(manifestPath, 'utf-8'));
+  return manifest.packages
+    .filter(entry => !region || entry.region === region)
+    .map(entry => JSON.parse(fs.readFileSync(path.join(shardDir, entry.file), 'utf-8')));
+}
+
+interface ItineraryDay {
+  day: number;
+  title: string;
+  description: string;
+  meals: string;
+}
+
+interface PackageTables {
+  version: number;
+  fields: string[];
+  strings: string[];
+  lists: number[][];
+  // Version 2: itineraries stored once per route, with per-variant day overrides
+  itineraryFields?: string[];
+  itineraries?: ItineraryDay[][];
+  packages: Record<string, any>[];
+}
 
-  if (!fs.existsSync(dataPath)) {
+interface ItineraryRef {
+  base: number;
+  days?: { [index: string]: Partial<ItineraryDay> };
+}
+
+// Rebuild a variant's itinerary from its route's canonical days and its overrides.
+function expandItinerary(ref: ItineraryRef, tables: PackageTables): ItineraryDay[] {
+  return tables.itineraries![ref.base].map((day, index) => ({ ...day, ...(ref.days?.[String(index)] ?? {}) }));
+}
+
+// Turn a list field that holds a table id into a getter that expands the list
+// the first time it is read, then replaces itself with the plain array.
+function defineTabledField(holder: Record<string, any>, key: string, tables: PackageTables) {
+  const listId = holder[key];
+  if (typeof listId !== 'number') return;
+  Object.defineProperty(holder, key, {
+    enumerable: true,
+    configurable: true,
+    get() {
+      const value = tables.lists[listId].map(id => tables.strings[id]);
+      Object.defineProperty(holder, key, { value, enumerable: true, writable: true, configurable: true });
+      return value;
+    },
+  });
+}
+
+// Load the deduplicated tables output (extract scripts run with --format tables).
+// Repeated string lists and route itineraries are stored once and only expanded
+// when a package reads them.
+function loadTabledPackages(tablesPath = path.join(__dirname, '..', 'data', '2026-packages.tables.json')): PackageData[] {
+  if (!fs.existsSync(tablesPath)) {
+    console.error('Error: 2026-packages.tables.json not found!');
+    console.log('Please run the Python extraction script with the tables format first:');
+    console.log('  python scripts/extract-packages-from-word.py --format tables');
+    process.exit(1);
+  }
+
+  const tables: PackageTables = JSON.parse(fs.readFileSync(tablesPath, 'utf-8'));
+  if (tables.version !== 1 && tables.version !== 2) {
+    console.error(`Error: unsupported tables version ${tables.version}`);
+    process.exit(1);
+  }
+
+  return tables.packages.map(record => {
+    const pkg: Record<string, any> = { ...record };
+    for (const field of tables.fields) {
+      const [parent, key] = field.includes('.') ? field.split('.') : [null, field];
+      if (parent === null) {
+        defineTabledField(pkg, key, tables);
+      } else if (pkg[parent] && typeof pkg[parent] === 'object') {
+        pkg[parent] = { ...pkg[parent] };
+        defineTabledField(pkg[parent], key, tables);
+      }
+    }
+    for (const field of tables.itineraryFields ?? []) {
+      const ref = pkg[field];
+      if (ref && typeof ref === 'object' && !Array.isArray(ref)) {
+        Object.defineProperty(pkg, field, {
+          enumerable: true,
+          configurable: true,
+          get() {
+            const value = expandItinerary(ref, tables);
+            Object.defineProperty(pkg, field, { value, enumerable: true, writable: true, configurable: true });
+            return value;
+          },
+        });
+      }
+    }
+    return pkg as PackageData;
+  });
+}
+
+// Load the NDJSON output (extract scripts run with --format ndjson): one package per line.
+// A last line without a newline was cut off by an interrupted run and is skipped.
+function loadNdjsonPackages(ndjsonPath = path.join(__dirname, '..', 'data', '2026-packages.ndjson')): PackageData[] {
+  if (!fs.existsSync(ndjsonPath)) {
+    console.error('Error: 2026-packages.ndjson not found!');
+    console.log('Please run the Python extraction script with the ndjson format first:');
+    console.log('  python scripts/extract-packages-from-word.py --format ndjson');
+    process.exit(1);
+  }
+
+  const lines = fs.readFileSync(ndjsonPath, 'utf-8').split('\n');
+  lines.pop(); // empty after the final newline, or an incomplete line
+  return lines.filter(line => line.trim()).map(line => JSON.parse(line));
+}
+
+// Every file name the extraction scripts write 2026-packages under (see FORMATS in
+// scripts/extraction/output.py). 'min' output is plain 2026-packages.json.
+const PACKAGE_FILES = [
+  '2026-packages.json',
+  '2026-packages.json.gz',
+  '2026-packages.msgpack',
+  '2026-packages.tables.json',
+  '2026-packages.ndjson',
+];
+
+// The most recently written package list, like find_packages in extraction/output.py,
+// so a run with another --format is never shadowed by an older 2026-packages.json.
+// 2026-packages.json wins ties. Returns null when none exists.
+function findNewestPackages(): string | null {
+  const dataDir = path.join(__dirname, '..', 'data');
+  let newest: string | null = null;
+  let newestTime = -Infinity;
+  for (const name of PACKAGE_FILES) {
+    const filePath = path.join(dataDir, name);
+    if (!fs.existsSync(filePath)) continue;
+    const modified = fs.statSync(filePath).mtimeMs;
+    if (modified > newestTime) {
+      newest = filePath;
+      newestTime = modified;
+    }
+  }
+  return newest;
+}
+
+// Load whichever package list the last extraction wrote, by its file name.
+function loadNewestPackages(): PackageData[] {
+  const dataPath = findNewestPackages();
+
+  if (!dataPath) {
     console.error('Error: 2026-packages.json not found!');
     console.log('Please run the Python extraction script first:');
     console.log('  python scripts/extract-packages-from-word.py');
     process.exit(1);
   }
 
-  const packages: PackageData[] = JSON.parse(fs.readFileSync(dataPath, 'utf-8'));
+  console.log(`Reading ${path.basename(dataPath)}`);
+  if (dataPath.endsWith('.tables.json')) {
+    return loadTabledPackages(dataPath);
+  }
+  if (dataPath.endsWith('.ndjson')) {
+    return loadNdjsonPackages(dataPath);
+  }
+  if (dataPath.endsWith('.json.gz')) {
+    return JSON.parse(zlib.gunzipSync(fs.readFileSync(dataPath)).toString('utf-8'));
+  }
+  if (dataPath.endsWith('.msgpack')) {
+    // No MessagePack decoder here; refuse rather than seed an older JSON file
+    console.error('Error: the newest package list is 2026-packages.msgpack, which the seeder cannot read.');
+    console.log('Load it with python scripts/load-packages.py, or re-run the extraction with --format json.');
+    process.exit(1);
+  }
+  return JSON.parse(fs.readFileSync(dataPath, 'utf-8'));
+}
+
+interface Changeset {
+  added: string[];
+  modified: { packageId: string; changes: { field: string; old: unknown; new: unknown }[] }[];
+  removed: string[];
+  unchanged: number;
+  // Routes (variants sharing an itinerary) whose itinerary was added or changed
+  routes?: { packages: string[]; changed: string[] }[];
+}
+
+// Read the changeset the extraction scripts write next to 2026-packages.json.
+function loadChangeset(): Changeset {
+  const changesPath = path.join(__dirname, '..', 'data', '2026-packages.changes.json');
+
+  if (!fs.existsSync(changesPath)) {
+    console.error('Error: 2026-packages.changes.json not found!');
+    console.log('Run an extraction script first, or seed everything without --changes.');
+    process.exit(1);
+  }
+
+  return JSON.parse(fs.readFileSync(changesPath, 'utf-8'));
+}
+
+async function seedPackages() {
+  let packages: PackageData[];
+
+  if (process.argv.includes('--sharded')) {
+    packages = loadShardedPackages();
+  } else if (process.argv.includes('--tables')) {
+    packages = loadTabledPackages();
+  } else if (process.argv.includes('--ndjson')) {
+    packages = loadNdjsonPackages();
+  } else {
+    packages = loadNewestPackages();
+  }
+
+  // With --changes only the packages the last extraction added or modified are written,
+  // and the ones it removed are deactivated.
+  if (process.argv.includes('--changes')) {
+    const changeset = loadChangeset();
+    const changed = new Set([...changeset.added, ...changeset.modified.map(m => m.packageId)]);
+    packages = packages.filter(pkg => changed.has(pkg.packageId));
+
+    if (changeset.removed.length > 0) {
+      const result = await prisma.package.updateMany({
+        where: { packageId: { in: changeset.removed } },
+        data: { isActive: false, updatedAt: new Date() }
+      });
+      console.log(`Deactivated ${result.count} removed packages`);
+    }
+    console.log(`Skipping ${changeset.unchanged} unchanged packages`);
+  }
 
   console.log(`Found ${packages.length} packages to import\n`);
 
@@ -0,0 +1,225 @@
+"""Resident extraction service for previewing rate sheets from the admin panel
+
+Keeps a pool of warm worker processes (extractors imported, translation
+matchers compiled) and answers over local HTTP or a Unix socket:
+
+    GET  /health     pool size, capacity and counters
+    POST /extract    extract one rate sheet and return its package JSON
+
+POST /extract takes either the .docx itself as the request body
+(Content-Type application/vnd.openxmlformats-officedocument.wordprocessingml.document
+or application/octet-stream) or a JSON body {"path": "..."} naming a file
+under one of the source roots. Query parameters (or JSON fields) select the
+extractor: kind=turkey|europe, packageType=WITH_HOTEL|LAND_ONLY,
+tourType=SIC|PRIVATE, filename=<name used for the packageId>.
+
+When every worker is busy and the queue is full the service answers 503
+with Retry-After instead of queueing without bound.
+
+    python scripts/serve-extraction.py --port 8765 --workers 4
+    python scripts/serve-extraction.py --socket /run/extraction.sock
+"""
+import os
+import sys
+import json
+import signal
+import socket
+import argparse
+import socketserver
+import zipfile
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.scripts import load_script
+from extraction.service import KINDS, ExtractionPool, PoolBusy
+
+JSON_TYPE = 'application/json'
+PACKAGE_TYPES = ('WITH_HOTEL', 'LAND_ONLY')
+TOUR_TYPES = ('SIC', 'PRIVATE')
+
+
+class RequestError(Exception):
+    """A request the service refuses, with the HTTP status to answer"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ExtractionHandler(BaseHTTPRequestHandler):
+    """HTTP front end of the extraction pool (configured through the server attributes)"""
+    server_version = 'PackageExtraction/1'
+
+    def address_string(self):
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{JSON_TYPE}; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlsplit(self.path).path != '/health':
+            self.send_json(404, {'error': 'not found'})
+            return
+        self.send_json(200, {'status': 'ok', **self.server.pool.stats()})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/extract':
+            self.send_json(404, {'error': 'not found'})
+            return
+        try:
+            options, source = self.read_request()
+            future = self.server.pool.submit(options['kind'], source, options['filename'],
+                                             options['packageType'], options['tourType'])
+        except RequestError as e:
+            self.send_json(e.status, {'error': str(e)})
+            return
+        except PoolBusy as e:
+            self.send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+
+        try:
+            pkg_data, seconds = future.result(timeout=self.server.timeout_seconds)
+        except FutureTimeout:
+            self.send_json(504, {'error': f"extraction took longer than {self.server.timeout_seconds}s"})
+            return
+        except zipfile.BadZipFile:
+            self.send_json(422, {'error': 'not a .docx file'})
+            return
+        except Exception as e:
+            self.send_json(422, {'error': f"extraction failed: {e}"})
+            return
+        self.send_json(200, pkg_data, {'X-Extraction-Ms': f"{seconds * 1000:.1f}"})
+
+    def read_request(self):
+        """Options and document source (path or bytes) of an /extract request"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise RequestError(411, 'a request body with Content-Length is required')
+        if length > self.server.max_upload:
+            raise RequestError(413, f"uploads are limited to {self.server.max_upload // (1024 * 1024)} MB")
+        body = self.rfile.read(length)
+
+        query = {key: values[-1] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip()
+        if content_type == JSON_TYPE:
+            try:
+                fields = json.loads(body)
+            except ValueError:
+                raise RequestError(400, 'invalid JSON body')
+            if not isinstance(fields, dict) or not isinstance(fields.get('path'), str):
+                raise RequestError(400, 'a JSON body needs a "path"')
+            query.update({key: value for key, value in fields.items() if isinstance(value, str)})
+            source = self.resolve_path(fields['path'])
+            default_filename = os.path.basename(source)
+        else:
+            source = body
+            default_filename = 'upload.docx'
+
+        options = {
+            'kind': query.get('kind', 'turkey'),
+            'packageType': query.get('packageType', 'WITH_HOTEL'),
+            'tourType': query.get('tourType', 'SIC'),
+            'filename': os.path.basename(query.get('filename') or default_filename),
+        }
+        if options['kind'] not in KINDS:
+            raise RequestError(400, f"kind must be one of {', '.join(KINDS)}")
+        if options['packageType'] not in PACKAGE_TYPES:
+            raise RequestError(400, f"packageType must be one of {', '.join(PACKAGE_TYPES)}")
+        if options['tourType'] not in TOUR_TYPES:
+            raise RequestError(400, f"tourType must be one of {', '.join(TOUR_TYPES)}")
+        return options, source
+
+    def resolve_path(self, path):
+        """Absolute path of a requested document, which must lie under a source root"""
+        real = os.path.realpath(path)
+        if not any(os.path.commonpath([real, root]) == root for root in self.server.source_roots):
+            raise RequestError(403, 'path is outside the configured source folders')
+        if not os.path.isfile(real):
+            raise RequestError(404, 'no such file')
+        return real
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """ThreadingHTTPServer over a Unix domain socket"""
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def build_server(args, pool):
+    """HTTP server on a TCP port or a Unix socket, wired to the pool"""
+    if args.socket:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise SystemExit('Unix sockets are not available on this platform; use --port')
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = UnixHTTPServer(args.socket, ExtractionHandler)
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), ExtractionHandler)
+    server.pool = pool
+    server.timeout_seconds = args.timeout
+    server.max_upload = args.max_upload_mb * 1024 * 1024
+    server.source_roots = [os.path.realpath(root) for root in args.source_root]
+    return server
+
+
+def stop_on_sigterm(signum, frame):
+    """Let a service manager's SIGTERM shut down like Ctrl+C"""
+    raise KeyboardInterrupt
+
+
+def main():
+    """Start the pool and serve until interrupted"""
+    turkey = load_script('extract-packages-from-word.py')
+    europe = load_script('extract-europe-packages.py')
+
+    parser = argparse.ArgumentParser(description='Serve rate sheet extraction over HTTP')
+    parser.add_argument('--host', default='127.0.0.1', help='interface to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port (default 8765)')
+    parser.add_argument('--socket', help='listen on this Unix socket instead of a TCP port')
+    parser.add_argument('--workers', type=int, default=0, help='worker processes (0 = one per CPU core)')
+    parser.add_argument('--queue', type=int, default=None,
+                        help='requests allowed to wait for a worker (default: twice the workers)')
+    parser.add_argument('--timeout', type=float, default=30, help='seconds before a request gives up (default 30)')
+    parser.add_argument('--max-upload-mb', type=int, default=20, help='largest accepted upload (default 20 MB)')
+    parser.add_argument('--source-root', action='append', default=None,
+                        help='folder that {"path": ...} requests may read from (repeatable; '
+                             'default: the extractor source folders)')
+    args = parser.parse_args()
+    if args.source_root is None:
+        args.source_root = [turkey.BASE_PATH, europe.EUROPE_PATH]
+
+    pool = ExtractionPool(args.workers, args.queue)
+    pool.warm_up()
+    server = build_server(args, pool)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"Extraction service on {where} ({pool.workers} workers, {pool.capacity} slots)")
+    print('Press Ctrl+C to stop')
+    signal.signal(signal.SIGTERM, stop_on_sigterm)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('\nStopping')
+    finally:
+        server.server_close()
+        pool.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The extraction package is imported from scripts/, as the scripts themselves do
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
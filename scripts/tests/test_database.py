@@ -0,0 +1,89 @@
+import json
+import sqlite3
+
+from extraction.database import COLUMNS, ConnectionPool, create_schema, load_packages, max_batch_rows
+
+
+def make_package(package_id, **fields):
+    pkg = {
+        'packageId': package_id, 'title': f"{package_id} title", 'slug': package_id.lower(),
+        'duration': '3 Nights / 4 Days', 'description': 'A trip', 'destinations': 'Vienna',
+        'itinerary': [], 'highlights': [], 'included': [], 'notIncluded': [],
+        'pricing': {'paxTiers': {}}, 'image': '/images/packages/vienna-tour.jpg', 'region': 'Europe',
+    }
+    pkg.update(fields)
+    return pkg
+
+
+def open_pool(tmp_path):
+    pool = ConnectionPool(f"sqlite:///{tmp_path / 'packages.db'}", size=1)
+    with pool.connection() as conn:
+        create_schema(conn)
+    return pool
+
+
+def test_reload_keeps_spanish_fields_the_package_does_not_have(tmp_path):
+    pool = open_pool(tmp_path)
+    load_packages(pool, [make_package('EUR-PVT-01')])
+    with pool.connection() as conn:
+        conn.execute("UPDATE `Package` SET `titleEs` = 'Viena', `descriptionEs` = 'Un viaje', "
+                     "`hotels` = '{}' WHERE `packageId` = 'EUR-PVT-01'")
+        conn.commit()
+
+    load_packages(pool, [make_package('EUR-PVT-01', title='New title')])
+
+    with pool.connection() as conn:
+        row = conn.execute("SELECT `title`, `titleEs`, `descriptionEs`, `hotels` FROM `Package`").fetchone()
+    pool.close()
+    assert row == ('New title', 'Viena', 'Un viaje', '{}')
+
+
+def test_reload_overwrites_spanish_fields_the_package_has(tmp_path):
+    pool = open_pool(tmp_path)
+    load_packages(pool, [make_package('SIC-01', titleEs='Viejo', itineraryEs=[])])
+    load_packages(pool, [make_package('SIC-01', titleEs='Nuevo', itineraryEs=[{'day': 1}])])
+
+    with pool.connection() as conn:
+        title, itinerary = conn.execute("SELECT `titleEs`, `itineraryEs` FROM `Package`").fetchone()
+    pool.close()
+    assert title == 'Nuevo'
+    assert json.loads(itinerary) == [{'day': 1}]
+
+
+def test_package_updates_the_row_of_its_package_id_before_a_slug_match(tmp_path):
+    pool = open_pool(tmp_path)
+    load_packages(pool, [make_package('SIC-01', slug='istanbul'), make_package('SIC-02', slug='istanbul-tour')])
+
+    # SIC-01 now carries the slug SIC-02's row holds
+    load_packages(pool, [make_package('SIC-01', slug='istanbul-tour', title='Istanbul')])
+
+    with pool.connection() as conn:
+        rows = conn.execute("SELECT `packageId`, `slug`, `title` FROM `Package` ORDER BY `packageId`").fetchall()
+    pool.close()
+    assert rows == [('SIC-01', 'istanbul', 'Istanbul'), ('SIC-02', 'istanbul-tour', 'SIC-02 title')]
+
+
+def test_package_matched_by_slug_keeps_the_row_keys(tmp_path):
+    pool = open_pool(tmp_path)
+    load_packages(pool, [make_package('SIC-01', slug='istanbul')])
+    load_packages(pool, [make_package('PVT-01', slug='istanbul', title='Istanbul')])
+
+    with pool.connection() as conn:
+        rows = conn.execute("SELECT `packageId`, `slug`, `title` FROM `Package`").fetchall()
+    pool.close()
+    assert rows == [('SIC-01', 'istanbul', 'Istanbul')]
+
+
+def test_batches_fit_the_sqlite_parameter_limit(tmp_path):
+    pool = open_pool(tmp_path)
+    with pool.connection() as conn:
+        conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        assert max_batch_rows(conn, 'sqlite', 200) * len(COLUMNS) <= 999
+
+    stats = load_packages(pool, [make_package(f"SIC-{n:03}") for n in range(100)], batch_size=200)
+
+    with pool.connection() as conn:
+        count, = conn.execute("SELECT COUNT(*) FROM `Package`").fetchone()
+    pool.close()
+    assert count == 100
+    assert stats['statements'] == -(-100 // (999 // len(COLUMNS)))
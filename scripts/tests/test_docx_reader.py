@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from extraction.docx_reader import TableGrid, iter_docx_blocks, iter_python_docx_blocks
+from extraction.synthetic import build_europe_sheet, build_turkey_sheet
+
+docx = pytest.importorskip('docx')
+
+
+@pytest.mark.parametrize('build', [build_turkey_sheet, build_europe_sheet])
+@pytest.mark.parametrize('seed', range(3))
+def test_blocks_match_python_docx_on_synthetic_sheets(tmp_path, build, seed):
+    path = str(tmp_path / 'sheet.docx')
+    build(random.Random(seed), path)
+
+    blocks = list(iter_docx_blocks(path))
+
+    assert blocks == list(iter_python_docx_blocks(path))
+    assert [kind for kind, _ in blocks].count('table') == 2
+
+
+def test_merged_cells_and_runs_match_python_docx(tmp_path):
+    doc = docx.Document()
+    paragraph = doc.add_paragraph('Day 1 – Istanbul ')
+    paragraph.add_run('Arrival').bold = True
+    paragraph.add_run('\t(B)')
+    table = doc.add_table(rows=3, cols=3)
+    table.cell(0, 0).text = 'City'
+    table.cell(1, 0).merge(table.cell(2, 0)).text = 'Istanbul'
+    table.cell(0, 1).merge(table.cell(0, 2)).text = '3* / 4*'
+    table.cell(1, 1).text = 'Hotel A'
+    doc.add_paragraph('')
+    path = str(tmp_path / 'merged.docx')
+    doc.save(path)
+
+    blocks = list(iter_docx_blocks(path))
+
+    assert blocks == list(iter_python_docx_blocks(path))
+    assert blocks[0] == ('paragraph', 'Day 1 – Istanbul Arrival\t(B)')
+    grid = blocks[1][1]
+    assert isinstance(grid, TableGrid)
+    assert [grid.cell(row, 0) for row in range(3)] == ['City', 'Istanbul', 'Istanbul']
+    assert grid.cell(0, 2) == '3* / 4*'
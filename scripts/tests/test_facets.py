@@ -0,0 +1,11 @@
+from extraction.facets import min_class_prices
+from extraction.output import min_price
+
+
+def test_facet_prices_agree_with_the_listing_price():
+    pkg = {'pricing': {'paxTiers': {
+        '2': {'threestar': {'double': 900}, 'fourstar': {'double': 0}},
+        '4': {'threestar': {'double': 700}, 'fourstar': {'double': 1100}, 'fivestar': {}},
+    }}}
+    assert min_class_prices(pkg) == {'threestar': 700, 'fourstar': 1100}
+    assert min_price(pkg) == min(min_class_prices(pkg).values())
@@ -0,0 +1,19 @@
+from extraction.gazetteer import PlaceMatcher
+
+PLACES = [
+    {'name': 'Istanbul', 'aliases': {'tr': ['İstanbul']}},
+    {'name': 'Kusadasi', 'aliases': {'tr': ['Kuşadası']}},
+]
+
+
+def test_turkish_dotted_and_dotless_i_match():
+    matcher = PlaceMatcher(PLACES)
+    assert matcher.find('İSTANBUL & Kuşadası') == ['Istanbul', 'Kusadasi']
+    assert matcher.find('ıstanbul') == ['Istanbul']
+
+
+def test_case_variants_outside_the_lookup_do_not_raise():
+    matcher = PlaceMatcher(PLACES)
+    # IGNORECASE matches the long s and the Kelvin sign to s and k
+    assert matcher.find('Kuſadasi', 'KUSADASI') == ['Kusadasi']
+    assert PlaceMatcher([{'name': 'Konya'}]).find('\u212aonya') == ['Konya']
@@ -0,0 +1,102 @@
+from extraction.docx_reader import TableGrid
+from extraction.layout import DocumentLayout
+from extraction.records import Package
+from extraction.scripts import load_script
+
+turkey = load_script('extract-packages-from-word.py')
+
+TURKEY_SHEET = [
+    ('paragraph', 'Istanbul & Cappadocia Package'),
+    ('paragraph', '3 Nights / 4 Days'),
+    ('paragraph', 'Day 1 – Istanbul – Arrival (-)'),
+    ('paragraph', 'Meet and greet at the airport.'),
+    ('paragraph', 'Transfer to your hotel.'),
+    ('paragraph', 'Day 2 – Istanbul – Old City Tour (B/L)'),
+    ('paragraph', 'Day trips are on private basis.'),
+    ('paragraph', 'Visit the Blue Mosque.'),
+    ('paragraph', 'Day 3 – Cappadocia – Fly to Cappadocia ()'),
+    ('paragraph', '*** End of the tour'),
+    ('paragraph', 'Inclusions'),
+    ('paragraph', '3 nights accommodation,'),
+    ('paragraph', 'Local Taxes.'),
+    ('paragraph', 'Exclusions'),
+    ('paragraph', 'Flights'),
+    ('paragraph', 'Information'),
+    ('paragraph', 'Hotel check-in time is 14:00.'),
+    ('paragraph', 'Hotel Options'),
+    ('table', TableGrid([['City', '3*', '4*', '5*'], ['Istanbul', 'Hotel A', 'Hotel B', '']])),
+    ('paragraph', 'Package Rates'),
+    ('table', TableGrid([
+        ['PAX', '3*', '4*', '5*'],
+        ['2 PAX', '1,200 USD', '1,400', '1,900'],
+        ['10 PAX', '900', '1,100', '1,500'],
+        ['SINGLE SUPPLEMENT', '300', '400', '600'],
+        ['CHILD 0-6', '0', '0', '0'],
+        ['CHILD 6-12', '450', '500', '700'],
+    ])),
+]
+
+
+def parse(blocks):
+    """The package JSON shape of blocks parsed with the Turkey extractor's layout"""
+    package = Package()
+    turkey._layout.parse(package, blocks, turkey.parse_package_table)
+    return package.to_dict()
+
+
+def test_days_meals_and_sections():
+    pkg = parse(TURKEY_SHEET)
+
+    assert pkg['title'] == 'Istanbul & Cappadocia Package'
+    assert pkg['duration'] == '3 Nights / 4 Days'
+    assert [(day['day'], day['title'], day['meals']) for day in pkg['itinerary']] == [
+        (1, 'Istanbul – Arrival', '-'),
+        (2, 'Istanbul – Old City Tour', 'B/L'),
+        (3, 'Cappadocia – Fly to Cappadocia', '-'),
+    ]
+    # A line starting 'Day ' that is no header is neither a day nor day text
+    assert pkg['itinerary'][1]['description'] == 'Visit the Blue Mosque.'
+    assert pkg['itinerary'][0]['description'] == 'Meet and greet at the airport. Transfer to your hotel.'
+    assert pkg['included'] == ['3 nights accommodation', 'Local Taxes']
+    assert pkg['notIncluded'] == ['Flights']
+    assert pkg['information'] == ['Hotel check-in time is 14:00.']
+
+
+def test_hotel_and_pricing_tables():
+    pkg = parse(TURKEY_SHEET)
+
+    assert pkg['hotels'] == {'threestar': ['Istanbul: Hotel A'], 'fourstar': ['Istanbul: Hotel B'], 'fivestar': []}
+    tiers = pkg['pricing']['paxTiers']
+    assert set(tiers) == {'2', '10'}
+    assert tiers['2']['threestar'] == {'double': 1200, 'singleSupplement': 300}
+    assert tiers['10']['fivestar'] == {'double': 1500, 'singleSupplement': 600}
+    assert pkg['pricing']['childRates']['age6to12'] == {'threestar': 450, 'fourstar': 500, 'fivestar': 700}
+
+
+def test_rules_drive_the_parse():
+    layout = DocumentLayout({
+        'title': lambda text: text.isupper(),
+        'duration': {'words': ('gece',), 'pattern': r'^\d+ gece'},
+        'day_headers': [r'^(\d+)\. Gün\s*[-–]\s*(.+?)\s*\(([^)]*)\)'],
+        'day_breaks': ('dahil',),
+        'sections': {'included': ('dahil',)},
+        'collect': {'included': {'field': 'included'}},
+    })
+    package = Package()
+    tables = []
+    layout.parse(package, [
+        ('paragraph', 'Tour name'),
+        ('paragraph', 'VIENNA'),
+        ('paragraph', '3 Gece / 4 Gün'),
+        ('paragraph', '1. Gün - Vienna (K)'),
+        ('paragraph', 'Arrival.'),
+        ('table', TableGrid([['x']])),
+        ('paragraph', 'Dahil'),
+        ('paragraph', 'Transfers'),
+    ], lambda pkg, grid: tables.append(grid))
+
+    assert (package.title, package.duration) == ('VIENNA', '3 Gece / 4 Gün')
+    assert [(day.day, day.title, day.meals, day.description) for day in package.itinerary] == [
+        (1, 'Vienna', 'K', 'Arrival.')]
+    assert package.included == ['Transfers']
+    assert tables == [TableGrid([['x']])]
@@ -0,0 +1,42 @@
+from extraction.merge import combine_changesets, merge_packages
+
+
+def owns_all(package_id):
+    return True
+
+
+def patch(existing, pkg=None, package_id=None):
+    """merge_packages as the watcher calls it for one package"""
+    package_id = package_id or pkg['packageId']
+    return merge_packages(existing, [pkg] if pkg else [], lambda pid: pid == package_id)
+
+
+def test_patches_accumulate_into_the_changeset():
+    packages = [{'packageId': 'SIC-01', 'title': 'a'}, {'packageId': 'SIC-02', 'title': 'b'}]
+    packages, changeset = merge_packages(packages, packages, owns_all)
+
+    packages, first = patch(packages, {'packageId': 'SIC-01', 'title': 'a2'})
+    changeset = combine_changesets(changeset, first)
+    packages, second = patch(packages, {'packageId': 'SIC-03', 'title': 'c'})
+    changeset = combine_changesets(changeset, second)
+    packages, third = patch(packages, package_id='SIC-02')
+    changeset = combine_changesets(changeset, third)
+
+    assert changeset['added'] == ['SIC-03']
+    assert changeset['modified'] == [
+        {'packageId': 'SIC-01', 'changes': [{'field': 'title', 'old': 'a', 'new': 'a2'}]}]
+    assert changeset['removed'] == ['SIC-02']
+    assert changeset['unchanged'] == 0
+
+
+def test_edits_fold_per_package():
+    changeset = {'version': 1, 'added': ['SIC-05'], 'unchanged': 1, 'removed': [],
+                 'modified': [{'packageId': 'SIC-01', 'changes': [{'field': 'title', 'old': 'a', 'new': 'b'}]}]}
+    later = {'version': 1, 'added': [], 'removed': ['SIC-05'], 'unchanged': 0,
+             'modified': [{'packageId': 'SIC-01', 'changes': [{'field': 'title', 'old': 'b', 'new': 'a'}]}]}
+
+    combined = combine_changesets(changeset, later)
+
+    # SIC-05 was added and removed again; SIC-01 is back to its original title
+    assert (combined['added'], combined['modified'], combined['removed']) == ([], [], [])
+    assert combined['unchanged'] == 2
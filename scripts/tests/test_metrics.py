@@ -0,0 +1,27 @@
+from extraction import metrics
+from extraction.metrics import RunReport
+
+
+def test_main_process_stages_are_added_to_the_document():
+    report = RunReport('turkey')
+    report.add('/sheets/a.docx', 'ok', {'seconds': 1.0, 'stages': {'parse': 1.0}, 'counts': {'tables': 2}})
+    report.add('/sheets/b.docx', 'cached')
+
+    for path in ('/sheets/a.docx', '/sheets/b.docx'):
+        with metrics.recording_for(report, path):
+            with metrics.stage('translation'):
+                pass
+
+    parsed, cached = report.documents
+    assert set(parsed['stages']) == {'parse', 'translation'}
+    assert parsed['seconds'] == 1.0 + parsed['stages']['translation']
+    assert set(cached['stages']) == {'translation'}
+    assert 'seconds' not in cached
+    assert set(report.totals()[0]) == {'parse', 'translation'}
+
+
+def test_recording_for_without_a_report_records_nothing():
+    with metrics.recording_for(None, '/sheets/a.docx') as recorder:
+        with metrics.stage('translation'):
+            pass
+    assert recorder is None
@@ -0,0 +1,28 @@
+import os
+
+from extraction.output import find_packages, write_packages
+
+PACKAGES = [{'packageId': 'SIC-01', 'title': 'Istanbul'}]
+
+
+def test_find_packages_returns_the_newest_format(tmp_path):
+    data_dir = str(tmp_path)
+    json_path = write_packages(PACKAGES, '2026-packages', 'json', data_dir)
+    gzip_path = write_packages(PACKAGES, '2026-packages', 'gzip', data_dir)
+    os.utime(json_path, (1000, 1000))
+    os.utime(gzip_path, (2000, 2000))
+
+    assert find_packages('2026-packages', 'json', data_dir) == gzip_path
+    assert find_packages('2026-packages', 'ndjson', data_dir) == gzip_path
+
+
+def test_find_packages_prefers_the_given_format_on_ties(tmp_path):
+    data_dir = str(tmp_path)
+    json_path = write_packages(PACKAGES, '2026-packages', 'json', data_dir)
+    gzip_path = write_packages(PACKAGES, '2026-packages', 'gzip', data_dir)
+    for path in (json_path, gzip_path):
+        os.utime(path, (1000, 1000))
+
+    assert find_packages('2026-packages', 'gzip', data_dir) == gzip_path
+    assert find_packages('2026-packages', 'json', data_dir) == json_path
+    assert find_packages('2026-europe', 'json', data_dir) is None
@@ -0,0 +1,60 @@
+from extraction.pricing import PriceCatalog, price_matrix_json
+
+
+def package(package_id, tiers):
+    """A package whose pax tiers give {tier: double rate} for every hotel class"""
+    return {
+        'packageId': package_id,
+        'pricing': {'paxTiers': {
+            str(tier): {hotel_class: {'double': double, 'singleSupplement': 100}
+                        for hotel_class in ('threestar', 'fourstar', 'fivestar')}
+            for tier, double in tiers.items()
+        }},
+    }
+
+
+def quotes(catalog, adults, hotel_class='threestar'):
+    """Quotes of the pure-Python path, and of the NumPy path when it is installed"""
+    catalog_quotes = catalog.quote(adults, hotel_class=hotel_class)
+    python_quotes = catalog._quote_python(adults, (adults, 0, 0, 0), 0)
+    assert catalog_quotes == python_quotes
+    return python_quotes
+
+
+def test_quotes_pick_the_tier_that_fits():
+    catalog = PriceCatalog([package('SIC-01', {2: 900, 4: 700}), package('SIC-02', {6: 500})])
+    assert quotes(catalog, 2) == [1800, 1000]
+    assert quotes(catalog, 3) == [2100, 1500]
+    assert quotes(catalog, 8) == [5600, 4000]
+
+
+def test_empty_and_tierless_catalogues_quote_nothing():
+    assert quotes(PriceCatalog([]), 2) == []
+    tierless = PriceCatalog([{'packageId': 'SIC-01', 'pricing': {}}, {'packageId': 'SIC-02'}])
+    assert quotes(tierless, 2) == [None, None]
+    assert tierless.cheapest(2) == []
+
+
+def test_zero_double_rates_are_not_offered():
+    catalog = PriceCatalog([package('SIC-01', {2: 0, 4: 700}), package('SIC-02', {2: 0})])
+    assert quotes(catalog, 2) == [1400, None]
+    assert catalog.cheapest(2) == [('SIC-01', 1400)]
+
+
+def test_catalogue_reads_the_stored_price_matrix():
+    pkg = package('SIC-01', {2: 900, 4: 700})
+    pkg['priceMatrix'] = price_matrix_json(pkg['pricing'])
+    from_pricing = PriceCatalog([package('SIC-01', {2: 900, 4: 700})])
+    assert PriceCatalog([pkg]).values == from_pricing.values
+
+    # The stored matrix is what gets quoted, not the nested pricing
+    pkg['pricing'] = {}
+    assert quotes(PriceCatalog([pkg]), 3) == [2100]
+
+
+def test_single_rooms_pay_the_supplement_on_top_of_the_double_rate():
+    # Rate sheet: 900 per person in a double room, single supplement 100
+    catalog = PriceCatalog([package('SIC-01', {2: 900})])
+    assert catalog.quote(2, singles=0) == [1800]
+    assert catalog.quote(2, singles=1) == [1900]
+    assert catalog.quote(1, singles=1) == [1000]
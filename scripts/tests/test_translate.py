@@ -0,0 +1,40 @@
+from extraction.translate import MultiPhraseTranslator, PhraseTranslator
+
+
+def test_longest_phrase_wins():
+    translate = PhraseTranslator({'Istanbul': 'Estambul', 'Istanbul Airport': 'Aeropuerto de Estambul'})
+    assert translate('Arrival at Istanbul Airport') == 'Arrival at Aeropuerto de Estambul'
+    assert translate('Istanbul Airports') == 'Estambul Airports'
+
+
+def test_replaced_text_is_not_translated_again():
+    # Tour -> Tur must not chain on into Tur -> Turquía
+    translate = PhraseTranslator({'Tour': 'Tur', 'Tur': 'Turquía'})
+    assert translate('Tour') == 'Tur'
+    assert translate('Tur Tour') == 'Turquía Tur'
+
+
+def test_phrases_match_on_word_boundaries_only():
+    translate = PhraseTranslator({'bus': 'autobús', 'Day': 'Día'})
+    assert translate('Minibus and bus') == 'Minibus and autobús'
+    assert translate('Daytime Day, Sunday') == 'Daytime Día, Sunday'
+
+
+def test_phrases_ending_on_punctuation_need_no_boundary():
+    translate = PhraseTranslator({'B/L': 'D/A', '(B)': '(D)'})
+    assert translate('Meals: B/L(B)x') == 'Meals: D/A(D)x'
+
+
+def test_ignore_case_uses_the_table_target():
+    translate = PhraseTranslator({'Arrival': 'Llegada', 'arrival': 'llegada'}, ignore_case=True)
+    assert translate('ARRIVAL and arrival') == 'Llegada and Llegada'
+
+
+def test_multi_locale_scan_matches_a_translator_per_locale():
+    tables = {
+        'es': {'Istanbul': 'Estambul', 'Istanbul Airport': 'Aeropuerto de Estambul', 'Tour': 'Tur'},
+        'de': {'Istanbul Airport': 'Flughafen Istanbul', 'Tour': 'Rundreise'},
+    }
+    translate = MultiPhraseTranslator(tables)
+    for text in ('Tour of Istanbul', 'Istanbul Airport transfer', 'Tours', ''):
+        assert translate(text) == {locale: PhraseTranslator(phrases)(text) for locale, phrases in tables.items()}
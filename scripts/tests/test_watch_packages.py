@@ -0,0 +1,57 @@
+from extraction.scripts import load_script
+from extraction.watch import DocumentWatcher
+
+watch = load_script('watch-packages.py')
+
+
+def test_renamed_sheet_keeps_its_package(monkeypatch):
+    calls = []
+    monkeypatch.setattr(watch, 'patch_package',
+                        lambda package_id, pkg, kind, layout, fmt: calls.append((package_id, pkg)) or '')
+    monkeypatch.setattr(watch, 'extract_document', lambda source, caches: ({'packageId': source[3]}, None))
+    old = ('turkey', '01 Istanbul.docx', ('/src/01 Istanbul.docx', 'WITH_HOTEL', 'SIC'), 'SIC-01')
+    new = ('turkey', '01 Istanbul Tour.docx', ('/src/01 Istanbul Tour.docx', 'WITH_HOTEL', 'SIC'), 'SIC-01')
+    known = {'/src/01 Istanbul.docx': old}
+    current = {'/src/01 Istanbul Tour.docx': new}
+
+    watch.handle_batch(['/src/01 Istanbul Tour.docx', '/src/01 Istanbul.docx'], known, current, {}, 'single', 'json')
+
+    assert calls == [('SIC-01', {'packageId': 'SIC-01'})]
+
+
+def test_deleted_sheet_is_removed_before_updates(monkeypatch):
+    calls = []
+    monkeypatch.setattr(watch, 'patch_package',
+                        lambda package_id, pkg, kind, layout, fmt: calls.append((package_id, pkg)) or '')
+    monkeypatch.setattr(watch, 'extract_document', lambda source, caches: ({'packageId': source[3]}, None))
+    gone = ('turkey', '02 Cappadocia.docx', ('/src/02 Cappadocia.docx', 'WITH_HOTEL', 'SIC'), 'SIC-02')
+    kept = ('turkey', '01 Istanbul.docx', ('/src/01 Istanbul.docx', 'WITH_HOTEL', 'SIC'), 'SIC-01')
+
+    watch.handle_batch(['/src/01 Istanbul.docx', '/src/02 Cappadocia.docx'],
+                       {'/src/02 Cappadocia.docx': gone, '/src/01 Istanbul.docx': kept},
+                       {'/src/01 Istanbul.docx': kept}, {}, 'single', 'json')
+
+    assert calls == [('SIC-02', None), ('SIC-01', {'packageId': 'SIC-01'})]
+
+
+def test_failed_patch_is_reported_and_returned_for_a_retry(monkeypatch):
+    def patch_package(package_id, pkg, kind, layout, fmt):
+        if package_id == 'SIC-01':
+            raise PermissionError('2026-packages.json is in use')
+        return ''
+
+    monkeypatch.setattr(watch, 'patch_package', patch_package)
+    monkeypatch.setattr(watch, 'extract_document', lambda source, caches: ({'packageId': source[3]}, None))
+    locked = ('turkey', '01 Istanbul.docx', ('/src/01 Istanbul.docx', 'WITH_HOTEL', 'SIC'), 'SIC-01')
+    saved = ('turkey', '02 Cappadocia.docx', ('/src/02 Cappadocia.docx', 'WITH_HOTEL', 'SIC'), 'SIC-02')
+    current = {'/src/01 Istanbul.docx': locked, '/src/02 Cappadocia.docx': saved}
+
+    failed = watch.handle_batch(sorted(current), current, current, {}, 'single', 'json')
+
+    assert failed == ['/src/01 Istanbul.docx']
+
+
+def test_retried_paths_are_reported_again():
+    watcher = DocumentWatcher([], debounce=0.5, polling=True)
+    watcher.retry(['/src/01 Istanbul.docx'], 0)
+    assert next(watcher.batches()) == ['/src/01 Istanbul.docx']
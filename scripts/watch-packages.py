@@ -0,0 +1,200 @@
+"""Watch the rate sheet folders and patch changed packages into the output
+
+Keeps running: whenever a .docx in one of the Turkey folders or the Europe
+folder is saved, only that document is extracted again and its package is
+upserted into data/2026-packages (and europe-packages for Europe sheets), or
+into its shard with --layout sharded. Files are replaced atomically, so the
+site never reads a half-written file. Deleting a sheet removes its package.
+The changeset, facet index, search index and hotel catalogue are refreshed
+with every patch.
+
+    python scripts/watch-packages.py [--layout sharded] [--format min] [--poll]
+
+Uses native file notifications when watchdog is installed
+(pip install watchdog) and polls the folders otherwise.
+"""
+import os
+import sys
+import time
+import argparse
+sys.stdout.reconfigure(encoding='utf-8')
+
+from extraction.cache import ExtractionCache
+from extraction.facets import facet_index_path, write_facet_index, write_shard_facet_index
+from extraction.hotels import hotel_catalogue_path, write_hotel_catalogue, write_shard_hotel_catalogue
+from extraction.merge import (
+    add_changed_routes, changeset_summary, combine_changesets, merge_packages, read_changeset, write_changeset,
+)
+from extraction.output import (
+    SHARD_DIR, available_formats, find_packages, read_packages, write_package_shards, write_packages,
+)
+from extraction.parallel import run_extraction_jobs
+from extraction.scripts import load_script
+from extraction.search import search_index_path, write_search_index, write_shard_search_index
+from extraction.watch import DocumentWatcher
+
+# Seconds before a sheet whose patch failed is tried again
+RETRY_SECONDS = 2.0
+
+turkey = load_script('extract-packages-from-word.py')
+europe = load_script('extract-europe-packages.py')
+
+
+def source_documents(base_path, europe_path):
+    """Map each source document's absolute path to (kind, filename, job args, packageId)"""
+    sources = {}
+    for filename, file_path, package_type, tour_type in turkey.find_package_files(base_path):
+        sources[os.path.abspath(file_path)] = (
+            'turkey', filename, (file_path, package_type, tour_type),
+            turkey.package_id(filename, package_type, tour_type))
+    if os.path.isdir(europe_path):
+        for filename, file_path in europe.find_europe_files(europe_path):
+            sources[os.path.abspath(file_path)] = ('europe', filename, (file_path,), europe.europe_package_id(filename))
+    return sources
+
+
+def extract_document(source, caches):
+    """Extract and finalize one document, returning (package, error)"""
+    kind, filename, job, _ = source
+    extractor = turkey.extract_package_from_word if kind == 'turkey' else europe.extract_europe_package
+    (pkg_data, error), = run_extraction_jobs(extractor, [job], cache=caches.get(kind))
+    if error:
+        return None, error
+    if kind == 'turkey':
+        return turkey.finalize_package(pkg_data, filename, job[1], job[2]), None
+    return europe.finalize_europe_package(pkg_data, filename), None
+
+
+def patch_package(package_id, pkg_data, kind, layout, fmt):
+    """Upsert one package into the output (remove it when pkg_data is None) and describe the change"""
+    incoming = [pkg_data] if pkg_data is not None else []
+
+    def owns(pid):
+        return pid == package_id
+
+    if layout == 'sharded':
+        stats = write_package_shards(incoming, owns, SHARD_DIR)
+        write_shard_facet_index(SHARD_DIR)
+        write_shard_search_index(SHARD_DIR)
+        write_shard_hotel_catalogue(SHARD_DIR)
+        return f"shards: {stats['written']} written, {stats['removed']} removed"
+
+    summary = ''
+    for name in ['2026-packages'] + (['europe-packages'] if kind == 'europe' else []):
+        path = find_packages(name, fmt)
+        existing = read_packages(path) if path else []
+        merged, changeset = merge_packages(existing, incoming, owns)
+        path = write_packages(merged, name, fmt)
+        if name == '2026-packages':
+            summary = changeset_summary(changeset)
+            # Fold the patch into the changeset so far: a --changes seed then covers every save
+            previous = read_changeset(path)
+            if previous is not None:
+                changeset = combine_changesets(previous, changeset)
+                add_changed_routes(changeset, merged)
+            write_changeset(changeset, path)
+            write_facet_index(merged, facet_index_path(path))
+            write_search_index(merged, search_index_path(path))
+            write_hotel_catalogue(merged, hotel_catalogue_path(path))
+    return summary
+
+
+def handle_batch(paths, known, current, caches, layout, fmt):
+    """Re-extract or remove the package of every settled path, returning the paths that failed
+
+    Removals go first, and a deleted path's package is kept when another
+    document still produces its packageId (a sheet renamed without changing
+    its number prefix). A path whose package could not be read, written or
+    replaced (Word holding the file, a full disk) is reported and returned
+    for a retry; the other paths are still handled.
+    """
+    failed = []
+    produced = {source[3] for source in current.values()}
+    for path in paths:
+        if path in current or path not in known:
+            continue
+        source = known[path]
+        stamp = time.strftime('%H:%M:%S')
+        filename = os.path.basename(path)
+        if source[3] in produced:
+            print(f"[{stamp}] Kept {source[3]} ({filename} is gone but another sheet produces it)")
+            continue
+        try:
+            summary = patch_package(source[3], None, source[0], layout, fmt)
+        except Exception as e:
+            print(f"[{stamp}] ✗ {filename} - removing {source[3]} failed, will retry: {e}")
+            failed.append(path)
+            continue
+        print(f"[{stamp}] Removed {source[3]} ({filename} was deleted; {summary})")
+
+    for path in paths:
+        if path not in current:
+            continue
+        source = current[path]
+        filename = os.path.basename(path)
+        stamp = time.strftime('%H:%M:%S')
+        start = time.perf_counter()
+        try:
+            pkg_data, error = extract_document(source, caches)
+            if error:
+                print(f"[{stamp}] ✗ {filename} - {error}")
+                continue
+            summary = patch_package(source[3], pkg_data, source[0], layout, fmt)
+        except Exception as e:
+            print(f"[{stamp}] ✗ {filename} - updating {source[3]} failed, will retry: {e}")
+            failed.append(path)
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"[{stamp}] Updated {source[3]} from {filename} in {elapsed:.0f} ms ({summary})")
+    return failed
+
+
+def main():
+    """Watch the source folders until interrupted"""
+    parser = argparse.ArgumentParser(description='Re-extract rate sheets as they are saved')
+    parser.add_argument('--base-path', default=turkey.BASE_PATH, help='folder holding the Turkey package folders')
+    parser.add_argument('--europe-path', default=europe.EUROPE_PATH, help='folder holding the Europe rate sheets')
+    parser.add_argument('--layout', choices=['single', 'sharded'], default='single',
+                        help='patch 2026-packages, or the package shards in data/packages')
+    parser.add_argument('--format', choices=['json', 'min', 'gzip', 'msgpack', 'tables', 'ndjson'], default='json',
+                        help='single-file output format (see the extraction scripts)')
+    parser.add_argument('--debounce', type=float, default=0.5,
+                        help='seconds a file must be left alone before it is extracted (default 0.5)')
+    parser.add_argument('--poll', action='store_true', help='poll the folders even if watchdog is installed')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='seconds between polls (default 0.5)')
+    parser.add_argument('--no-cache', action='store_true', help='do not read or update the extraction caches')
+    args = parser.parse_args()
+    if args.format not in available_formats():
+        parser.error(f"--format {args.format} needs the {args.format} package (pip install {args.format})")
+
+    caches = {}
+    if not args.no_cache:
+        caches = {'turkey': ExtractionCache(turkey.EXTRACTOR_VERSION), 'europe': ExtractionCache(europe.EXTRACTOR_VERSION)}
+        turkey.load_translation_memo()
+
+    folders = [os.path.join(args.base_path, folder) for folder, _, _ in turkey.FOLDERS] + [args.europe_path]
+    known = source_documents(args.base_path, args.europe_path)
+
+    watcher = DocumentWatcher(folders, debounce=args.debounce, poll_interval=args.poll_interval, polling=args.poll)
+    if not watcher.folders:
+        print('None of the source folders exist')
+        return 1
+
+    print(f"Watching {len(watcher.folders)} folders ({watcher.backend.name}), {len(known)} documents")
+    print('Press Ctrl+C to stop\n')
+    try:
+        with watcher:
+            for paths in watcher.batches():
+                current = source_documents(args.base_path, args.europe_path)
+                failed = handle_batch(paths, known, current, caches, args.layout, args.format)
+                turkey.save_translation_memo()
+                # A deleted sheet whose removal failed stays known so the retry removes it
+                known = {**current, **{path: known[path] for path in failed if path not in current}}
+                watcher.retry(failed, RETRY_SECONDS)
+    except KeyboardInterrupt:
+        print('\nStopped')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())